@@ -0,0 +1,71 @@
+import os
+
+from lsdyna_py.keyword.writer import TEXT_NEWLINE, write_nodes, write_solid_elements
+from lsdyna_py.preprocess.fem.butterfly import butterfly_plate_mesh
+
+# ================= Configuration Section =================
+# Native (NumPy) version of fem_butterfly_mesh_gmsh.py: same five-patch
+# O-grid, no gmsh runtime, and the .k file is written with final IDs/PIDs.
+output_filename = "Structured_Butterfly_mesh.k"
+
+# 1. Geometry
+Lx = 5.08
+Ly = 5.08
+t  = 0.635   # Thickness (plate spans z = 0 .. t)
+ax = 1.5     # Core half-size (X)
+ay = 1.5     # Core half-size (Y)
+
+# 2. Mesh Control (ELEMENT counts)
+NxCore = 100   # Core elements along X
+NyCore = 100   # Core elements along Y
+NLayers = 15   # Elements from the core to the plate edge
+Nz = 21        # Elements through the thickness
+rGrad = 1.05   # Growth ratio per layer (coarser towards the edge)
+
+# 3. ID Settings
+start_nid = 1
+start_eid = 1
+core_pid = 1    # Part 1: Center_Fine
+outer_pid = 2   # Part 2: Outer_Coarse
+
+# ================= Helper Functions =================
+
+def chdir_to_script_dir(verbose: bool = True) -> str:
+    """Sets CWD to script location."""
+    try:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        if os.path.isdir(script_dir):
+            os.chdir(script_dir)
+            if verbose: print(f"[info] CWD set to: {script_dir}")
+    except:
+        pass
+
+# ================= Main Logic =================
+
+def generate_butterfly_mesh():
+    print(f"--- FEM Butterfly (O-grid) Plate Generation ---")
+    print(f"Plate: {Lx} x {Ly} x {t}, Core: {2*ax} x {2*ay}")
+
+    # Core patch + ring of 4 outer patches; shared nodes are addressed by
+    # index, so no coordinate merging is needed.
+    nids, xyz, eids, pids, conn = butterfly_plate_mesh(
+        Lx, Ly, t, ax, ay, NxCore, NyCore, NLayers, Nz, rGrad,
+        start_nid=start_nid, start_eid=start_eid, core_pid=core_pid, outer_pid=outer_pid)
+
+    print(f"Nodes: {len(nids)}, Elements: {len(eids)}")
+
+    # Rows end in the platform's text line ending (CRLF on Windows), as with open(..., 'w')
+    nl = TEXT_NEWLINE
+    with open(output_filename, 'wb') as f:
+        f.write(b"*KEYWORD" + nl + b"*NODE" + nl)
+        write_nodes(f, nids, xyz, newline=nl)
+        f.write(b"*ELEMENT_SOLID" + nl)
+        write_solid_elements(f, eids, pids, conn, newline=nl)
+        f.write(b"*END" + nl)
+
+    print(f"Done! File saved to: {output_filename}")
+    print(f"Contains Part {core_pid} (core) and Part {outer_pid} (outer)")
+
+if __name__ == "__main__":
+    chdir_to_script_dir()
+    generate_butterfly_mesh()
@@ -1,5 +1,8 @@
 import os
 
+from lsdyna_py.keyword.writer import TEXT_NEWLINE
+from lsdyna_py.preprocess.streaming import write_sph_box
+
 # ================= Configuration Section =================
 output_filename = "sph_box.k"
 
@@ -21,6 +24,10 @@ start_nid = 5000001
 start_eid = 5000001
 part_id = 5000001
 
+# Parallel output: >1 preallocates the file and lets this many processes
+# render disjoint row ranges into it directly (useful for very large boxes).
+workers = 1
+
 # ================= Helper Functions =================
 
 def chdir_to_script_dir(verbose: bool = True) -> str:
@@ -57,45 +64,18 @@ def generate_sph_box():
     print(f"Total Particles: {total_particles}")
     print(f"Particle Mass:   {particle_mass:.6e}")
     
-    with open(output_filename, 'w') as f:
-        f.write("*KEYWORD\n")
-        
-        # Write Nodes
-        f.write("*NODE\n")
-        
-        current_nid = start_nid
-        coords = []
-
-        # Loop Order: X -> Y -> Z
-        # This order ensures nodes are generated in vertical columns first,
-        # matching the behavior of LS-PrePost.
-        for i in range(num_x):
-            x_pos = x_min + (i + 0.5) * dx
-            for j in range(num_y):
-                y_pos = y_min + (j + 0.5) * dy
-                for k in range(num_z):
-                    z_pos = z_min + (k + 0.5) * dz
-                    
-                    coords.append((current_nid, x_pos, y_pos, z_pos))
-                    current_nid += 1
-        
-        # Flush coordinates to file
-        for nid, x, y, z in coords:
-            f.write(f"{nid:8d}{x:16.6f}{y:16.6f}{z:16.6f}\n")
-
-        # Write Elements
-        f.write("*ELEMENT_SPH\n")
-        current_eid = start_eid
-        current_nid_ref = start_nid
-        
-        # Loop through valid particles to create elements
-        for _ in range(total_particles):
-            # Format: EID, PID, NID, MASS
-            f.write(f"{current_eid:8d}{part_id:8d}{current_nid_ref:8d}{particle_mass:16.6e}\n")
-            current_eid += 1
-            current_nid_ref += 1
-            
-        f.write("*END\n")
+    # 3. Generate & Write Particles
+    # Loop Order: X -> Y -> Z
+    # This order ensures nodes are generated in vertical columns first,
+    # matching the behavior of LS-PrePost.
+    # Particles are generated and flushed in X-slabs, so peak memory stays
+    # constant regardless of the particle count.
+    write_sph_box(output_filename,
+                  (x_min, x_max), (y_min, y_max), (z_min, z_max),
+                  num_x, num_y, num_z,
+                  density=density, part_id=part_id,
+                  start_nid=start_nid, start_eid=start_eid, workers=workers,
+                  newline=TEXT_NEWLINE)
 
     print(f"Done! File saved to: {output_filename}")
 
@@ -1,9 +1,23 @@
 import os
 import math
 
+import numpy as np
+
+from lsdyna_py.keyword.writer import TEXT_NEWLINE, write_nodes, write_sph_elements
+from lsdyna_py.preprocess.cache import MeshCache
+from lsdyna_py.preprocess.ids import IdCollisionError, IdRegistry
+from lsdyna_py.preprocess.sph.lattice import cell_for_spacing, sphere_particles
+from lsdyna_py.preprocess.sph.sdf import Box, Cone, Cylinder, Sphere, plate_with_hole, sdf_particles
+from lsdyna_py.preprocess.sph.validate import check_parts, exclusion_mask
+
 # ================= Configuration Section =================
 output_filename = "geo.k"
 
+# Optional binary mesh cache: particle arrays are stored per configuration and
+# reloaded (memory-mapped) when the same box/sphere settings are requested again.
+cache_dir = None  # e.g. "mesh_cache"
+cache_max_bytes = 10 * 2**30
+
 # --- 1. SPH Box Configuration ---
 box_cfg = {
     "enable": True,
@@ -28,6 +42,8 @@ sphere_cfg = {
     "radius": 0.25,
     # Grid Resolution (Divisions along 2*Radius)
     "num_x_grid": 11, "num_y_grid": 11, "num_z_grid": 11,
+    # Packing: "cubic" (grid cell centres), "bcc", "fcc" or "hcp"
+    "lattice": "cubic",
     # Material & ID
     "density": 7.8,
     "part_id": 1,
@@ -35,6 +51,33 @@ sphere_cfg = {
     "start_eid": 1
 }
 
+# --- 3. Composite Shape Configuration (optional) ---
+# Any geometry built from the SDF primitives Box, Sphere, Cylinder, Cone and
+# plate_with_hole, combined with | (union), & (intersection), - (difference).
+shape_cfg = {
+    "enable": False,
+    "shape": plate_with_hole((-2.54, -2.54, -1.5), (2.54, 2.54, -0.9), (0.0, 0.0), 0.5),
+    # Nearest-neighbour particle distance and packing ("cubic", "bcc", "fcc", "hcp")
+    "spacing": 0.0458,
+    "lattice": "cubic",
+    # Material & ID
+    "density": 7.8,
+    "part_id": 6000001,
+    "start_nid": 6000001,
+    "start_eid": 6000001
+}
+
+# --- 4. Geometric Overlap Check ---
+validate_cfg = {
+    "enable": True,
+    # Particles of different parts closer than this overlap/penetrate
+    # (typically the smoothing length)
+    "min_distance": 0.0458,
+    # Remove box particles inside the sphere/shape or closer than
+    # min_distance to their surface (projectile exclusion zone)
+    "auto_trim": False
+}
+
 # ================= Helper Functions =================
 
 def chdir_to_script_dir(verbose: bool = True) -> str:
@@ -87,39 +130,35 @@ def calculate_sphere_particles(cfg):
     """Calculates coordinates and mass for a Sphere shape."""
     if not cfg["enable"]: return [], 0.0
     
-    cx, cy, cz = cfg["cx"], cfg["cy"], cfg["cz"]
-    r = cfg["radius"]
-    nx, ny, nz = cfg["num_x_grid"], cfg["num_y_grid"], cfg["num_z_grid"]
-    
-    # Bounding box dimensions
-    box_len = 2.0 * r
-    dx = box_len / nx
-    dy = box_len / ny
-    dz = box_len / nz
-    
-    # Mass Calculation (Density * Single Cell Volume)
-    particle_mass = cfg["density"] * (dx * dy * dz)
-    
-    x_min, y_min, z_min = cx - r, cy - r, cz - r
-    coords = []
-    
+    # Bounding lattice over 2*r, masked with one vectorized radius test.
     # Column-First Order: X (Outer) -> Y (Middle) -> Z (Inner)
-    for i in range(nx):
-        x_pos = x_min + (i + 0.5) * dx
-        if abs(x_pos - cx) > r: continue
-        
-        for j in range(ny):
-            y_pos = y_min + (j + 0.5) * dy
-            if (x_pos - cx)**2 + (y_pos - cy)**2 > r**2: continue
-            
-            for k in range(nz):
-                z_pos = z_min + (k + 0.5) * dz
-                dist_sq = (x_pos - cx)**2 + (y_pos - cy)**2 + (z_pos - cz)**2
-                
-                if dist_sq <= r**2:
-                    coords.append((x_pos, y_pos, z_pos))
-                    
-    return coords, particle_mass
+    # Mass Calculation (Density * Single Cell Volume / particles per cell)
+    return sphere_particles(
+        (cfg["cx"], cfg["cy"], cfg["cz"]), cfg["radius"],
+        (cfg["num_x_grid"], cfg["num_y_grid"], cfg["num_z_grid"]),
+        lattice=cfg.get("lattice", "cubic"), density=cfg["density"])
+
+def calculate_shape_particles(cfg):
+    """Calculates coordinates and mass for a composite SDF shape."""
+    if not cfg["enable"]: return [], 0.0
+
+    # Blocks fully inside/outside the shape are skipped, so only particles
+    # near the surface are tested individually.
+    cell = cell_for_spacing(cfg["spacing"], cfg["lattice"])
+    return sdf_particles(cfg["shape"], cell, lattice=cfg["lattice"], density=cfg["density"])
+
+def load_particles(calculate, cfg, kind):
+    """Runs calculate(cfg), or reuses the cached result for the same cfg."""
+    if cache_dir is None or not cfg["enable"]:
+        return calculate(cfg)
+
+    def build():
+        coords, mass = calculate(cfg)
+        return {"xyz": np.array(coords, dtype=np.float64).reshape(-1, 3), "mass": np.array([mass])}
+
+    cache = MeshCache(cache_dir, max_bytes=cache_max_bytes)
+    arrays = cache.get_or_create(MeshCache.key_from_params(kind, **cfg), build)
+    return arrays["xyz"], float(arrays["mass"][0])
 
 # ================= Main Execution =================
 
@@ -129,65 +168,80 @@ def main():
     print("--- Generating Combined SPH Geometry ---")
     
     # 1. Calculate Data in Memory
-    box_coords, box_mass = calculate_box_particles(box_cfg)
-    sph_coords, sph_mass = calculate_sphere_particles(sphere_cfg)
+    box_coords, box_mass = load_particles(calculate_box_particles, box_cfg, "sph_box")
+    sph_coords, sph_mass = load_particles(calculate_sphere_particles, sphere_cfg, "sph_sphere")
+    shp_coords, shp_mass = load_particles(calculate_shape_particles, shape_cfg, "sph_shape")
     
     print(f"Box Particles:    {len(box_coords)}")
     print(f"Sphere Particles: {len(sph_coords)}")
+    print(f"Shape Particles:  {len(shp_coords)}")
     
-    # 2. Check for ID overlaps (Optional safety check)
-    if box_cfg["enable"] and sphere_cfg["enable"]:
-        box_end_nid = box_cfg["start_nid"] + len(box_coords)
-        sph_end_nid = sphere_cfg["start_nid"] + len(sph_coords)
-        # Check simple overlap logic
-        if (box_cfg["start_nid"] < sph_end_nid) and (sphere_cfg["start_nid"] < box_end_nid):
-            print("[WARN] Node IDs might overlap! Check 'start_nid' settings.")
-
-    # 3. Write to File
-    with open(output_filename, 'w') as f:
-        f.write("*KEYWORD\n")
+    # 2. Check for ID overlaps (every part's NID/EID range against all others)
+    registry = IdRegistry()
+    for name, cfg, coords in (("box", box_cfg, box_coords), ("sphere", sphere_cfg, sph_coords),
+                              ("shape", shape_cfg, shp_coords)):
+        if not cfg["enable"]:
+            continue
+        for kind, key in (("nid", "start_nid"), ("eid", "start_eid")):
+            try:
+                registry.reserve(kind, cfg[key], len(coords), owner=name)
+            except IdCollisionError as e:
+                print(f"[WARN] ID overlap: {e}. Check '{key}' settings.")
+
+    # 3. Geometric overlap check (cell-list search, O(N))
+    if validate_cfg["enable"]:
+        zones = []
+        if sphere_cfg["enable"]:
+            zones.append(Sphere((sphere_cfg["cx"], sphere_cfg["cy"], sphere_cfg["cz"]), sphere_cfg["radius"]))
+        if shape_cfg["enable"]:
+            zones.append(shape_cfg["shape"])
+        if validate_cfg["auto_trim"] and box_cfg["enable"] and zones:
+            box_coords = np.asarray(box_coords).reshape(-1, 3)
+            trim = np.zeros(len(box_coords), dtype=bool)
+            for zone in zones:
+                trim |= exclusion_mask(box_coords, zone, validate_cfg["min_distance"])
+            box_coords = box_coords[~trim]
+            print(f"[info] Auto-trim removed {int(trim.sum())} box particles.")
+
+        named = {"box": (box_cfg, box_coords), "sphere": (sphere_cfg, sph_coords),
+                 "shape": (shape_cfg, shp_coords)}
+        report = check_parts({name: np.asarray(c).reshape(-1, 3)
+                              for name, (cfg, c) in named.items() if cfg["enable"]},
+                             validate_cfg["min_distance"])
+        for r in report:
+            print(f"[WARN] {r['a']} / {r['b']}: {r['n_close_a']} / {r['n_close_b']} particles closer "
+                  f"than {validate_cfg['min_distance']} (min distance {r['min_distance']:.6f}).")
+
+    # 4. Write to File (each part is formatted in bulk by the keyword writer)
+    parts = []
+    if box_cfg["enable"]:
+        parts.append((box_cfg, box_coords, box_mass))
+    if sphere_cfg["enable"]:
+        parts.append((sphere_cfg, sph_coords, sph_mass))
+    if shape_cfg["enable"]:
+        parts.append((shape_cfg, shp_coords, shp_mass))
+
+    # Rows end in the platform's text line ending (CRLF on Windows), as with open(..., 'w')
+    nl = TEXT_NEWLINE
+    with open(output_filename, 'wb') as f:
+        f.write(b"*KEYWORD" + nl)
         
         # ---------------- Write Nodes ----------------
-        f.write("*NODE\n")
-        
-        # Write Box Nodes
-        if box_cfg["enable"]:
-            nid = box_cfg["start_nid"]
-            for x, y, z in box_coords:
-                f.write(f"{nid:8d}{x:16.6f}{y:16.6f}{z:16.6f}\n")
-                nid += 1
-                
-        # Write Sphere Nodes
-        if sphere_cfg["enable"]:
-            nid = sphere_cfg["start_nid"]
-            for x, y, z in sph_coords:
-                f.write(f"{nid:8d}{x:16.6f}{y:16.6f}{z:16.6f}\n")
-                nid += 1
+        # Box nodes first, then Sphere nodes
+        f.write(b"*NODE" + nl)
+        for cfg, coords, _ in parts:
+            nids = np.arange(cfg["start_nid"], cfg["start_nid"] + len(coords))
+            write_nodes(f, nids, np.array(coords).reshape(-1, 3), newline=nl)
         
         # ---------------- Write Elements ----------------
-        f.write("*ELEMENT_SPH\n")
-        
-        # Write Box Elements
-        if box_cfg["enable"]:
-            eid = box_cfg["start_eid"]
-            nid = box_cfg["start_nid"]
-            pid = box_cfg["part_id"]
-            for _ in box_coords:
-                f.write(f"{eid:8d}{pid:8d}{nid:8d}{box_mass:16.6e}\n")
-                eid += 1
-                nid += 1
-                
-        # Write Sphere Elements
-        if sphere_cfg["enable"]:
-            eid = sphere_cfg["start_eid"]
-            nid = sphere_cfg["start_nid"]
-            pid = sphere_cfg["part_id"]
-            for _ in sph_coords:
-                f.write(f"{eid:8d}{pid:8d}{nid:8d}{sph_mass:16.6e}\n")
-                eid += 1
-                nid += 1
+        # Format: EID, PID, NID, MASS (one element per particle)
+        f.write(b"*ELEMENT_SPH" + nl)
+        for cfg, coords, mass in parts:
+            nids = np.arange(cfg["start_nid"], cfg["start_nid"] + len(coords))
+            eids = np.arange(cfg["start_eid"], cfg["start_eid"] + len(coords))
+            write_sph_elements(f, eids, cfg["part_id"], nids, mass, newline=nl)
         
-        f.write("*END\n")
+        f.write(b"*END" + nl)
         
     print(f"Done! Combined geometry saved to: {output_filename}")
 
@@ -1,5 +1,10 @@
 import os
 
+import numpy as np
+
+from lsdyna_py.keyword.writer import TEXT_NEWLINE, write_nodes, write_sph_elements
+from lsdyna_py.preprocess.sph.lattice import sphere_particles
+
 # ================= Configuration Section =================
 output_filename = "sph_projectile.k"
 
@@ -13,6 +18,10 @@ num_x_grid = 11
 num_y_grid = 11
 num_z_grid = 11
 
+# Particle packing: "cubic" (one particle per grid cell, LS-PrePost layout),
+# "bcc", "fcc" or "hcp". Mass = density * cell volume / particles per cell.
+lattice = "cubic"
+
 # Material Properties
 density = 7.8  # Density
 
@@ -50,70 +59,38 @@ def generate_sph_sphere():
     dy = box_len_y / num_y_grid
     dz = box_len_z / num_z_grid
     
-    # Calculate Single Particle Mass
-    # Mass = Density * Volume of one grid cell
-    particle_volume = dx * dy * dz
-    particle_mass = density * particle_volume
-    
-    # Determine Starting Point (Bottom-Left-Rear corner of the box)
-    x_min = cx - radius
-    y_min = cy - radius
-    z_min = cz - radius
-    
+    # 2. Lattice Generation (Order: X -> Y -> Z)
+    # This matches LS-PrePost logic: fix X and Y, then fill Z (height).
+    # The bounding lattice is masked with one vectorized radius test.
+    # Mass = Density * Volume of one grid cell / particles per cell
+    valid_particles, particle_mass = sphere_particles(
+        (cx, cy, cz), radius, (num_x_grid, num_y_grid, num_z_grid),
+        lattice=lattice, density=density)
+
     print(f"--- SPH Sphere Generation (Column-First Order) ---")
     print(f"Spacing (dx, dy, dz): {dx:.5f}, {dy:.5f}, {dz:.5f}")
     print(f"Particle Mass:        {particle_mass:.6e}")
-    
-    valid_particles = []
-    
-    # 2. Loop Generation (Order: X -> Y -> Z)
-    # This matches LS-PrePost logic: fix X and Y, then fill Z (height).
-    for i in range(num_x_grid):
-        x_pos = x_min + (i + 0.5) * dx
-        
-        # Optimization: Skip if the X-slice is completely outside the radius
-        if abs(x_pos - cx) > radius: continue
-
-        for j in range(num_y_grid):
-            y_pos = y_min + (j + 0.5) * dy
-            
-            # Optimization: Skip if the XY-column is outside the radius
-            if (x_pos - cx)**2 + (y_pos - cy)**2 > radius**2: continue
-
-            for k in range(num_z_grid):
-                z_pos = z_min + (k + 0.5) * dz
-                
-                # Core Distance Check: Keep particle only if inside sphere
-                dist_sq = (x_pos - cx)**2 + (y_pos - cy)**2 + (z_pos - cz)**2
-                
-                if dist_sq <= radius**2:
-                    valid_particles.append((x_pos, y_pos, z_pos))
 
     print(f"Generated {len(valid_particles)} particles inside the sphere.")
     
     # 3. Write to .k file
-    with open(output_filename, 'w') as f:
-        f.write("*KEYWORD\n")
+    # Rows end in the platform's text line ending (CRLF on Windows), as with open(..., 'w')
+    nl = TEXT_NEWLINE
+    with open(output_filename, 'wb') as f:
+        f.write(b"*KEYWORD" + nl)
         
-        # Write Nodes
-        f.write("*NODE\n")
-        current_nid = start_nid
-        for x, y, z in valid_particles:
-            f.write(f"{current_nid:8d}{x:16.6f}{y:16.6f}{z:16.6f}\n")
-            current_nid += 1
+        # Write Nodes (formatted in bulk by the keyword writer)
+        f.write(b"*NODE" + nl)
+        nids = np.arange(start_nid, start_nid + len(valid_particles))
+        write_nodes(f, nids, valid_particles, newline=nl)
             
         # Write Elements
-        f.write("*ELEMENT_SPH\n")
-        current_eid = start_eid
-        current_nid_ref = start_nid
-        
-        for _ in valid_particles:
-            # Format: EID, PID, NID, MASS
-            f.write(f"{current_eid:8d}{part_id:8d}{current_nid_ref:8d}{particle_mass:16.6e}\n")
-            current_eid += 1
-            current_nid_ref += 1
+        # Format: EID, PID, NID, MASS (one element per particle)
+        f.write(b"*ELEMENT_SPH" + nl)
+        eids = np.arange(start_eid, start_eid + len(valid_particles))
+        write_sph_elements(f, eids, part_id, nids, particle_mass, newline=nl)
             
-        f.write("*END\n")
+        f.write(b"*END" + nl)
     
     print(f"Done! File saved to: {output_filename}")
 
@@ -0,0 +1,494 @@
+"""
+Memory-mapped LS-DYNA keyword (.k) reader.
+
+Opening a file memory-maps it and builds an index of the byte offsets of every
+``*KEYWORD`` block in one scan. Nothing else is read until a block is
+requested, so reopening a multi-GB deck costs the index scan plus the blocks
+actually used.
+
+Data blocks are decoded with vectorized fixed-width slicing: the card lines are
+gathered into an (n_lines, card_width) character matrix and every field is
+converted column-wise by NumPy. Comma separated (free format) blocks, as
+written by gmsh and many other tools, are parsed with one ``np.fromstring``
+call when they hold integers only and with ``np.loadtxt`` otherwise.
+
+Cards are decoded with the same layouts the keyword writer uses
+(``writer.NODE_CARD``, ``writer.SOLID_CARD``, ``writer.SPH_CARD``), so every
+deck this package writes reads back unchanged.
+
+Examples
+--------
+>>> with KeywordFile("fem_box_solid.k") as kf:
+...     print(kf.keywords())
+...     nids, xyz = kf.read_nodes()
+...     eids, pids, conn = kf.read_solids()
+"""
+from __future__ import annotations
+
+import io
+import mmap
+import os
+import re
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+
+from .writer import NODE_CARD, SOLID_CARD, SPH_CARD
+
+_NEWLINE, _CR, _COMMENT, _COMMA, _SPACE, _ZERO = 10, 13, 36, 44, 32, 48
+_NEWLINE_TO_COMMA = bytes.maketrans(b"\n", b",")
+
+# Lines gathered into one character matrix at a time (bounds temporary memory).
+_DECODE_CHUNK_LINES = 1 << 16
+
+
+@dataclass(frozen=True)
+class KeywordBlock:
+    """One ``*KEYWORD`` block: name, offset of the '*' line and data range."""
+    name: str
+    offset: int
+    data_start: int
+    data_end: int
+
+
+def _kind_dtype(kind: str):
+    return np.int64 if kind == "i" else np.float64
+
+
+def _parse_number_fallback(text: bytes, dtype):
+    """Slow path for numbers NumPy cannot cast (e.g. Fortran '1.0-3', 'D' exponents)."""
+    s = text.strip().upper().replace(b"D", b"E")
+    if not s:
+        return dtype(0)
+    s = re.sub(rb"(?<=[0-9.])([+-])(?=[0-9]+$)", rb"E\1", s)
+    return dtype(float(s))
+
+
+def _decode_text(chars: np.ndarray, dtype) -> np.ndarray:
+    """Convert via NumPy's string casting (slow path); blanks -> 0."""
+    chars = np.array(chars, dtype=np.uint8, copy=True)
+    blank = np.all(chars == _SPACE, axis=1)
+    if np.any(blank):
+        chars[blank, -1] = _ZERO
+    text = chars.view(f"S{chars.shape[1]}").ravel()
+    try:
+        return text.astype(dtype)
+    except ValueError:
+        if dtype is np.int64:
+            return text.astype(np.float64).astype(np.int64)
+        return np.array([_parse_number_fallback(t, dtype) for t in text], dtype=dtype)
+
+
+def _decode_int(chars: np.ndarray) -> np.ndarray:
+    """
+    Horner evaluation of integer fields across the character columns.
+
+    Spaces (leading or trailing) are skipped; rows holding anything other
+    than digits, spaces and one leading sign go through ``_decode_text``.
+    """
+    n, width = chars.shape
+    columns = np.ascontiguousarray(chars.T)
+    acc = np.zeros(n, dtype=np.int64)
+    neg = np.zeros(n, dtype=bool)
+    ndig = np.zeros(n, dtype=np.int64)
+    bad = np.zeros(n, dtype=bool)
+    for c in range(width):
+        ch = columns[c]
+        digit = ch - np.uint8(_ZERO)
+        is_digit = digit < 10
+        acc = np.where(is_digit, acc * 10 + digit, acc)
+        ndig += is_digit
+        is_sign = (ch == 45) | (ch == 43)
+        neg |= ch == 45
+        bad |= (is_sign & (ndig > 0)) | ~(is_digit | is_sign | (ch == _SPACE))
+    bad |= ndig > 18
+    acc = np.where(neg, -acc, acc)
+    rows = np.flatnonzero(bad)
+    if rows.size:
+        acc[rows] = _decode_text(chars[rows], np.int64)
+    return acc
+
+
+# Exact powers of ten for the Clinger fast path (mantissa < 2**53, |exp| <= 22).
+_EXACT_POW10 = 10.0 ** np.arange(23)
+
+
+def _decode_float(chars: np.ndarray) -> np.ndarray:
+    """
+    Vectorized parse of fixed-width real fields ('-1.5', '1.0E-03', Fortran
+    '1.0-3'). The mantissa digits are accumulated exactly and scaled by one
+    exact power of ten, which rounds identically to strtod; rows outside that
+    fast path go through ``_decode_text``.
+    """
+    n, width = chars.shape
+    columns = np.ascontiguousarray(chars.T)
+    mant = np.zeros(n, dtype=np.float64)
+    ndig = np.zeros(n, dtype=np.int64)
+    nfrac = np.zeros(n, dtype=np.int64)
+    expv = np.zeros(n, dtype=np.int64)
+    nexp = np.zeros(n, dtype=np.int64)
+    neg = np.zeros(n, dtype=bool)
+    exp_neg = np.zeros(n, dtype=bool)
+    dot = np.zeros(n, dtype=bool)
+    in_exp = np.zeros(n, dtype=bool)
+    bad = np.zeros(n, dtype=bool)
+    for c in range(width):
+        ch = columns[c]
+        digit = ch - np.uint8(_ZERO)
+        is_digit = digit < 10
+        m_digit = is_digit & ~in_exp
+        x_digit = is_digit & in_exp
+        mant = np.where(m_digit & ((ndig > 0) | (digit > 0)), mant * 10.0 + digit, mant)
+        ndig += m_digit & ((ndig > 0) | (digit > 0))
+        nfrac += m_digit & dot
+        expv = np.where(x_digit, expv * 10 + digit, expv)
+        nexp += x_digit
+
+        is_dot = ch == 46
+        bad |= is_dot & (dot | in_exp)
+        dot |= is_dot
+
+        is_e = (ch | np.uint8(32)) == 101  # 'e' / 'E'
+        is_d = (ch | np.uint8(32)) == 100  # Fortran 'd' / 'D'
+        is_sign = (ch == 45) | (ch == 43)
+        started = (ndig > 0) | dot | (nfrac > 0)
+        # A sign after the mantissa without 'E' starts a Fortran exponent.
+        exp_sign = is_sign & (in_exp | started) & (nexp == 0)
+        bad |= (is_e | is_d) & (in_exp | ~started)
+        bad |= is_sign & in_exp & (nexp > 0)
+        neg |= is_sign & ~in_exp & ~started & (ch == 45)
+        exp_neg |= exp_sign & (ch == 45)
+        in_exp |= is_e | is_d | exp_sign
+        bad |= ~(is_digit | is_dot | is_e | is_d | is_sign | (ch == _SPACE))
+
+    k = np.where(exp_neg, -expv, expv) - nfrac
+    bad |= (ndig > 15) | (np.abs(k) > 22) | (in_exp & (nexp == 0))
+    scale = _EXACT_POW10[np.minimum(np.abs(k), 22)]
+    value = np.where(k >= 0, mant * scale, mant / scale)
+    value = np.where(neg, -value, value)
+    rows = np.flatnonzero(bad)
+    if rows.size:
+        value[rows] = _decode_text(chars[rows], np.float64)
+    return value
+
+
+def _decode_field(chars: np.ndarray, dtype) -> np.ndarray:
+    """Convert an (n, width) uint8 character matrix to numbers; blanks -> 0."""
+    if dtype is np.int64:
+        return _decode_int(chars)
+    # NumPy's C string->float cast is the fastest exact path for standard
+    # notation; Fortran style fields fall back to the vectorized parser.
+    text = np.ascontiguousarray(chars).view(f"S{chars.shape[1]}").ravel()
+    try:
+        return text.astype(np.float64)
+    except ValueError:
+        return _decode_float(chars)
+
+
+class KeywordFile:
+    """
+    Read-only, memory-mapped view of a keyword file with a block index.
+
+    Parameters:
+        path (str): Path to the .k / .key file.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._fh = open(self.path, "rb")
+        size = os.fstat(self._fh.fileno()).st_size
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.blocks = self._scan()
+
+    # ------------------------------------------------------------------ index
+
+    def _scan(self):
+        """Locate every line starting with '*' (one pass of memchr-speed finds)."""
+        mm = self._mm
+        starts = []
+        pos = 0 if mm[:1] == b"*" else mm.find(b"\n*")
+        while pos != -1:
+            if mm[pos:pos + 1] == b"\n":
+                pos += 1
+            starts.append(pos)
+            pos = mm.find(b"\n*", pos)
+
+        blocks = []
+        for i, start in enumerate(starts):
+            line_end = mm.find(b"\n", start)
+            line_end = len(mm) if line_end == -1 else line_end
+            header = bytes(mm[start + 1:line_end]).decode("ascii", "replace").strip()
+            name = header.split()[0].upper() if header else ""
+            data_start = min(line_end + 1, len(mm))
+            data_end = starts[i + 1] if i + 1 < len(starts) else len(mm)
+            blocks.append(KeywordBlock(name, start, data_start, data_end))
+        return blocks
+
+    def keywords(self):
+        """Keyword names in file order (duplicates kept)."""
+        return [b.name for b in self.blocks]
+
+    def find(self, name: str):
+        """All blocks named ``name`` (case-insensitive)."""
+        name = name.upper().lstrip("*")
+        return [b for b in self.blocks if b.name == name]
+
+    def block_bytes(self, block: KeywordBlock) -> np.ndarray:
+        """Zero-copy uint8 view of a block's data lines."""
+        if block.data_end <= block.data_start:
+            return np.empty(0, dtype=np.uint8)
+        return np.frombuffer(self._mm, dtype=np.uint8, count=block.data_end - block.data_start,
+                             offset=block.data_start)
+
+    def raw_bytes(self, start: int = 0, stop: int = None) -> bytes:
+        """File bytes between two offsets (e.g. ``block.offset`` .. ``block.data_end``)."""
+        return bytes(self._mm[start:stop])
+
+    def block_lines(self, name: str):
+        """Yield the non-comment data lines (str) of every ``name`` block."""
+        for block in self.find(name):
+            for raw in self.block_bytes(block).tobytes().splitlines():
+                if raw.strip() and not raw.startswith(b"$"):
+                    yield raw.decode("ascii", "replace")
+
+    # --------------------------------------------------------------- decoding
+
+    @staticmethod
+    def _line_bounds(buf: np.ndarray):
+        """Start/end offsets of the non-empty, non-comment lines of ``buf``."""
+        nl = np.flatnonzero(buf == _NEWLINE)
+        starts = np.concatenate(([0], nl + 1))
+        ends = np.concatenate((nl, [buf.size]))
+        nonempty = ends > starts
+        starts, ends = starts[nonempty], ends[nonempty]
+        ends = ends - (buf[ends - 1] == _CR)
+        keep = (ends > starts) & (buf[np.minimum(starts, buf.size - 1)] != _COMMENT)
+        return starts[keep], ends[keep]
+
+    @staticmethod
+    def _decode_fixed(buf, starts, ends, layout):
+        total = sum(field[1] for field in layout)
+        cols = [[] for _ in layout]
+        span = np.arange(total)
+
+        # Machine-written decks have equally spaced lines of one length: the
+        # block is then simply a strided (n_lines, stride) view of the map.
+        stride = int(starts[1] - starts[0]) if starts.size > 1 else 0
+        uniform = (starts.size > 1 and np.all(np.diff(starts) == stride)
+                   and np.all(ends - starts >= total) and int(starts[-1]) + stride <= buf.size)
+
+        for c0 in range(0, starts.size, _DECODE_CHUNK_LINES):
+            s = starts[c0:c0 + _DECODE_CHUNK_LINES, None]
+            if uniform:
+                first = int(s[0, 0])
+                chars = buf[first:first + s.shape[0] * stride].reshape(-1, stride)[:, :total]
+            else:
+                e = ends[c0:c0 + _DECODE_CHUNK_LINES, None]
+                idx = s + span
+                chars = np.where(idx < e, buf[np.minimum(idx, buf.size - 1)], np.uint8(_SPACE))
+            col = 0
+            for out, field in zip(cols, layout):
+                out.append(_decode_field(chars[:, col:col + field[1]], _kind_dtype(field[0])))
+                col += field[1]
+        return [np.concatenate(c) if c else np.empty(0, _kind_dtype(f[0]))
+                for c, f in zip(cols, layout)]
+
+    @staticmethod
+    def _gather_lines(buf, starts, ends):
+        """
+        Copy the lines ``starts``..``ends`` into a new buffer, each followed by
+        a newline. Returns (buf, starts, ends) of the copy.
+        """
+        lengths = ends - starts + 1
+        out_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        idx = np.arange(int(lengths.sum())) - np.repeat(out_starts - starts, lengths)
+        out = buf[np.minimum(idx, buf.size - 1)]
+        out_ends = out_starts + lengths - 1
+        out[out_ends] = _NEWLINE
+        return out, out_starts, out_ends
+
+    @classmethod
+    def _decode_free(cls, buf, starts, ends, layout):
+        # Only line terminators may separate the lines (not e.g. the other
+        # cards of a two-card layout): otherwise decode a copy of just them.
+        if np.any(starts[1:] - ends[:-1] > 2):
+            buf, starts, ends = cls._gather_lines(buf, starts, ends)
+        text = buf[starts[0]:ends[-1]]
+        # Integer blocks with the same number of fields on every line (e.g.
+        # the element cards of gmsh .key files) are parsed in one
+        # np.fromstring pass with newlines turned into separators, which is
+        # about twice as fast as np.loadtxt. Everything else, including
+        # inline '$' comments, goes through np.loadtxt.
+        if all(f[0] == "i" for f in layout) and not np.any(text == _COMMENT):
+            per_line = np.add.reduceat(buf == _COMMA, starts, dtype=np.int32)
+            n_fields = int(per_line[0]) + 1
+            if n_fields >= len(layout) and np.all(per_line == n_fields - 1):
+                flat = text.tobytes().translate(_NEWLINE_TO_COMMA)
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error", DeprecationWarning)
+                    try:
+                        values = np.fromstring(flat, dtype=np.int64, sep=",")
+                    except (ValueError, DeprecationWarning):
+                        values = None
+                if values is not None and values.size == starts.size * n_fields:
+                    table = values.reshape(starts.size, n_fields)
+                    return [table[:, i].copy() for i in range(len(layout))]
+
+        data = text.tobytes()
+        commas = np.concatenate(([0], np.cumsum(buf == _COMMA)))
+        n_commas = commas[ends] - commas[starts]
+        if np.any(n_commas < len(layout) - 1):
+            # Trailing fields left out (LS-DYNA reads them as 0, e.g. the TC /
+            # RC columns of *NODE): pad the short lines.
+            data = b"\n".join(buf[s:e].tobytes() + b",0" * max(len(layout) - 1 - int(n), 0)
+                               for s, e, n in zip(starts, ends, n_commas))
+        table = np.loadtxt(io.BytesIO(data), delimiter=",", comments="$", ndmin=2,
+                           usecols=range(len(layout)), dtype=np.float64)
+        return [table[:, i].astype(_kind_dtype(f[0])) for i, f in enumerate(layout)]
+
+    def read_table(self, name: str, layout):
+        """
+        Decode every ``name`` block with a card layout.
+
+        Parameters:
+            name (str): Keyword name, e.g. "NODE".
+            layout (tuple): Card layout as in ``writer`` (kind, width[, decimals]).
+
+        Returns:
+            list: One 1-D array per layout field (int64 for "i", float64 otherwise).
+        """
+        parts = []
+        for buf, starts, ends in self._block_cards(name):
+            parts.append(self._decode_lines(buf, starts, ends, layout))
+        return self._concat(parts, layout)
+
+    def _block_cards(self, name: str):
+        """Yield (buf, starts, ends) of the data lines of every non-empty ``name`` block."""
+        for block in self.find(name):
+            buf = self.block_bytes(block)
+            if buf.size == 0:
+                continue
+            starts, ends = self._line_bounds(buf)
+            if starts.size:
+                yield buf, starts, ends
+
+    @classmethod
+    def _decode_lines(cls, buf, starts, ends, layout):
+        # The first card decides fixed width vs. comma separated.
+        if np.any(buf[starts[0]:ends[0]] == _COMMA):
+            return cls._decode_free(buf, starts, ends, layout)
+        return cls._decode_fixed(buf, starts, ends, layout)
+
+    @staticmethod
+    def _concat(parts, layout):
+        if not parts:
+            return [np.empty(0, _kind_dtype(f[0])) for f in layout]
+        return [np.concatenate([p[i] for p in parts]) for i in range(len(layout))]
+
+    @staticmethod
+    def _two_card_solids(buf, starts, ends) -> bool:
+        """
+        True for the two-card ``*ELEMENT_SOLID`` layout (EID, PID card, then a
+        node card) that LS-PrePost writes: its first card holds only two fields.
+        """
+        first = buf[starts[0]:ends[0]]
+        if np.any(first == _COMMA):
+            n_fields = len([f for f in first.tobytes().split(b",") if f.strip()])
+        else:
+            text = first.tobytes().rstrip()
+            n_fields = len(text.split()) if len(text) <= 16 else 3
+        if n_fields > 2:
+            return False
+        if starts.size % 2:
+            raise ValueError("Two-card *ELEMENT_SOLID block with an odd number of cards")
+        return True
+
+    def read_nodes(self):
+        """
+        Returns:
+            tuple: (nids (n,) int64, xyz (n, 3) float64) from all ``*NODE`` blocks.
+        """
+        nid, x, y, z = self.read_table("NODE", NODE_CARD)
+        return nid, np.stack([x, y, z], axis=1)
+
+    def read_solids(self):
+        """
+        Returns:
+            tuple: (eids, pids, conn (n, 8)) from all ``*ELEMENT_SOLID`` blocks,
+            in the one-card (EID, PID, N1..N8) or the two-card (EID, PID / N1..N8)
+            layout.
+        """
+        parts = []
+        for buf, starts, ends in self._block_cards("ELEMENT_SOLID"):
+            if self._two_card_solids(buf, starts, ends):
+                head = self._decode_lines(buf, starts[0::2], ends[0::2], SOLID_CARD[:2])
+                nodes = self._decode_lines(buf, starts[1::2], ends[1::2], SOLID_CARD[2:])
+                parts.append(head + nodes)
+            else:
+                parts.append(self._decode_lines(buf, starts, ends, SOLID_CARD))
+        cols = self._concat(parts, SOLID_CARD)
+        return cols[0], cols[1], np.stack(cols[2:], axis=1)
+
+    def read_element_ids(self, name: str) -> np.ndarray:
+        """
+        EIDs of every ``name`` block (e.g. "ELEMENT_SOLID"), one per element.
+
+        Element keywords are read as one card per element, except the two-card
+        ``*ELEMENT_SOLID`` layout; option variants with extra cards
+        (``_THICKNESS``, ``_OFFSET``, ...) are different keywords and not read.
+        """
+        parts = []
+        for buf, starts, ends in self._block_cards(name):
+            if name.upper().lstrip("*") == "ELEMENT_SOLID" and self._two_card_solids(buf, starts, ends):
+                starts, ends = starts[0::2], ends[0::2]
+            parts.append(self._decode_lines(buf, starts, ends, SOLID_CARD[:1]))
+        return self._concat(parts, SOLID_CARD[:1])[0]
+
+    def read_sph(self):
+        """
+        Returns:
+            tuple: (eids, pids, nids, mass) from all ``*ELEMENT_SPH`` blocks
+            (EID, PID, NID, MASS card as written by ``writer.write_sph_elements``).
+        """
+        return tuple(self.read_table("ELEMENT_SPH", SPH_CARD))
+
+    def read_parts(self):
+        """
+        Parse ``*PART`` blocks (title card + PID/SECID/MID/EOSID/HGID card).
+
+        Returns:
+            list: One dict per part with keys title, pid, secid, mid, eosid, hgid.
+        """
+        keys = ("pid", "secid", "mid", "eosid", "hgid")
+        parts = []
+        for block in self.find("PART"):
+            lines = [raw.decode("ascii", "replace") for raw in
+                     self.block_bytes(block).tobytes().splitlines()
+                     if raw.strip() and not raw.startswith(b"$")]
+            for title, card in zip(lines[0::2], lines[1::2]):
+                if "," in card:
+                    fields = [f.strip() for f in card.split(",")]
+                else:
+                    fields = [card[i:i + 10].strip() for i in range(0, 10 * len(keys), 10)]
+                values = [int(float(f)) if f else 0 for f in (fields + [""] * len(keys))[:len(keys)]]
+                parts.append({"title": title.strip(), **dict(zip(keys, values))})
+        return parts
+
+    # -------------------------------------------------------------- lifecycle
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            try:
+                self._mm.close()
+            except BufferError:
+                # A block_bytes() view is still alive; the map is released
+                # when that view is garbage collected.
+                pass
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,438 @@
+"""
+Bulk fixed-width keyword card writer.
+
+The generator scripts format every ``*NODE`` / ``*ELEMENT_*`` line with its
+own f-string. Here whole arrays are formatted at once: each card is rendered
+into a preallocated ``(n_rows, record_length)`` uint8 buffer with NumPy digit
+arithmetic, and the buffer is written to the file in large chunks.
+
+The output is byte-identical to the f-string layouts used by the scripts:
+
+    *NODE           f"{nid:8d}{x:16.6f}{y:16.6f}{z:16.6f}"
+    *ELEMENT_SOLID  f"{eid:8d}{pid:8d}{n1:8d}...{n8:8d}"
+    *ELEMENT_SPH    f"{eid:8d}{pid:8d}{nid:8d}{mass:16.6e}"
+
+Rows end in ``newline`` (default ``b"\\n"``). The files are opened in binary
+mode, so the scripts pass ``TEXT_NEWLINE`` (``os.linesep``) to keep writing
+what their text-mode ``open(..., 'w')`` wrote before, i.e. CRLF on Windows.
+
+Values that do not fit their field raise ``ValueError`` instead of silently
+shifting the following columns (which LS-DYNA would misread).
+
+Because every row of a card has the same byte length, row ranges can be
+formatted independently: with ``workers > 1`` the chunks are rendered in a
+process pool and written at their precomputed file offsets (``os.pwrite``
+when the file has a descriptor, otherwise in order). The output is identical
+to the serial path.
+
+``write_direct`` goes one step further for whole decks: the byte offset of
+every record is known before formatting, so the file is preallocated to its
+final size, memory-mapped, and each worker renders its row range straight
+into its own region of the map (no intermediate bytes objects at all).
+
+Examples
+--------
+>>> with open("box.k", "wb") as f:
+...     f.write(b"*KEYWORD\\n*NODE\\n")
+...     write_nodes(f, nids, xyz)
+...     f.write(b"*ELEMENT_SOLID\\n")
+...     write_solid_elements(f, eids, 1, conn)
+...     f.write(b"*END\\n")
+>>> nl = TEXT_NEWLINE
+>>> with open("box.k", "wb") as f:
+...     f.write(b"*NODE" + nl)
+...     write_nodes(f, nids, xyz, newline=nl)
+>>> with open("big.k", "wb") as f:
+...     f.write(b"*NODE\\n")
+...     write_nodes(f, nids, xyz, workers=8)
+>>> write_direct("big.k", [b"*KEYWORD\\n*NODE\\n",
+...                        (NODE_CARD, nids.size, node_columns(nids, xyz)),
+...                        b"*END\\n"], workers=8)
+"""
+from __future__ import annotations
+
+import io
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+# Card layouts: one (kind, width[, decimals]) entry per field.
+#   "i" -> %{width}d,  "f" -> %{width}.{decimals}f,  "e" -> %{width}.{decimals}e
+NODE_CARD = (("i", 8), ("f", 16, 6), ("f", 16, 6), ("f", 16, 6))
+SOLID_CARD = (("i", 8),) * 10
+SPH_CARD = (("i", 8), ("i", 8), ("i", 8), ("e", 16, 6))
+
+DEFAULT_CHUNK_ROWS = 1 << 20
+
+# Line ending of text-mode files on this platform (CRLF on Windows).
+TEXT_NEWLINE = os.linesep.encode("ascii")
+
+_SPACE, _MINUS, _DOT, _ZERO = 32, 45, 46, 48
+
+
+def record_length(layout, newline: bytes = b"\n") -> int:
+    """Bytes per formatted row of ``layout``, including the trailing ``newline``."""
+    return sum(field[1] for field in layout) + len(newline)
+
+
+def _python_field(value, kind: str, width: int, decimals: int) -> bytes:
+    """Reference f-string formatting of one value (used for rare fallbacks)."""
+    if kind == "i":
+        s = f"{int(value):{width}d}"
+    else:
+        s = f"{float(value):{width}.{decimals}{kind}}"
+    if len(s) != width:
+        raise ValueError(f"Value {value!r} does not fit a {width}-character field")
+    return s.encode("ascii")
+
+
+# Digits are rendered four at a time from a lookup table into a 16-byte
+# scratch field per row; sign and leading blanks are then applied with two
+# uint64 mask operations selected by (digit count, sign).
+_SCRATCH = 16
+_LUT4 = np.frombuffer("".join(f"{i:04d}" for i in range(10000)).encode("ascii"), dtype=np.uint32)
+_POW10 = 10 ** np.arange(1, 19, dtype=np.int64)
+
+
+def _field_masks():
+    keep = np.zeros((_SCRATCH + 1, 2, _SCRATCH), dtype=np.uint8)
+    fill = np.zeros((_SCRATCH + 1, 2, _SCRATCH), dtype=np.uint8)
+    for ndig in range(1, _SCRATCH + 1):
+        for neg in (0, 1):
+            keep[ndig, neg, _SCRATCH - ndig:] = 0xFF
+            fill[ndig, neg, :_SCRATCH - ndig] = _SPACE
+            if neg and ndig < _SCRATCH:
+                fill[ndig, neg, _SCRATCH - ndig - 1] = _MINUS
+    return keep.view(np.uint64).reshape(-1, 2), fill.view(np.uint64).reshape(-1, 2)
+
+
+_KEEP, _FILL = _field_masks()
+
+
+def _digits(q: np.ndarray, width: int) -> np.ndarray:
+    """(n, 16) uint8 scratch holding the zero padded digits of ``q`` right aligned."""
+    scratch = np.empty((q.shape[0], _SCRATCH // 4), dtype=np.uint32)
+    n_groups = -(-width // 4)  # ceil(width / 4)
+    for g in range(1, n_groups + 1):
+        q, r = np.divmod(q, 10000)
+        scratch[:, -g] = np.take(_LUT4, r)
+    return scratch.view(np.uint8)
+
+
+def _put_digits(out: np.ndarray, end: int, width: int, mag: np.ndarray, neg: np.ndarray):
+    """
+    Right-align the non-negative integers ``mag`` in ``out[:, end-width:end]``
+    with a leading '-' where ``neg`` is set.
+    """
+    ndig = np.searchsorted(_POW10, mag, side="right") + 1
+    too_wide = ndig + neg > width
+    if np.any(too_wide):
+        bad = np.flatnonzero(too_wide)[0]
+        raise ValueError(f"Row {bad}: value does not fit a {width}-character field")
+
+    scratch = _digits(mag, width)
+    idx = 2 * ndig + neg
+    words = scratch.view(np.uint64)
+    words &= np.take(_KEEP, idx, axis=0)
+    words |= np.take(_FILL, idx, axis=0)
+    out[:, end - width:end] = scratch[:, _SCRATCH - width:]
+
+
+def _put_int(out: np.ndarray, col: int, width: int, values: np.ndarray):
+    v = values.astype(np.int64, copy=False)
+    _put_digits(out, col + width, width, np.abs(v), v < 0)
+
+
+def _put_fixed(out: np.ndarray, col: int, width: int, decimals: int, values: np.ndarray):
+    v = values.astype(np.float64, copy=False)
+    scale = 10.0 ** decimals
+    scaled = np.abs(v) * scale
+
+    # Rows whose rounding the fast path cannot decide exactly (near .5 ties
+    # after the multiplication, huge or non-finite values) are formatted by
+    # Python instead, so the result stays identical to the f-string.
+    with np.errstate(invalid="ignore"):
+        frac = scaled - np.floor(scaled)
+        tie = np.abs(frac - 0.5) <= 4.0 * np.spacing(scaled)
+        slow = ~np.isfinite(scaled) | (scaled >= 2.0 ** 52) | tie
+    safe = np.where(slow, 0.0, scaled)
+
+    r = np.rint(safe).astype(np.int64)
+    ip, fp = np.divmod(r, 10 ** decimals)
+    frac_end = col + width
+    int_end = frac_end - decimals - 1
+    out[:, int_end + 1:frac_end] = _digits(fp, decimals)[:, _SCRATCH - decimals:]
+    out[:, int_end] = _DOT
+
+    slow_rows = np.flatnonzero(slow)
+    neg = np.signbit(v)
+    neg[slow_rows] = False
+    _put_digits(out, int_end, width - decimals - 1, ip, neg)
+
+    for row in slow_rows:
+        out[row, col:col + width] = np.frombuffer(
+            _python_field(v[row], "f", width, decimals), dtype=np.uint8)
+
+
+def _put_sci(out: np.ndarray, col: int, width: int, decimals: int, values: np.ndarray):
+    # Scientific fields (SPH mass) hold very few distinct values, so each
+    # unique value is formatted once and gathered into place.
+    v = values.astype(np.float64, copy=False)
+    if v.strides == (0,):  # broadcast scalar
+        out[:, col:col + width] = np.frombuffer(
+            _python_field(v[0], "e", width, decimals), dtype=np.uint8)
+        return
+    uniq, inverse = np.unique(v, return_inverse=True)
+    table = np.frombuffer(b"".join(_python_field(u, "e", width, decimals) for u in uniq),
+                          dtype=np.uint8).reshape(-1, width)
+    out[:, col:col + width] = np.take(table, inverse.ravel(), axis=0)
+
+
+def format_rows(layout, columns, out: np.ndarray = None, newline: bytes = b"\n") -> np.ndarray:
+    """
+    Render fixed-width card rows.
+
+    Parameters:
+        layout (tuple): Card layout, e.g. ``NODE_CARD``.
+        columns (sequence): One array (or scalar, broadcast to all rows) per
+                            field of ``layout``.
+        out (np.ndarray, optional): (n_rows, record_length) uint8 buffer to
+                                    render into (e.g. a memory map region).
+        newline (bytes): Row terminator (``b"\\n"`` or ``b"\\r\\n"``).
+
+    Returns:
+        np.ndarray: The (n_rows, record_length) uint8 buffer.
+    """
+    if len(columns) != len(layout):
+        raise ValueError(f"Expected {len(layout)} columns, got {len(columns)}")
+    n_rows = max((np.size(c) for c in columns if np.ndim(c) > 0), default=1)
+    cols = [np.broadcast_to(np.asarray(c), (n_rows,)) for c in columns]
+
+    reclen = record_length(layout, newline)
+    if out is None:
+        out = np.empty((n_rows, reclen), dtype=np.uint8)
+    elif out.shape != (n_rows, reclen):
+        raise ValueError(f"Output buffer has shape {out.shape}, expected {(n_rows, reclen)}")
+
+    col = 0
+    for field, values in zip(layout, cols):
+        kind, width = field[0], field[1]
+        if kind == "i":
+            _put_int(out, col, width, values)
+        elif kind == "f":
+            _put_fixed(out, col, width, field[2], values)
+        elif kind == "e":
+            _put_sci(out, col, width, field[2], values)
+        else:
+            raise ValueError(f"Unknown field kind: {kind!r}")
+        col += width
+    out[:, col:] = np.frombuffer(newline, dtype=np.uint8)
+    return out
+
+
+def _chunk(column, start: int, stop: int):
+    return column[start:stop] if np.ndim(column) > 0 else column
+
+
+def _format_chunk(layout, columns, newline: bytes) -> np.ndarray:
+    """Process pool task: render one row range."""
+    return format_rows(layout, columns, newline=newline)
+
+
+def _file_descriptor(f):
+    """OS file descriptor usable with ``os.pwrite``, or None (e.g. BytesIO)."""
+    # pwrite ignores the offset on files opened for appending.
+    if not hasattr(os, "pwrite") or "a" in getattr(f, "mode", ""):
+        return None
+    try:
+        return f.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return None
+
+
+def _write_rows_parallel(f, layout, columns, n_rows: int, chunk_rows: int, workers: int,
+                         newline: bytes):
+    reclen = record_length(layout, newline)
+    fd = _file_descriptor(f)
+    if fd is not None:
+        f.flush()
+        base = f.tell()
+
+    # At most 2 chunks per worker are in flight, which bounds the memory held
+    # by pending results to roughly 2 * workers * chunk_rows * reclen bytes.
+    max_pending = 2 * workers
+    starts = iter(range(0, n_rows, chunk_rows))
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def submit():
+            start = next(starts, None)
+            if start is None:
+                return False
+            stop = min(start + chunk_rows, n_rows)
+            pending.append((start, pool.submit(_format_chunk, layout,
+                                               [_chunk(c, start, stop) for c in columns], newline)))
+            return True
+
+        while len(pending) < max_pending and submit():
+            pass
+        while pending:
+            if fd is not None:
+                # Chunks land at their own offsets, so write whichever is done.
+                wait([fut for _, fut in pending], return_when=FIRST_COMPLETED)
+                for item in [p for p in pending if p[1].done()]:
+                    pending.remove(item)
+                    start, fut = item
+                    data = fut.result().data
+                    offset = base + start * reclen
+                    while data:
+                        written = os.pwrite(fd, data, offset)
+                        data, offset = data[written:], offset + written
+                    submit()
+            else:
+                start, fut = pending.popleft()
+                f.write(fut.result().data)
+                submit()
+
+    if fd is not None:
+        f.seek(base + n_rows * reclen)
+
+
+def write_rows(f, layout, columns, chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int = 1,
+               newline: bytes = b"\n") -> int:
+    """
+    Format ``columns`` with ``layout`` and write them to the binary file ``f``
+    in chunks of ``chunk_rows`` rows.
+
+    Parameters:
+        workers (int): Number of processes formatting chunks concurrently;
+                       1 formats in the calling process.
+        newline (bytes): Row terminator, e.g. ``TEXT_NEWLINE``.
+
+    Returns:
+        int: Number of rows written.
+    """
+    n_rows = max((np.size(c) for c in columns if np.ndim(c) > 0), default=0)
+    if workers > 1 and n_rows > chunk_rows:
+        _write_rows_parallel(f, layout, columns, n_rows, chunk_rows, workers, newline)
+        return n_rows
+    buf = None
+    for start in range(0, n_rows, chunk_rows):
+        stop = min(start + chunk_rows, n_rows)
+        if buf is None or buf.shape[0] != stop - start:
+            buf = np.empty((stop - start, record_length(layout, newline)), dtype=np.uint8)
+        format_rows(layout, [_chunk(c, start, stop) for c in columns], out=buf, newline=newline)
+        f.write(buf.data)
+    return n_rows
+
+
+def node_columns(nids, xyz):
+    """Column list for ``NODE_CARD``."""
+    xyz = np.asarray(xyz)
+    return [nids, xyz[:, 0], xyz[:, 1], xyz[:, 2]]
+
+
+def solid_columns(eids, pids, conn):
+    """Column list for ``SOLID_CARD``."""
+    conn = np.asarray(conn)
+    return [eids, pids] + [conn[:, c] for c in range(8)]
+
+
+def sph_columns(eids, pids, nids, mass):
+    """Column list for ``SPH_CARD``."""
+    return [eids, pids, nids, mass]
+
+
+def write_nodes(f, nids, xyz, chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int = 1,
+                newline: bytes = b"\n") -> int:
+    """Write ``*NODE`` rows (NID, X, Y, Z) for ``xyz`` of shape (n, 3)."""
+    return write_rows(f, NODE_CARD, node_columns(nids, xyz), chunk_rows, workers, newline)
+
+
+def write_solid_elements(f, eids, pids, conn, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                         workers: int = 1, newline: bytes = b"\n") -> int:
+    """Write ``*ELEMENT_SOLID`` rows (EID, PID, N1..N8); ``pids`` may be a scalar."""
+    return write_rows(f, SOLID_CARD, solid_columns(eids, pids, conn), chunk_rows, workers, newline)
+
+
+def write_sph_elements(f, eids, pids, nids, mass, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       workers: int = 1, newline: bytes = b"\n") -> int:
+    """Write ``*ELEMENT_SPH`` rows (EID, PID, NID, MASS); ``pids``/``mass`` may be scalars."""
+    return write_rows(f, SPH_CARD, sph_columns(eids, pids, nids, mass), chunk_rows, workers, newline)
+
+
+def _fill_chunk(path, offset: int, layout, columns, start: int, stop: int, newline: bytes = b"\n"):
+    """Render rows start..stop-1 into the preallocated file region at ``offset``."""
+    if callable(columns):
+        columns = columns(start, stop)
+    region = np.memmap(path, dtype=np.uint8, mode="r+", offset=offset,
+                       shape=(stop - start, record_length(layout, newline)))
+    try:
+        format_rows(layout, columns, out=region, newline=newline)
+        region.flush()
+    finally:
+        del region
+
+
+def write_direct(path, parts, chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int = 1,
+                 newline: bytes = b"\n") -> int:
+    """
+    Write a keyword file into a preallocated, memory-mapped output.
+
+    Parameters:
+        path (str): Output file (overwritten).
+        parts (sequence): In file order, either ``bytes`` written verbatim
+                          (keyword lines) or ``(layout, n_rows, columns)``
+                          row blocks. ``columns`` is a column list as for
+                          ``write_rows``, or a picklable callable
+                          ``columns(start, stop)`` returning the columns of
+                          rows start..stop-1 (so workers can generate the
+                          data themselves instead of receiving it).
+        chunk_rows (int): Rows rendered per task.
+        workers (int): Number of processes; 1 renders in the calling process.
+        newline (bytes): Row terminator of the row blocks (the keyword
+                         lines are written as given).
+
+    Returns:
+        int: Size of the written file in bytes.
+    """
+    tasks = []
+    literals = []
+    offset = 0
+    for part in parts:
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            literals.append((offset, bytes(part)))
+            offset += len(part)
+            continue
+        layout, n_rows, columns = part
+        reclen = record_length(layout, newline)
+        for start in range(0, n_rows, chunk_rows):
+            stop = min(start + chunk_rows, n_rows)
+            cols = columns if callable(columns) else [_chunk(c, start, stop) for c in columns]
+            tasks.append((offset + start * reclen, layout, cols, start, stop))
+        offset += n_rows * reclen
+
+    with open(path, "wb") as f:
+        f.truncate(offset)
+        for pos, data in literals:
+            f.seek(pos)
+            f.write(data)
+
+    if workers <= 1 or len(tasks) <= 1:
+        for pos, layout, cols, start, stop in tasks:
+            _fill_chunk(path, pos, layout, cols, start, stop, newline)
+        return offset
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for pos, layout, cols, start, stop in tasks:
+            # Bound the number of queued tasks (each may carry column slices).
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    fut.result()
+            pending.add(pool.submit(_fill_chunk, path, pos, layout, cols, start, stop, newline))
+        for fut in pending:
+            fut.result()
+    return offset
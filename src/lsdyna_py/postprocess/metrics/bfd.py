@@ -0,0 +1,191 @@
+"""
+Back-face deformation (BFD) of impacted plates.
+
+The plate of ``fem_box_mesh.py`` spans z_min = -0.635 .. z_max = 0 and is
+struck on its top face; the back face (z == z_min) bulges towards -z. For
+the back-face nodes (``back_face_mask``) and every state:
+
+- ``bfd``: the deflection ``-u_z`` of the deepest node (BFD history);
+- ``radius``: the footprint radius, i.e. the largest in-plane distance from
+  the deepest node to a node deflected by at least ``ratio * bfd``
+  (or by the absolute ``threshold``);
+- ``volume``: the deformation cone volume ``pi * radius**2 * bfd / 3``.
+
+``bfd_metrics`` evaluates all of that for an (n_states, n_back) deflection
+array at once; ``bfd_from_d3plot`` / ``bfd_from_nodout`` read only the
+back-face z values of every state (in chunks of ``chunk_states``) and
+``bfd_sweep`` evaluates many cases in parallel processes into one table.
+
+Examples
+--------
+>>> r = bfd_from_d3plot("case_01/d3plot")
+>>> print(r["peak_bfd"], r["peak_time"], r["peak_radius"], r["peak_volume"])
+>>> plt.plot(r["time"], r["bfd"])
+>>> table = bfd_sweep(sorted(glob.glob("sweep/case_*/d3plot")), workers=16)
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ..parsers.d3plot import D3plot
+from ..parsers.nodout import NodoutFile
+
+DEFAULT_RATIO = 0.1
+DEFAULT_CHUNK_STATES = 256
+
+
+def back_face_mask(xyz, z_back: float = None, tol: float = 1e-6) -> np.ndarray:
+    """
+    Nodes on the back face.
+
+    Parameters:
+        xyz (np.ndarray): (n, 3) initial coordinates.
+        z_back (float, optional): Back-face z (default: the minimum z).
+        tol (float): Absolute tolerance on z.
+    """
+    z = np.asarray(xyz)[:, 2]
+    if z.size == 0:
+        return np.zeros(0, dtype=bool)
+    z_back = z.min() if z_back is None else z_back
+    return np.abs(z - z_back) <= tol
+
+
+def bfd_metrics(xy, deflection, threshold: float = None, ratio: float = DEFAULT_RATIO, center=None):
+    """
+    BFD, footprint radius and cone volume of every state.
+
+    Parameters:
+        xy (np.ndarray): (n_back, 2) in-plane coordinates of the back-face nodes.
+        deflection (np.ndarray): (n_states, n_back) deflection, positive away
+                                 from the impact (``-u_z``).
+        threshold (float, optional): Absolute deflection bounding the footprint.
+        ratio (float): Footprint threshold relative to each state's BFD
+                       (used without ``threshold``).
+        center (sequence, optional): Fixed (x, y) footprint centre (default:
+                                     the deepest node of each state).
+
+    Returns:
+        dict: "bfd", "radius", "volume" (n_states,) and "peak_node" (index
+              into the back-face nodes, per state).
+    """
+    xy = np.asarray(xy, dtype=np.float64)
+    d = np.asarray(deflection, dtype=np.float64)
+    if d.ndim != 2 or d.shape[1] == 0:
+        raise ValueError("bfd_metrics needs an (n_states, n_back) array with at least one back-face node")
+    peak_node = np.argmax(d, axis=1)
+    bfd = np.take_along_axis(d, peak_node[:, None], axis=1)[:, 0]
+    c = xy[peak_node] if center is None else np.broadcast_to(np.asarray(center, dtype=np.float64), bfd.shape + (2,))
+    limit = np.full_like(bfd, threshold) if threshold is not None else ratio * bfd
+    inside = (d >= limit[:, None]) & (bfd[:, None] > 0)
+    dist2 = (xy[None, :, 0] - c[:, 0:1]) ** 2 + (xy[None, :, 1] - c[:, 1:2]) ** 2
+    radius = np.sqrt(np.where(inside, dist2, 0.0).max(axis=1, initial=0.0))
+    volume = np.pi * radius ** 2 * np.maximum(bfd, 0.0) / 3.0
+    return {"bfd": bfd, "radius": radius, "volume": volume, "peak_node": peak_node}
+
+
+def _summary(times, xy, chunks, **kw):
+    """Concatenate chunked ``bfd_metrics`` results and add the peak values."""
+    parts = [bfd_metrics(xy, d, **kw) for d in chunks]
+    keys = ("bfd", "radius", "volume", "peak_node")
+    out = {k: np.concatenate([p[k] for p in parts]) if parts else np.empty(0) for k in keys}
+    out["time"] = np.asarray(times, dtype=np.float64)
+    if out["bfd"].size:
+        i = int(np.argmax(out["bfd"]))
+        out.update(peak_bfd=float(out["bfd"][i]), peak_time=float(out["time"][i]),
+                   peak_radius=float(out["radius"][i]), peak_volume=float(out["volume"][i]))
+    else:
+        out.update(peak_bfd=np.nan, peak_time=np.nan, peak_radius=np.nan, peak_volume=np.nan)
+    out["n_back"] = len(xy)
+    return out
+
+
+def bfd_from_d3plot(path, z_back: float = None, tol: float = 1e-6, chunk_states: int = DEFAULT_CHUNK_STATES,
+                    **kw):
+    """
+    BFD history of a d3plot family.
+
+    Parameters:
+        path (str): First file of the family.
+        z_back, tol: See ``back_face_mask`` (on the initial coordinates).
+        chunk_states (int): States decoded at a time.
+        **kw: ``bfd_metrics`` options (threshold, ratio, center).
+
+    Returns:
+        dict: ``bfd_metrics`` arrays plus "time", "peak_bfd", "peak_time",
+              "peak_radius", "peak_volume", "n_back".
+    """
+    with D3plot(path) as d:
+        nodes = np.flatnonzero(back_face_mask(d.coordinates, z_back, tol))
+        xyz0 = np.asarray(d.coordinates[nodes], dtype=np.float64)
+
+        def chunks():
+            for s in range(0, d.n_states, chunk_states):
+                states = range(s, min(s + chunk_states, d.n_states))
+                yield xyz0[:, 2] - d.read("coordinates", states, nodes)[..., 2]
+
+        return _summary(d.times, xyz0[:, :2], chunks(), **kw)
+
+
+def bfd_from_nodout(path, z_back: float = None, tol: float = 1e-6, chunk_states: int = DEFAULT_CHUNK_STATES,
+                    **kw):
+    """BFD history of a nodout file (initial coordinates = coordinates - displacements)."""
+    with NodoutFile(path) as nf:
+        if nf.times.size == 0:
+            return _summary([], np.empty((0, 2)), [], **kw)
+        _, first = nf.read(t_max=nf.times[0], fields=["x_coor", "y_coor", "z_coor", "x_disp", "y_disp", "z_disp"])
+        xyz0 = first[0, :, :3] - first[0, :, 3:]
+        back = back_face_mask(xyz0, z_back, tol)
+        ids = nf.node_ids[back]
+        chunks = (-c[..., 0] for _, c in nf.iter_chunks(chunk_states, nodes=ids, fields=["z_disp"]))
+        return _summary(nf.times, xyz0[back, :2], chunks, **kw)
+
+
+def _find_source(path):
+    """(kind, file) for a case path: a d3plot / nodout file or a run directory."""
+    path = os.fspath(path)
+    if os.path.isdir(path):
+        for name, kind in (("d3plot", "d3plot"), ("nodout", "nodout")):
+            if os.path.isfile(os.path.join(path, name)):
+                return kind, os.path.join(path, name)
+        raise FileNotFoundError(f"No d3plot or nodout in {path}")
+    return ("nodout" if os.path.basename(path).startswith("nodout") else "d3plot"), path
+
+
+def _case_row(args):
+    path, kw = args
+    kind = None
+    try:
+        kind, file = _find_source(path)
+        r = (bfd_from_nodout if kind == "nodout" else bfd_from_d3plot)(file, **kw)
+    except (OSError, ValueError, KeyError) as exc:
+        return {"case": os.fspath(path), "source": kind, "error": str(exc)}
+    return {"case": os.fspath(path), "source": kind, "n_states": r["time"].size, "n_back": r["n_back"],
+            "peak_bfd": r["peak_bfd"], "peak_time": r["peak_time"], "peak_radius": r["peak_radius"],
+            "peak_volume": r["peak_volume"], "final_bfd": r["bfd"][-1] if r["bfd"].size else np.nan,
+            "error": None}
+
+
+def bfd_sweep(paths, workers: int = 1, **kw) -> pd.DataFrame:
+    """
+    Peak BFD metrics of many cases.
+
+    Parameters:
+        paths (sequence): d3plot / nodout files or run directories.
+        workers (int): Processes; 1 evaluates in the calling process.
+        **kw: Options of ``bfd_from_d3plot`` / ``bfd_from_nodout``.
+
+    Returns:
+        pd.DataFrame: One row per case; "error" holds the message of cases
+                      that could not be read.
+    """
+    jobs = [(p, kw) for p in paths]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(_case_row, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    else:
+        rows = [_case_row(j) for j in jobs]
+    return pd.DataFrame(rows)
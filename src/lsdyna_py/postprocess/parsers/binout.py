@@ -0,0 +1,237 @@
+"""
+Reader for LS-DYNA ``binout`` files (LSDA format).
+
+An LSDA file starts with an 8-byte header (header length, length-field size,
+offset size, command size, type-id size, big-endian flag, float format,
+unused) followed by records ``[length][command][payload]``, where ``length``
+counts the whole record. The record types used here are
+
+    CD (2)                 payload: directory path (absolute or relative)
+    DATA (3)               payload: type id, name length (1 byte), name, values
+    VARIABLE (4)           symbol table entry: name, type id, offset, count
+    BEGINSYMBOLTABLE (5)
+    ENDSYMBOLTABLE (6)     payload: offset of the next table segment (0: none)
+    SYMBOLTABLEOFFSET (7)  payload: offset of the first table segment
+
+with type ids 1-10 = int8, int16, int32, int64, uint8, uint16, uint32,
+uint64, float32, float64. Solver output lives in per-state directories,
+e.g. ``/nodout/metadata/ids`` and ``/nodout/d000001/x_displacement``.
+
+``Binout`` memory-maps every file of a series (``binout``, ``binout0000``,
+``binout0001``, ...), walks the symbol tables once and keeps only
+(file, dtype, offset, count) per variable. ``get`` returns a zero-copy
+``np.frombuffer`` view of one variable; ``read`` stacks a variable over the
+state directories of a branch (``read("nodout", "x_displacement")`` ->
+(n_states, n_nodes)) and only touches the bytes of that variable.
+
+Examples
+--------
+>>> with Binout("run/binout*") as b:
+...     print(b.branches())                        # ['glstat', 'matsum', 'nodout', ...]
+...     ids = b.get("/nodout/metadata/ids")
+...     t, ux = b.read("nodout", "x_displacement")  # (n_states,), (n_states, n_nodes)
+...     t, te = b.read("glstat/total_energy")
+"""
+from __future__ import annotations
+
+import glob
+import mmap
+import os
+import posixpath
+
+import numpy as np
+
+CD = 2
+DATA = 3
+VARIABLE = 4
+BEGINSYMBOLTABLE = 5
+ENDSYMBOLTABLE = 6
+SYMBOLTABLEOFFSET = 7
+
+TYPE_CODES = {1: "i1", 2: "i2", 3: "i4", 4: "i8", 5: "u1", 6: "u2", 7: "u4", 8: "u8", 9: "f4", 10: "f8"}
+HEADER_SIZE = 8
+
+
+def series_files(path):
+    """
+    The files of a binout series.
+
+    ``path`` may be one file, a glob pattern (``run/binout*``) or the series
+    stem (``run/binout``: the file itself plus ``binout0000``, ``binout0001``, ...).
+    """
+    path = os.fspath(path)
+    if glob.has_magic(path):
+        files = glob.glob(path)
+    else:
+        files = ([path] if os.path.isfile(path) else []) + glob.glob(glob.escape(path) + "[0-9][0-9][0-9][0-9]")
+    files = sorted(set(files))
+    if not files:
+        raise FileNotFoundError(f"No binout files for {path!r}")
+    return files
+
+
+class _LsdaFile:
+    """One memory-mapped LSDA file and its symbol table."""
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = open(path, "rb")
+        self.mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        head = self.mm[:HEADER_SIZE]
+        if len(head) < HEADER_SIZE or head[0] < HEADER_SIZE:
+            raise ValueError(f"{path}: not an LSDA file")
+        self.header_size = head[0]
+        self.length_size, self.offset_size, self.command_size, self.type_size = head[1:5]
+        self.byteorder = "big" if head[5] else "little"
+        self.prefix = ">" if head[5] else "<"
+
+    def _int(self, pos: int, size: int) -> int:
+        return int.from_bytes(self.mm[pos:pos + size], self.byteorder)
+
+    def _record(self, pos: int):
+        """(record length, command, payload start) of the record at ``pos``."""
+        length = self._int(pos, self.length_size)
+        command = self._int(pos + self.length_size, self.command_size)
+        return length, command, pos + self.length_size + self.command_size
+
+    def symbols(self):
+        """Yield (path, type id, data record offset, count) for every variable."""
+        size = len(self.mm)
+        length, command, body = self._record(self.header_size)
+        if command != SYMBOLTABLEOFFSET:
+            raise ValueError(f"{self.path}: missing symbol table offset")
+        table = self._int(body, self.offset_size)
+        cwd = "/"
+        while 0 < table < size:
+            length, command, body = self._record(table)
+            if command != BEGINSYMBOLTABLE:
+                raise ValueError(f"{self.path}: bad symbol table at byte {table}")
+            pos, table = table + length, 0
+            while pos < size:
+                length, command, body = self._record(pos)
+                if length <= 0 or pos + length > size:
+                    return                      # table still being written
+                end = pos + length
+                if command == CD:
+                    cwd = posixpath.normpath(posixpath.join(cwd, self.mm[body:end].decode("ascii")))
+                elif command == VARIABLE:
+                    n_name = end - body - self.type_size - self.offset_size - self.length_size
+                    name = self.mm[body:body + n_name].decode("ascii")
+                    p = body + n_name
+                    type_id = self._int(p, self.type_size)
+                    offset = self._int(p + self.type_size, self.offset_size)
+                    count = self._int(p + self.type_size + self.offset_size, self.length_size)
+                    yield posixpath.join(cwd, name), type_id, offset, count
+                elif command == ENDSYMBOLTABLE:
+                    table = self._int(body, self.offset_size)
+                    break
+                pos = end
+
+    def view(self, type_id: int, offset: int, count: int) -> np.ndarray:
+        """Zero-copy view of the values of the DATA record at ``offset``."""
+        _, command, body = self._record(offset)
+        if command != DATA:
+            raise ValueError(f"{self.path}: no data record at byte {offset}")
+        n_name = self.mm[body + self.type_size]
+        start = body + self.type_size + 1 + n_name
+        dtype = np.dtype(self.prefix + TYPE_CODES[type_id])
+        return np.frombuffer(self.mm, dtype=dtype, count=count, offset=start)
+
+    def close(self):
+        try:
+            self.mm.close()
+        except BufferError:
+            # A view returned by get() is still alive; the map is released
+            # when that view is garbage collected.
+            pass
+        self._fh.close()
+
+
+class Binout:
+    """
+    Lazy reader of a binout file or series.
+
+    Parameters:
+        path (str): File, series stem or glob pattern (see ``series_files``).
+    """
+
+    def __init__(self, path):
+        self.files = [_LsdaFile(p) for p in series_files(path)]
+        # path -> [(file index, type id, offset, count), ...] in file order
+        self.symbols = {}
+        for i, f in enumerate(self.files):
+            for name, type_id, offset, count in f.symbols():
+                self.symbols.setdefault(name, []).append((i, type_id, offset, count))
+        self._children = {}
+        for name in self.symbols:
+            parts = name.strip("/").split("/")
+            for depth in range(len(parts)):
+                parent = "/" + "/".join(parts[:depth])
+                self._children.setdefault(posixpath.normpath(parent), set()).add(parts[depth])
+
+    # ------------------------------------------------------------------ index
+
+    def ls(self, path: str = "/"):
+        """Sorted names of the directories and variables directly under ``path``."""
+        return sorted(self._children.get(posixpath.normpath("/" + path.strip("/")), ()))
+
+    def branches(self):
+        """Top-level databases (``glstat``, ``nodout``, ...)."""
+        return self.ls("/")
+
+    def states(self, branch: str):
+        """State directories of ``branch`` (``d000001``, ...), in order."""
+        return [d for d in self.ls(branch) if d.startswith("d") and d[1:].isdigit()]
+
+    # --------------------------------------------------------------- loading
+
+    def get(self, path: str) -> np.ndarray:
+        """
+        Values of one variable, e.g. ``/nodout/metadata/ids``.
+
+        Returns a read-only view into the map when the variable is stored in
+        one record, else a concatenated copy.
+        """
+        entries = self.symbols.get(posixpath.normpath("/" + path.strip("/")))
+        if entries is None:
+            raise KeyError(f"No variable {path!r} in binout")
+        views = [self.files[i].view(t, off, n) for i, t, off, n in entries]
+        return views[0] if len(views) == 1 else np.concatenate(views)
+
+    def read(self, branch: str, variable: str = None):
+        """
+        One variable over every state of a branch.
+
+        Parameters:
+            branch (str): Branch name, or "branch/variable".
+            variable (str): Variable name inside the state directories.
+
+        Returns:
+            tuple: (time (n_states,), values (n_states, n)); states missing the
+                   variable are skipped.
+        """
+        if variable is None:
+            branch, variable = branch.strip("/").rsplit("/", 1)
+        times, rows = [], []
+        for state in self.states(branch):
+            path = f"/{branch.strip('/')}/{state}/{variable}"
+            if path not in self.symbols:
+                continue
+            rows.append(self.get(path))
+            t = f"/{branch.strip('/')}/{state}/time"
+            times.append(self.get(t)[0] if t in self.symbols else np.nan)
+        if not rows:
+            raise KeyError(f"No variable {variable!r} in branch {branch!r}")
+        return np.asarray(times, dtype=np.float64), np.stack(rows)
+
+    # -------------------------------------------------------------- lifecycle
+
+    def close(self):
+        for f in self.files:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,314 @@
+"""
+Memory-mapped reader for ``d3plot`` families.
+
+A d3plot family (``d3plot``, ``d3plot01``, ``d3plot02``, ...) is a stream of
+4-byte (single precision) or 8-byte words. The first file starts with a
+64-word control block; the words used here (0-based) are
+
+    NDIM 15, NUMNP 16, NGLBV 18, IT 19, IU 20, IV 21, IA 22,
+    NEL8 23, NV3D 27, NEL2 28, NV1D 30, NEL4 31, NV2D 33,
+    MAXINT 36, NMSPH 37, NARBS 39, NELT 40, NV3DT 42, IALEMAT 47,
+    NCFDV1 48, NCFDV2 49, NPEFG 54, EXTRA 57
+
+followed by ``EXTRA`` extension words, the geometry (material-type table for
+NDIM 5/7, ALE materials, SPH flags, coordinates, solid / thick shell / beam /
+shell connectivity, user IDs, SPH node table, part titles) and the states.
+Every state has the same size:
+
+    time, NGLBV globals, nodal temperatures / coordinates / velocities /
+    accelerations, NEL8*NV3D solid, NELT*NV3DT thick shell, NEL2*NV1D beam,
+    NEL4*NV2D shell values, deletion flags (MAXINT < 0), NMSPH SPH records
+
+and states follow each other through the family until a -999999.0 end
+marker or the end of a file. Opening a family parses the control block and
+geometry once and computes the word offset of every state; nothing of the
+states is read until a variable is requested. ``state_view`` returns a
+whole state as a view into the map, ``field`` one variable of one state, and
+``read`` one variable over many states, touching only those words.
+
+Airbag (NPEFG), rigid road / rigid body (NDIM 8 / 9) and CFD (NCFDV1/2)
+sections are not supported; files using them raise ``ValueError``.
+
+Examples
+--------
+>>> with D3plot("run/d3plot") as d:
+...     print(d.n_states, d.times[:3])
+...     u = d.displacements(states=range(0, d.n_states, 10))     # (n, NUMNP, 3)
+...     rho = d.read("sph", states=None)[..., d.sph_columns["density"]]
+...     sig = d.read("solid")[..., :6]                           # (n_states, NEL8, 6)
+"""
+from __future__ import annotations
+
+import glob
+import mmap
+import os
+import re
+
+import numpy as np
+
+CONTROL_WORDS = 64
+END_MARKER = -999999.0
+
+# 0-based word positions in the control block.
+_CONTROL = {
+    "NDIM": 15, "NUMNP": 16, "ICODE": 17, "NGLBV": 18, "IT": 19, "IU": 20, "IV": 21, "IA": 22,
+    "NEL8": 23, "NUMMAT8": 24, "NV3D": 27, "NEL2": 28, "NUMMAT2": 29, "NV1D": 30,
+    "NEL4": 31, "NUMMAT4": 32, "NV2D": 33, "NEIPH": 34, "NEIPS": 35, "MAXINT": 36,
+    "NMSPH": 37, "NGPSPH": 38, "NARBS": 39, "NELT": 40, "NUMMATT": 41, "NV3DT": 42,
+    "IALEMAT": 47, "NCFDV1": 48, "NCFDV2": 49, "NPEFG": 54, "EXTRA": 57,
+}
+
+# Control words announcing sections this reader does not decode (CFD,
+# airbag particles); the state size would be wrong, so they are refused.
+_UNSUPPORTED = ("NCFDV1", "NCFDV2", "NPEFG")
+
+# SPH flag words isphfg(2..10) and the values per particle each one enables.
+SPH_FLAGS = (("radius", 1), ("pressure", 1), ("stress", 6), ("plastic_strain", 1), ("density", 1),
+             ("internal_energy", 1), ("n_neighbours", 1), ("strain", 6), ("mass", 1))
+
+_TITLE_TYPES = (90000, 90001, 90002)
+
+
+def family_files(path):
+    """``d3plot`` followed by ``d3plot01``, ``d3plot02``, ... in numeric order."""
+    path = os.fspath(path)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+    pattern = re.compile(re.escape(os.path.basename(path)) + r"(\d{2,})$")
+    others = []
+    for p in glob.glob(glob.escape(path) + "[0-9][0-9]*"):
+        m = pattern.match(os.path.basename(p))
+        if m:
+            others.append((int(m.group(1)), p))
+    return [path] + [p for _, p in sorted(others)]
+
+
+def _detect_format(head: bytes):
+    """(word size, byte order) for which NDIM and NUMNP are plausible."""
+    for size, order in ((4, "<"), (8, "<"), (4, ">"), (8, ">")):
+        if len(head) < CONTROL_WORDS * size:
+            continue
+        words = np.frombuffer(head[:CONTROL_WORDS * size], dtype=f"{order}i{size}")
+        if 2 <= words[_CONTROL["NDIM"]] <= 9 and words[_CONTROL["NUMNP"]] >= 0:
+            return size, order
+    raise ValueError("Not a d3plot file (implausible control block)")
+
+
+class D3plot:
+    """
+    Lazy reader of a d3plot family.
+
+    Parameters:
+        path (str): First file of the family (``d3plot``).
+
+    Attributes:
+        control (dict): Control words by name.
+        coordinates (np.ndarray): (NUMNP, 3) initial coordinates.
+        solids, thick_shells, beams, shells (np.ndarray): Connectivity
+            (0-based node indices), ``*_mat`` the material index per element.
+        node_ids (np.ndarray): User node IDs (1..NUMNP without NARBS).
+        sph_nodes, sph_mat (np.ndarray): 0-based node index and material of
+            every SPH particle.
+        times (np.ndarray): Time of every state.
+    """
+
+    def __init__(self, path):
+        self.files = family_files(path)
+        self._fhs, self._maps, self._words = [], [], []
+        for p in self.files:
+            fh = open(p, "rb")
+            self._fhs.append(fh)
+            if os.fstat(fh.fileno()).st_size == 0:
+                self._maps.append(b"")
+                continue
+            self._maps.append(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+        self.word_size, order = _detect_format(self._maps[0][:CONTROL_WORDS * 8])
+        self.float_dtype = np.dtype(f"{order}f{self.word_size}")
+        self.int_dtype = np.dtype(f"{order}i{self.word_size}")
+        for mm in self._maps:
+            n = len(mm) // self.word_size
+            self._words.append(np.frombuffer(mm, dtype=self.float_dtype, count=n) if n else
+                               np.empty(0, self.float_dtype))
+        ints = self._words[0].view(self.int_dtype)
+        self.control = {k: int(ints[i]) for k, i in _CONTROL.items()}
+        unsupported = [k for k in _UNSUPPORTED if self.control[k]]
+        if self.control["NDIM"] in (8, 9):
+            unsupported.append("NDIM 8/9 (rigid road / rigid body)")
+        if unsupported:
+            raise ValueError(f"{self.files[0]}: unsupported d3plot sections ({', '.join(unsupported)})")
+        self._geometry(ints)
+        self._state_layout()
+        self._index_states()
+
+    # --------------------------------------------------------------- geometry
+
+    def _geometry(self, ints):
+        c = self.control
+        pos = CONTROL_WORDS + max(c["EXTRA"], 0)
+        if c["NDIM"] in (5, 7):                 # material type table: NUMRBE, NUMMAT, IMATYP(NUMMAT)
+            pos += 2 + int(ints[pos + 1])
+        if c["IALEMAT"] > 0:
+            pos += c["IALEMAT"]
+        self.sph_columns, self.n_sph_vars = {}, 0
+        if c["NMSPH"] > 0:
+            n_flags = int(ints[pos])
+            flags = ints[pos + 1:pos + n_flags]
+            col = 1                             # column 0: material / deletion flag
+            for (name, width), flag in zip(SPH_FLAGS, flags):
+                if flag > 0:
+                    self.sph_columns[name] = slice(col, col + width) if width > 1 else col
+                    col += width
+            self.n_sph_vars = col
+            pos += n_flags
+
+        numnp = c["NUMNP"]
+        self.coordinates = self._words[0][pos:pos + 3 * numnp].reshape(numnp, 3)
+        pos += 3 * numnp
+        for name, count, width in (("solids", abs(c["NEL8"]), 9), ("thick_shells", c["NELT"], 9),
+                                   ("beams", c["NEL2"], 6), ("shells", c["NEL4"], 5)):
+            conn = ints[pos:pos + count * width].reshape(count, width)
+            n_nodes = 4 if name == "shells" else (2 if name == "beams" else 8)
+            setattr(self, name, conn[:, :n_nodes] - 1)
+            setattr(self, name + "_mat", conn[:, -1])
+            pos += count * width
+            if name == "solids" and c["NEL8"] < 0:
+                pos += 2 * count                # 10-node solid extra nodes follow the solids
+
+        self.node_ids = np.arange(1, numnp + 1)
+        if c["NARBS"] > 0:
+            head = 16 if ints[pos] < 0 else 10
+            self.node_ids = ints[pos + head:pos + head + numnp]
+            pos += c["NARBS"]
+        if c["NMSPH"] > 0:
+            table = ints[pos:pos + 2 * c["NMSPH"]].reshape(-1, 2)
+            self.sph_nodes, self.sph_mat = table[:, 0] - 1, table[:, 1]
+            pos += 2 * c["NMSPH"]
+        else:
+            self.sph_nodes = self.sph_mat = np.empty(0, dtype=self.int_dtype)
+
+        # Optional title sections, then an optional end-of-geometry marker.
+        words = self._words[0]
+        while pos < words.size and int(ints[pos]) in _TITLE_TYPES:
+            if int(ints[pos]) == 90000:
+                pos += 1 + 80 // self.word_size
+            elif int(ints[pos]) == 90001:
+                pos += 2 + int(ints[pos + 1]) * (1 + 72 // self.word_size)
+            else:
+                pos += 2 + int(ints[pos + 1]) * (80 // self.word_size)
+        if pos < words.size and words[pos] == END_MARKER:
+            pos += 1
+        self.geometry_words = pos
+
+    # ------------------------------------------------------------ state index
+
+    def _state_layout(self):
+        """Word ranges of the variables inside one state."""
+        c = self.control
+        numnp = c["NUMNP"]
+        it = c["IT"] % 10
+        layout, pos = {}, 0
+
+        def add(name, count, width):
+            nonlocal pos
+            layout[name] = (pos, count, width)
+            pos += count * width
+
+        add("time", 1, 1)
+        add("global", 1, c["NGLBV"])
+        add("temperatures", numnp, {0: 0, 1: 1, 2: 3, 3: 4}.get(it, 1) + (1 if c["IT"] >= 10 else 0))
+        add("coordinates", numnp, 3 * c["IU"])
+        add("velocities", numnp, 3 * c["IV"])
+        add("accelerations", numnp, 3 * c["IA"])
+        add("solid", abs(c["NEL8"]), c["NV3D"])
+        add("thick_shell", c["NELT"], c["NV3DT"])
+        add("beam", c["NEL2"], c["NV1D"])
+        add("shell", c["NEL4"], c["NV2D"])
+        if c["MAXINT"] < 0:
+            if c["MAXINT"] <= -10000:
+                add("deletion", 1, abs(c["NEL8"]) + c["NELT"] + c["NEL4"] + c["NEL2"])
+            else:
+                add("deletion", numnp, 1)
+        add("sph", c["NMSPH"], self.n_sph_vars)
+        self.layout = layout
+        self.state_words = pos
+
+    def _index_states(self):
+        """(file index, word offset) of every complete state in the family."""
+        locations = []
+        for i, words in enumerate(self._words):
+            pos = self.geometry_words if i == 0 else 0
+            while pos + self.state_words <= words.size and words[pos] != END_MARKER:
+                locations.append((i, pos))
+                pos += self.state_words
+        self.state_locations = locations
+        self.times = np.array([self._words[i][p] for i, p in locations], dtype=np.float64)
+
+    @property
+    def n_states(self) -> int:
+        return len(self.state_locations)
+
+    # --------------------------------------------------------------- loading
+
+    def state_view(self, state: int) -> np.ndarray:
+        """All words of one state (a view into the map)."""
+        i, pos = self.state_locations[state]
+        return self._words[i][pos:pos + self.state_words]
+
+    def field(self, state: int, name: str) -> np.ndarray:
+        """
+        One variable of one state as a (count, width) view, e.g. "coordinates"
+        (NUMNP, 3), "solid" (NEL8, NV3D), "sph" (NMSPH, n_sph_vars).
+        """
+        if name not in self.layout:
+            raise KeyError(f"Unknown d3plot state variable {name!r}")
+        start, count, width = self.layout[name]
+        i, pos = self.state_locations[state]
+        return self._words[i][pos + start:pos + start + count * width].reshape(count, width)
+
+    def read(self, name: str, states=None, items=None) -> np.ndarray:
+        """
+        One variable over several states.
+
+        Parameters:
+            name (str): State variable (see ``layout``).
+            states (sequence, optional): State indices (default: all).
+            items (sequence, optional): Nodes / elements / particles (0-based
+                                        indices; default: all).
+
+        Returns:
+            np.ndarray: (n_states, n_items, width) copy.
+        """
+        states = range(self.n_states) if states is None else states
+        _, count, width = self.layout[name]
+        n_items = count if items is None else len(items)
+        out = np.empty((len(states), n_items, width), dtype=self.float_dtype)
+        for k, s in enumerate(states):
+            values = self.field(s, name)
+            out[k] = values if items is None else values[items]
+        return out
+
+    def displacements(self, states=None, nodes=None) -> np.ndarray:
+        """(n_states, n_nodes, 3) nodal displacements from the stored coordinates."""
+        if self.control["IU"] == 0:
+            raise ValueError("d3plot has no nodal coordinates in its states (IU = 0)")
+        x0 = self.coordinates if nodes is None else self.coordinates[nodes]
+        return self.read("coordinates", states, nodes) - x0
+
+    # -------------------------------------------------------------- lifecycle
+
+    def close(self):
+        self._words = []
+        for mm in self._maps:
+            if isinstance(mm, mmap.mmap):
+                try:
+                    mm.close()
+                except BufferError:
+                    pass
+        for fh in self._fhs:
+            fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
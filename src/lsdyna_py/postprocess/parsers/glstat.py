@@ -0,0 +1,198 @@
+"""
+Parsers for the ASCII energy files ``glstat`` and ``matsum``.
+
+``glstat`` holds one block of ``label....... value`` lines per output time:
+
+     time...........................   1.00000E-06
+     kinetic energy.................   1.23456E+02
+     internal energy................   0.00000E+00
+     hourglass energy ..............   0.00000E+00
+     sliding interface energy.......   0.00000E+00
+     ...
+
+``matsum`` holds one block per output time with ``key= value`` pairs per
+material (part):
+
+     time =    1.00000E-06
+     mat.#=    1   inten=   0.0000E+00     kinen=   1.2345E+02  ...
+     x-mom=   0.0000E+00  ...  hgeng=   0.0000E+00 ...
+
+Labels become snake_case column names (``kinetic_energy``,
+``hourglass_energy``, ``sliding_interface_energy``; ``mat``, ``inten``,
+``kinen``, ``hgeng``, ``x_mom``, ...). ``read_glstat`` returns one row per
+time, ``read_matsum`` one row per (time, mat); ``matsum_pivot`` turns one
+matsum column into a time x mat table.
+
+``EnergyTail`` polls a file that the solver is still writing: it keeps the
+byte offset of the first block it has not parsed and every ``poll`` reads
+from there, returning only the blocks that have since been completed (a
+block is complete once the next one has started; ``final=True`` also takes
+the last block, e.g. after the run ended). Polling many live jobs costs one
+``stat`` per file plus the new bytes.
+
+Examples
+--------
+>>> df = read_glstat("run/glstat")
+>>> df[["time", "kinetic_energy", "internal_energy", "hourglass_energy"]].plot(x="time")
+>>> ke = matsum_pivot(read_matsum("run/matsum"), "kinen")      # columns = mat IDs
+>>> tail = EnergyTail("run/glstat")
+>>> new_rows = tail.poll()     # call periodically while the job runs
+"""
+from __future__ import annotations
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+GLSTAT = "glstat"
+MATSUM = "matsum"
+
+_GLSTAT_LINE = re.compile(r"^\s*(\S.*?)\s*\.{2,}\s*(\S+)\s*$")
+_MATSUM_PAIR = re.compile(r"([^\s=]+)\s*=\s*(\S+)")
+_BLOCK_START = {
+    GLSTAT: re.compile(rb"^ *time *\.{2,}", re.MULTILINE),
+    MATSUM: re.compile(rb"^ *time *=", re.MULTILINE),
+}
+
+
+def _column_name(label: str) -> str:
+    """'sliding interface energy' -> 'sliding_interface_energy', 'mat.#' -> 'mat'."""
+    label = label.strip().lower()
+    prefix = {"+": "pos_", "-": "neg_"}.get(label[:1], "")
+    name = re.sub(r"[^0-9a-z]+", "_", label).strip("_")
+    return "mat" if name == "mat" else prefix + name
+
+
+def _to_float(text: str) -> float:
+    try:
+        return float(text.upper().replace("D", "E"))
+    except ValueError:
+        return np.nan
+
+
+def parse_glstat_block(text: str) -> dict:
+    """One glstat block -> {column: value}."""
+    row = {}
+    for line in text.splitlines():
+        m = _GLSTAT_LINE.match(line)
+        if m:
+            row[_column_name(m.group(1))] = _to_float(m.group(2))
+    return row
+
+
+def parse_matsum_block(text: str):
+    """One matsum block -> list of {column: value} rows, one per material."""
+    rows, time = [], np.nan
+    for key, value in _MATSUM_PAIR.findall(text):
+        name = _column_name(key)
+        if name == "time" and not rows:
+            time = _to_float(value)
+        elif name == "mat":
+            rows.append({"time": time, "mat": int(_to_float(value))})
+        elif rows:
+            rows[-1][name] = _to_float(value)
+    return rows
+
+
+def _parse_blocks(data: bytes, starts, kind: str):
+    rows = []
+    for a, b in zip(starts, starts[1:]):
+        text = data[a:b].decode("ascii", "replace")
+        if kind == GLSTAT:
+            row = parse_glstat_block(text)
+            if row:
+                rows.append(row)
+        else:
+            rows.extend(parse_matsum_block(text))
+    return rows
+
+
+def _frame(rows, kind: str) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(rows)
+    if kind == MATSUM and not df.empty:
+        df["mat"] = df["mat"].astype(np.int64)
+    return df
+
+
+class EnergyTail:
+    """
+    Incremental reader of a growing glstat / matsum file.
+
+    Parameters:
+        path (str): File path (it may not exist yet).
+        kind (str): "glstat" or "matsum" (default: from the file name).
+
+    Attributes:
+        offset (int): Byte offset of the first block not yet parsed.
+        rows (list): Every row parsed so far (dicts).
+    """
+
+    def __init__(self, path, kind: str = None):
+        self.path = os.fspath(path)
+        self.kind = kind or (MATSUM if MATSUM in os.path.basename(self.path).lower() else GLSTAT)
+        if self.kind not in _BLOCK_START:
+            raise ValueError(f"Unknown energy file kind {self.kind!r}")
+        self.offset = 0
+        self.rows = []
+        # The last parsed block, compared with the file on every poll to
+        # notice a rewrite also when the new file is already longer (a few
+        # bytes would not do: consecutive blocks end in the same lines).
+        self._mark = b""
+
+    def poll(self, final: bool = False) -> pd.DataFrame:
+        """
+        Parse the blocks completed since the last call.
+
+        Parameters:
+            final (bool): Also parse the last block (the writer has finished).
+
+        Returns:
+            pd.DataFrame: The new rows (empty if there are none).
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return _frame([], self.kind)
+        with open(self.path, "rb") as f:
+            f.seek(self.offset - len(self._mark))
+            if size < self.offset or f.read(len(self._mark)) != self._mark:
+                # Rewritten by a new run: start over.
+                self.offset, self.rows, self._mark = 0, [], b""
+                f.seek(0)
+            data = f.read(size - self.offset)
+        data = data[:data.rfind(b"\n") + 1]     # complete lines only
+        starts = [m.start() for m in _BLOCK_START[self.kind].finditer(data)]
+        if not starts:
+            return _frame([], self.kind)
+        if final:
+            starts.append(len(data))
+        rows = _parse_blocks(data, starts, self.kind)
+        self.offset += starts[-1]
+        self._mark = data[starts[-2]:starts[-1]] if len(starts) > 1 else self._mark + data[:starts[-1]]
+        self.rows.extend(rows)
+        return _frame(rows, self.kind)
+
+    def frame(self) -> pd.DataFrame:
+        """All rows parsed so far."""
+        return _frame(self.rows, self.kind)
+
+
+def read_glstat(path) -> pd.DataFrame:
+    """Whole glstat file -> DataFrame with one row per output time."""
+    tail = EnergyTail(path, GLSTAT)
+    tail.poll(final=True)
+    return tail.frame()
+
+
+def read_matsum(path) -> pd.DataFrame:
+    """Whole matsum file -> DataFrame with one row per (time, mat)."""
+    tail = EnergyTail(path, MATSUM)
+    tail.poll(final=True)
+    return tail.frame()
+
+
+def matsum_pivot(df: pd.DataFrame, column: str = "kinen") -> pd.DataFrame:
+    """One matsum column as a table indexed by time with one column per mat."""
+    return df.pivot_table(index="time", columns="mat", values=column, aggfunc="last")
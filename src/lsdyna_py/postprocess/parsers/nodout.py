@@ -0,0 +1,230 @@
+"""
+Memory-mapped ASCII ``nodout`` parser.
+
+A ``nodout`` file is a sequence of blocks, one per output time:
+
+     n o d a l   p r i n t   o u t   f o r   t i m e  s t e p       5   ( at time 1.0000000E-06 )
+
+     nodal point  x-disp     y-disp      z-disp      x-vel    ...  z-coor
+             1 1.2345E-05 ...                        (i10 + 12 x e12)
+
+optionally followed by a rotation table of the same nodes. Opening a file
+memory-maps it and finds every block header with one pass of ``find``; the
+node IDs, row stride and field layout are taken from the first block. Node
+rows are then decoded straight from the map as fixed-width character
+columns (``keyword.reader`` decoders), so only the selected times and
+nodes are ever touched and ``iter_chunks`` keeps memory bounded by the chunk
+size, regardless of the file size.
+
+Examples
+--------
+>>> with NodoutFile("nodout") as nf:
+...     print(nf.times.shape, nf.node_ids[:5], nf.fields)
+...     times, data = nf.read(nodes=[1001, 1002], t_min=1e-5)    # (n_t, 2, 12)
+...     for times, chunk in nf.iter_chunks(100, fields=["z_disp"]):
+...         peak = np.maximum(peak, np.abs(chunk[..., 0]).max(axis=0))
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import re
+
+import numpy as np
+
+from ...keyword.reader import _decode_field
+
+BLOCK_MARKER = b"n o d a l   p r i n t   o u t"
+TABLE_MARKER = b"nodal point"
+FIELD_WIDTH = 12
+
+_TIME_RE = re.compile(rb"s t e p\s+(\d+)\s*\(\s*at time\s*([-+.0-9EeDd]+)")
+_DEFAULT_CHUNK_TIMES = 64
+
+
+def _field_name(token: str) -> str:
+    return token.strip().replace("-", "_").replace(" ", "_")
+
+
+class NodoutFile:
+    """
+    Read-only view of an ASCII nodout file.
+
+    Attributes:
+        times (np.ndarray): (n_times,) output times.
+        steps (np.ndarray): (n_times,) time step numbers.
+        node_ids (np.ndarray): (n_nodes,) node IDs in file order.
+        fields (tuple): Field names, e.g. ("x_disp", ..., "z_coor").
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._fh = open(self.path, "rb")
+        size = os.fstat(self._fh.fileno()).st_size
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._buf = np.frombuffer(self._mm, dtype=np.uint8) if size else np.empty(0, np.uint8)
+        self._index()
+
+    # ------------------------------------------------------------------ index
+
+    def _index(self):
+        mm = self._mm
+        starts, steps, times = [], [], []
+        pos = mm.find(BLOCK_MARKER)
+        while pos != -1:
+            line_end = mm.find(b"\n", pos)
+            line_end = len(mm) if line_end == -1 else line_end
+            m = _TIME_RE.search(mm[pos:line_end])
+            table = mm.find(TABLE_MARKER, line_end)
+            row = mm.find(b"\n", table) + 1 if table != -1 else 0
+            if m is None or table == -1 or row == 0:
+                raise ValueError(f"Malformed nodout block at byte {pos}")
+            starts.append(row)
+            steps.append(int(m.group(1)))
+            times.append(float(m.group(2).upper().replace(b"D", b"E")))
+            pos = mm.find(BLOCK_MARKER, row)
+        self.row_starts = np.array(starts, dtype=np.int64)
+        self.steps = np.array(steps, dtype=np.int64)
+        self.times = np.array(times, dtype=np.float64)
+        if not starts:
+            self.node_ids = np.empty(0, dtype=np.int64)
+            self.fields, self.stride, self.id_width, self.n_nodes = (), 0, 0, 0
+            return
+
+        # Layout from the first block: column names, row stride, node count.
+        first = starts[0]
+        header_start = mm.rfind(b"\n", 0, first - 1) + 1
+        header = bytes(mm[header_start:first]).decode("ascii", "replace")
+        names = header.split(TABLE_MARKER.decode(), 1)[1].split()
+        self.fields = tuple(_field_name(t) for t in names)
+        line_end = mm.find(b"\n", first)
+        self.stride = line_end + 1 - first
+        content = line_end - first - (mm[line_end - 1:line_end] == b"\r")
+        self.id_width = content - FIELD_WIDTH * len(self.fields)
+        if self.id_width <= 0:
+            raise ValueError("Unexpected nodout row layout")
+
+        # Rows run until the first line of another length (blank line, next
+        # header or end of file).
+        block_end = starts[1] if len(starts) > 1 else len(mm)
+        n_nodes = 0
+        pos = first
+        while pos + self.stride <= block_end and mm[pos + self.stride - 1:pos + self.stride] == b"\n" \
+                and bytes(mm[pos:pos + self.id_width]).strip().isdigit():
+            n_nodes += 1
+            pos += self.stride
+        self.n_nodes = n_nodes
+        ids = self._buf[first:first + n_nodes * self.stride].reshape(n_nodes, self.stride)[:, :self.id_width]
+        self.node_ids = _decode_field(ids, np.int64)
+
+    # --------------------------------------------------------------- decoding
+
+    def node_index(self, nodes) -> np.ndarray:
+        """Row positions of the node IDs ``nodes``."""
+        nodes = np.asarray(nodes, dtype=np.int64).ravel()
+        order = np.argsort(self.node_ids, kind="stable")
+        pos = np.searchsorted(self.node_ids, nodes, sorter=order)
+        pos = np.minimum(pos, max(self.node_ids.size - 1, 0))
+        rows = order[pos]
+        missing = self.node_ids[rows] != nodes
+        if np.any(missing):
+            raise KeyError(f"Nodes not in nodout: {nodes[missing][:10].tolist()}")
+        return rows
+
+    def time_index(self, t_min=None, t_max=None) -> np.ndarray:
+        """Block positions with ``t_min <= time <= t_max``."""
+        keep = np.ones(self.times.size, dtype=bool)
+        if t_min is not None:
+            keep &= self.times >= t_min
+        if t_max is not None:
+            keep &= self.times <= t_max
+        return np.flatnonzero(keep)
+
+    def _field_index(self, fields):
+        if fields is None:
+            return list(range(len(self.fields)))
+        return [self.fields.index(_field_name(f)) for f in fields]
+
+    def _decode(self, blocks, rows, cols) -> np.ndarray:
+        """(len(blocks), len(rows), len(cols)) values straight from the map."""
+        # Each block is an (n_nodes, stride) character matrix in the map; copy
+        # the selected rows and the column span of the selected fields, then
+        # decode the whole chunk as one (values, 12) matrix.
+        lo, hi = min(cols), max(cols) + 1
+        c0 = self.id_width + lo * FIELD_WIDTH
+        c1 = self.id_width + hi * FIELD_WIDTH
+        all_rows = rows.size == self.n_nodes and np.array_equal(rows, np.arange(self.n_nodes))
+        size = self.n_nodes * self.stride
+        chars = np.empty((len(blocks), rows.size, c1 - c0), dtype=np.uint8)
+        for k, start in enumerate(self.row_starts[blocks]):
+            table = self._buf[start:start + size].reshape(self.n_nodes, self.stride)
+            chars[k] = table[:, c0:c1] if all_rows else table[rows, c0:c1]
+        chars = chars.reshape(len(blocks), rows.size, hi - lo, FIELD_WIDTH)
+        if hi - lo != len(cols):
+            chars = chars[:, :, np.asarray(cols) - lo]
+        values = _decode_field(chars.reshape(-1, FIELD_WIDTH), np.float64)
+        return values.reshape(len(blocks), len(rows), len(cols))
+
+    def iter_chunks(self, chunk_times: int = _DEFAULT_CHUNK_TIMES, nodes=None, t_min=None, t_max=None,
+                    fields=None):
+        """
+        Yield (times, data) with ``data`` of shape (<= chunk_times, n_nodes, n_fields).
+
+        Parameters:
+            chunk_times (int): Output times per chunk.
+            nodes (sequence, optional): Node IDs (default: all, in file order).
+            t_min, t_max (float, optional): Time range (inclusive).
+            fields (sequence, optional): Field names (default: all).
+        """
+        blocks = self.time_index(t_min, t_max)
+        rows = np.arange(self.n_nodes) if nodes is None else self.node_index(nodes)
+        cols = self._field_index(fields)
+        for s in range(0, blocks.size, chunk_times):
+            b = blocks[s:s + chunk_times]
+            yield self.times[b], self._decode(b, rows, cols)
+
+    def read(self, nodes=None, t_min=None, t_max=None, fields=None):
+        """
+        Returns:
+            tuple: (times (n_t,), data (n_t, n_nodes, n_fields)) for the selection.
+        """
+        blocks = self.time_index(t_min, t_max)
+        rows = np.arange(self.n_nodes) if nodes is None else self.node_index(nodes)
+        cols = self._field_index(fields)
+        data = np.empty((blocks.size, rows.size, len(cols)), dtype=np.float64)
+        s = 0
+        for _, chunk in self.iter_chunks(_DEFAULT_CHUNK_TIMES, nodes, t_min, t_max, fields):
+            data[s:s + chunk.shape[0]] = chunk
+            s += chunk.shape[0]
+        return self.times[blocks], data
+
+    # -------------------------------------------------------------- lifecycle
+
+    def close(self):
+        self._buf = None
+        if isinstance(self._mm, mmap.mmap):
+            try:
+                self._mm.close()
+            except BufferError:
+                pass
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_nodout(path, nodes=None, t_min=None, t_max=None, fields=None):
+    """
+    Read a nodout file in one call.
+
+    Returns:
+        tuple: (times, node_ids, data, fields); ``data`` is (n_times, n_nodes, n_fields).
+    """
+    with NodoutFile(path) as nf:
+        times, data = nf.read(nodes, t_min, t_max, fields)
+        node_ids = nf.node_ids if nodes is None else np.asarray(nodes, dtype=np.int64)
+        names = nf.fields if fields is None else tuple(_field_name(f) for f in fields)
+        return times, node_ids.copy(), data, names
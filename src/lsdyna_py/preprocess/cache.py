@@ -0,0 +1,143 @@
+"""
+Binary mesh cache (memory-mappable .npy sidecars).
+
+Sweeps regenerate or re-parse the same meshes over and over. ``MeshCache``
+stores the node/element arrays of a mesh as uncompressed ``.npy`` files in one
+directory per key, so a repeated request is served by ``np.load(mmap_mode="r")``
+in milliseconds without copying the data.
+
+Keys are either
+- ``MeshCache.key_from_params(...)``: a hash of the generator parameters
+  (e.g. ``box_cfg`` / ``sphere_cfg`` in ``sph_geo_generate.py``), or
+- ``MeshCache.key_from_file(path)``: a hash of a .k file's content.
+
+The cache is bounded by ``max_bytes``; the least recently used entries are
+evicted first. ``invalidate(key)`` and ``clear()`` remove entries explicitly.
+
+Examples
+--------
+>>> cache = MeshCache("outputs/.mesh_cache", max_bytes=20 * 2**30)
+>>> key = MeshCache.key_from_params("sph_box", **box_cfg)
+>>> arrays = cache.get_or_create(key, lambda: {"xyz": make_box(box_cfg)})
+>>> nids, xyz = cached_keyword_nodes("plate.k", cache)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from ..keyword.reader import KeywordFile
+from ..store import DirectoryStore
+
+_HASH_CHUNK = 1 << 24
+
+
+class MeshCache(DirectoryStore):
+    """
+    Size-bounded LRU store of named NumPy arrays (see ``store.DirectoryStore``).
+
+    Parameters:
+        root (str): Cache directory (created if missing).
+        max_bytes (int, optional): Size limit; None means unbounded.
+    """
+
+    # ------------------------------------------------------------------ keys
+
+    @staticmethod
+    def key_from_params(kind: str, **params) -> str:
+        """Stable key from a generator name and its (JSON-serializable) parameters."""
+        payload = json.dumps({"kind": kind, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def key_from_file(path, kind: str = "keyword") -> str:
+        """Key from the content of a file (e.g. an input .k deck)."""
+        h = hashlib.blake2b(kind.encode("utf-8"), digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    # ----------------------------------------------------------------- access
+
+    def get(self, key: str):
+        """
+        Load an entry as read-only memory maps.
+
+        Returns:
+            dict: {name: np.memmap} or None if the key is not cached.
+        """
+        meta = self._read_meta(key)
+        if meta is None:
+            return None
+        entry = self._entry(key)
+        try:
+            arrays = {name: np.load(os.path.join(entry, name + ".npy"), mmap_mode="r")
+                      for name in meta["arrays"]}
+        except FileNotFoundError:
+            return None
+        self._mark_used(key)
+        return arrays
+
+    def put(self, key: str, arrays: dict, info: dict = None):
+        """
+        Store ``arrays`` ({name: array}) under ``key`` and evict old entries
+        if the cache exceeds ``max_bytes``.
+
+        Returns:
+            dict: The stored arrays, loaded back as memory maps.
+        """
+        with self._staging() as tmp:
+            size = 0
+            for name, arr in arrays.items():
+                path = os.path.join(tmp, name + ".npy")
+                np.save(path, np.ascontiguousarray(arr), allow_pickle=False)
+                size += os.path.getsize(path)
+            self._commit(tmp, key, {"arrays": list(arrays), "bytes": size, "created": time.time(),
+                                    "info": info or {}})
+        return self.get(key)
+
+    def get_or_create(self, key: str, factory, info: dict = None):
+        """Return the cached arrays for ``key``, building them with ``factory()`` on a miss."""
+        arrays = self.get(key)
+        if arrays is None:
+            arrays = self.put(key, factory(), info=info)
+        return arrays
+
+
+def cached_keyword_nodes(path, cache: MeshCache):
+    """
+    ``*NODE`` arrays of a keyword file, parsed once and then served from the cache.
+
+    Returns:
+        tuple: (nids, xyz) as read-only memory maps.
+    """
+    def parse():
+        with KeywordFile(path) as kf:
+            nids, xyz = kf.read_nodes()
+        return {"nids": nids, "xyz": xyz}
+
+    arrays = cache.get_or_create(MeshCache.key_from_file(path, "nodes"), parse,
+                                 info={"source": os.path.abspath(path)})
+    return arrays["nids"], arrays["xyz"]
+
+
+def cached_keyword_solids(path, cache: MeshCache):
+    """
+    ``*ELEMENT_SOLID`` arrays of a keyword file, served from the cache after the first parse.
+
+    Returns:
+        tuple: (eids, pids, conn) as read-only memory maps.
+    """
+    def parse():
+        with KeywordFile(path) as kf:
+            eids, pids, conn = kf.read_solids()
+        return {"eids": eids, "pids": pids, "conn": conn}
+
+    arrays = cache.get_or_create(MeshCache.key_from_file(path, "solids"), parse,
+                                 info={"source": os.path.abspath(path)})
+    return arrays["eids"], arrays["pids"], arrays["conn"]
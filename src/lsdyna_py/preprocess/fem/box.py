@@ -0,0 +1,138 @@
+"""
+Structured hexahedral box mesher (vectorized).
+
+Nodes are numbered column-first (X outer -> Y middle -> Z inner), exactly like
+``scripts/preprocess/fem_box_mesh.py``, so the node with grid index (i, j, k)
+has the ID
+
+    start_nid + (i * (ny + 1) + j) * (nz + 1) + k
+
+That closed form lets the hex connectivity be computed from strides instead of
+a ``node_map[(i, j, k)]`` dictionary lookup.
+
+Examples
+--------
+>>> nids, xyz, eids, conn = generate_box_mesh(
+...     (-2.54, 2.54), (-2.54, 2.54), (-0.635, 0.0), 202, 202, 25,
+...     start_nid=1000001, start_eid=1000001)
+"""
+from __future__ import annotations
+
+import numpy as np
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def _id_dtype(max_id: int):
+    """Smallest signed integer dtype able to hold ``max_id`` (int32 or int64)."""
+    return np.int32 if max_id <= _INT32_MAX else np.int64
+
+
+def grid_axis(v_min: float, v_max: float, n_elem: int) -> np.ndarray:
+    """
+    Node positions along one axis: ``v_min + i * dv`` for i in 0..n_elem.
+
+    Evaluated with the same floating point operations as the generator
+    scripts, so the written coordinates are bit-identical.
+    """
+    dv = (v_max - v_min) / n_elem
+    return v_min + np.arange(n_elem + 1) * dv
+
+
+def structured_node_coords(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """
+    Tensor-product node coordinates in X -> Y -> Z (Z fastest) order.
+
+    Parameters:
+        x, y, z (np.ndarray): 1-D node positions along each axis.
+
+    Returns:
+        np.ndarray: (len(x) * len(y) * len(z), 3) float64 array.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    z = np.asarray(z, dtype=np.float64)
+    shape = (x.size, y.size, z.size)
+    xyz = np.empty(shape + (3,), dtype=np.float64)
+    xyz[..., 0] = x[:, None, None]
+    xyz[..., 1] = y[None, :, None]
+    xyz[..., 2] = z[None, None, :]
+    return xyz.reshape(-1, 3)
+
+
+def hex_corner_offsets(ny: int, nz: int) -> np.ndarray:
+    """
+    Index offsets of the 8 hex corners relative to corner n1 = (i, j, k).
+
+    LS-DYNA order: bottom face n1-n4 counter-clockwise, then top face n5-n8
+    (one Z layer up).
+    """
+    sx = (ny + 1) * (nz + 1)  # +X stride
+    sy = nz + 1               # +Y stride
+    sz = 1                    # +Z stride
+    bottom = [0, sx, sx + sy, sy]
+    return np.array(bottom + [b + sz for b in bottom], dtype=np.int64)
+
+
+def structured_hex_connectivity(nx: int, ny: int, nz: int, start_nid: int = 1,
+                                i_start: int = 0, i_stop: int = None) -> np.ndarray:
+    """
+    Hex connectivity of an nx * ny * nz element grid.
+
+    Elements follow the same X -> Y -> Z (Z fastest) order as the nodes.
+
+    Parameters:
+        nx, ny, nz (int): Number of elements along each axis.
+        start_nid (int): ID of node (0, 0, 0).
+        i_start, i_stop (int, optional): Only build the element X-layers
+                                         i_start <= i < i_stop (a slab).
+
+    Returns:
+        np.ndarray: (n_layers * ny * nz, 8) array of node IDs (int32 when all
+        IDs fit, int64 otherwise).
+    """
+    i_stop = nx if i_stop is None else i_stop
+    sx = (ny + 1) * (nz + 1)
+    sy = nz + 1
+    max_id = start_nid + (nx + 1) * sx - 1
+    dtype = _id_dtype(max_id)
+
+    # ID of corner n1 for every element, built by broadcasting the strides.
+    base = (np.arange(i_start, i_stop, dtype=dtype)[:, None, None] * dtype(sx)
+            + np.arange(ny, dtype=dtype)[None, :, None] * dtype(sy)
+            + np.arange(nz, dtype=dtype)[None, None, :]).ravel()
+    base += dtype(start_nid)
+
+    conn = np.empty((base.size, 8), dtype=dtype)
+    for c, off in enumerate(hex_corner_offsets(ny, nz)):
+        np.add(base, dtype(off), out=conn[:, c])
+    return conn
+
+
+def generate_box_mesh(x_range, y_range, z_range, nx: int, ny: int, nz: int,
+                      start_nid: int = 1, start_eid: int = 1):
+    """
+    Build a structured hex box.
+
+    Parameters:
+        x_range, y_range, z_range (tuple): (min, max) extent along each axis.
+        nx, ny, nz (int): Number of ELEMENTS along each axis.
+        start_nid (int): First node ID.
+        start_eid (int): First element ID.
+
+    Returns:
+        tuple: (nids, xyz, eids, conn)
+            nids (np.ndarray): (n_node,) node IDs.
+            xyz (np.ndarray): (n_node, 3) coordinates.
+            eids (np.ndarray): (n_elem,) element IDs.
+            conn (np.ndarray): (n_elem, 8) node IDs per hex.
+    """
+    xyz = structured_node_coords(grid_axis(*x_range, nx),
+                                 grid_axis(*y_range, ny),
+                                 grid_axis(*z_range, nz))
+    n_node = xyz.shape[0]
+    n_elem = nx * ny * nz
+    nids = np.arange(start_nid, start_nid + n_node, dtype=_id_dtype(start_nid + n_node - 1))
+    eids = np.arange(start_eid, start_eid + n_elem, dtype=_id_dtype(start_eid + n_elem - 1))
+    conn = structured_hex_connectivity(nx, ny, nz, start_nid=start_nid)
+    return nids, xyz, eids, conn
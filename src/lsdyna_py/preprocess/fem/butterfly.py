@@ -0,0 +1,151 @@
+"""
+Structured butterfly (O-grid) hex plate mesher, pure NumPy.
+
+Same topology as ``scripts/preprocess/fem_butterfly_mesh_gmsh.py``: a plate
+``[-lx/2, lx/2] x [-ly/2, ly/2] x [0, t]`` split into a uniform core patch
+``[-ax, ax] x [-ay, ay]`` (part 1) and four outer patches between the core
+and the plate edges (part 2), with a geometric grading that coarsens towards
+the edges.
+
+Instead of building the four outer patches separately and merging their
+shared spokes by coordinate matching, the outer patches are treated as one
+ring: the core boundary is walked counter-clockwise as a loop of
+``P = 2 * (nx_core + ny_core)`` nodes, the plate edge as a loop of the same
+length, and ring layer ``l`` is the transfinite (here: linear, as all patch
+edges are straight) blend
+
+    ring_l(s) = (1 - f_l) * core_loop(s) + f_l * edge_loop(s)
+    f_l = (r^l - 1) / (r^N - 1)                 (f_l = l / N for r = 1)
+
+so every element is ``r_grad`` times thicker than its inner neighbour. Layer 0
+is the core boundary itself, addressed by index into the core grid, and the
+loop index wraps modulo P, so shared nodes exist exactly once by
+construction.
+
+Node IDs: 2-D nodes are the core grid (X -> Y order) followed by the ring
+layers; each 2-D node becomes a column of ``nz + 1`` nodes (Z fastest).
+
+Examples
+--------
+>>> nids, xyz, eids, pids, conn = butterfly_plate_mesh(5.08, 5.08, 0.635, 1.5, 1.5,
+...                                                    100, 100, 15, 21, 1.05)
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def geometric_fractions(n_layers: int, ratio: float) -> np.ndarray:
+    """Cumulative fractions f_0 = 0 .. f_N = 1 of a geometric progression."""
+    l = np.arange(n_layers + 1, dtype=np.float64)
+    if np.isclose(ratio, 1.0):
+        return l / n_layers
+    return (ratio ** l - 1.0) / (ratio ** n_layers - 1.0)
+
+
+def _rectangle_loop(hx: float, hy: float, nx: int, ny: int) -> np.ndarray:
+    """(P, 2) counter-clockwise loop on the rectangle boundary, starting at (-hx, -hy)."""
+    ux = np.arange(nx) / nx
+    uy = np.arange(ny) / ny
+    south = np.stack([-hx + 2 * hx * ux, np.full(nx, -hy)], axis=1)
+    east = np.stack([np.full(ny, hx), -hy + 2 * hy * uy], axis=1)
+    north = np.stack([hx - 2 * hx * ux, np.full(nx, hy)], axis=1)
+    west = np.stack([np.full(ny, -hx), hy - 2 * hy * uy], axis=1)
+    return np.concatenate([south, east, north, west])
+
+
+def _core_loop_index(nx: int, ny: int) -> np.ndarray:
+    """Core grid indices (i * (ny + 1) + j) of the counter-clockwise core boundary loop."""
+    i = np.concatenate([np.arange(nx), np.full(ny, nx), np.arange(nx, 0, -1), np.zeros(ny, int)])
+    j = np.concatenate([np.zeros(nx, int), np.arange(ny), np.full(nx, ny), np.arange(ny, 0, -1)])
+    return i * (ny + 1) + j
+
+
+def butterfly_quad_mesh(lx: float, ly: float, ax: float, ay: float,
+                        nx_core: int, ny_core: int, n_layers: int, r_grad: float):
+    """
+    2-D butterfly mesh of the plate mid-plane.
+
+    Returns:
+        tuple: (xy, quads, core)
+            xy (np.ndarray): (n, 2) node coordinates (0-based indices below).
+            quads (np.ndarray): (m, 4) counter-clockwise quads.
+            core (np.ndarray): (m,) bool, True for core quads.
+    """
+    nx, ny = nx_core, ny_core
+    p = 2 * (nx + ny)
+
+    # Core patch: uniform grid, X -> Y order.
+    gx = -ax + 2 * ax * np.arange(nx + 1) / nx
+    gy = -ay + 2 * ay * np.arange(ny + 1) / ny
+    core_xy = np.empty((nx + 1, ny + 1, 2))
+    core_xy[..., 0] = gx[:, None]
+    core_xy[..., 1] = gy[None, :]
+    core_xy = core_xy.reshape(-1, 2)
+    n_core = core_xy.shape[0]
+
+    ii, jj = np.meshgrid(np.arange(nx), np.arange(ny), indexing="ij")
+    c1 = (ii * (ny + 1) + jj).ravel()
+    core_quads = np.stack([c1, c1 + ny + 1, c1 + ny + 2, c1 + 1], axis=1)
+
+    # Ring layers 1..N blended from the core loop to the plate edge loop.
+    inner_idx = _core_loop_index(nx, ny)
+    inner = core_xy[inner_idx]
+    outer = _rectangle_loop(lx / 2.0, ly / 2.0, nx, ny)
+    f = geometric_fractions(n_layers, r_grad)[1:, None, None]
+    ring_xy = ((1.0 - f) * inner[None] + f * outer[None]).reshape(-1, 2)
+
+    layer = np.empty((n_layers + 1, p), dtype=np.int64)
+    layer[0] = inner_idx
+    layer[1:] = n_core + np.arange(n_layers * p).reshape(n_layers, p)
+    s = np.arange(p)
+    s1 = (s + 1) % p
+    ring_quads = np.stack([layer[:-1][:, s], layer[1:][:, s], layer[1:][:, s1], layer[:-1][:, s1]],
+                          axis=-1).reshape(-1, 4)
+
+    xy = np.concatenate([core_xy, ring_xy])
+    quads = np.concatenate([core_quads, ring_quads])
+    core = np.zeros(quads.shape[0], dtype=bool)
+    core[:core_quads.shape[0]] = True
+    return xy, quads, core
+
+
+def butterfly_plate_mesh(lx: float, ly: float, t: float, ax: float, ay: float,
+                         nx_core: int, ny_core: int, n_layers: int, nz: int, r_grad: float,
+                         start_nid: int = 1, start_eid: int = 1, core_pid: int = 1, outer_pid: int = 2):
+    """
+    Butterfly hex plate, extruded from z = 0 to z = t.
+
+    Parameters (script names in brackets):
+        lx, ly (float): Plate size [Lx, Ly].
+        t (float): Thickness [t].
+        ax, ay (float): Core half-sizes [ax, ay].
+        nx_core, ny_core (int): Core elements along X / Y [NxCore, NyCore].
+        n_layers (int): Elements from the core to the plate edge [NLayers].
+        nz (int): Elements through the thickness [Nz].
+        r_grad (float): Growth ratio of the ring elements, inner -> outer [rGrad].
+        start_nid, start_eid (int): First node / element ID.
+        core_pid, outer_pid (int): Part IDs of the core and the outer ring.
+
+    Returns:
+        tuple: (nids, xyz, eids, pids, conn)
+    """
+    xy, quads, core = butterfly_quad_mesh(lx, ly, ax, ay, nx_core, ny_core, n_layers, r_grad)
+    n2, m2 = xy.shape[0], quads.shape[0]
+    nzn = nz + 1
+
+    z = t * np.arange(nzn) / nz
+    xyz = np.empty((n2, nzn, 3), dtype=np.float64)
+    xyz[..., 0] = xy[:, 0, None]
+    xyz[..., 1] = xy[:, 1, None]
+    xyz[..., 2] = z[None, :]
+    xyz = xyz.reshape(-1, 3)
+
+    # Node (q, k) -> q * (nz + 1) + k; hex = quad at layer k and k + 1.
+    base = quads[:, None, :] * nzn + np.arange(nz)[None, :, None]
+    conn = np.concatenate([base, base + 1], axis=2).reshape(-1, 8) + start_nid
+    pids = np.repeat(np.where(core, core_pid, outer_pid), nz)
+
+    nids = np.arange(start_nid, start_nid + xyz.shape[0], dtype=np.int64)
+    eids = np.arange(start_eid, start_eid + m2 * nz, dtype=np.int64)
+    return nids, xyz, eids, pids, conn
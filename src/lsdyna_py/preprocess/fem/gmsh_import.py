@@ -0,0 +1,105 @@
+"""
+Import gmsh ``.key`` meshes into our ID ranges.
+
+gmsh numbers nodes and elements with its own (gappy) IDs and uses the
+physical group tags as PIDs, e.g. ``Structured_Butterfly_mesh.key`` from
+``scripts/preprocess/fem_butterfly_mesh_gmsh.py``. ``import_gmsh_key`` reads
+such a file with the memory-mapped keyword reader, compacts the referenced
+node IDs to ``start_nid, start_nid + 1, ...`` through ``np.unique`` inverse
+maps, renumbers the elements from ``start_eid``, remaps the PIDs and writes
+the result with the bulk keyword writer. No per-line Python work is done.
+
+Examples
+--------
+>>> import_gmsh_key("Structured_Butterfly_mesh.key", "butterfly.k",
+...                 start_nid=1000001, start_eid=1000001, pid_map={1: 1000001, 2: 1000002})
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from ...keyword.reader import KeywordFile
+from ...keyword.writer import TEXT_NEWLINE, write_nodes, write_solid_elements
+
+
+def compact_nodes(nids, xyz, conn, start_nid: int = 1):
+    """
+    Keep the referenced nodes and renumber them consecutively.
+
+    Nodes keep their relative (ascending original ID) order.
+
+    Returns:
+        tuple: (new_nids, new_xyz, new_conn)
+
+    Raises:
+        ValueError: If ``conn`` references a node that is not defined.
+    """
+    nids = np.asarray(nids, dtype=np.int64)
+    used, inverse = np.unique(np.asarray(conn), return_inverse=True)
+
+    # gmsh writes nodes 1..N in order; then the row of node i is i - 1.
+    if nids.size and np.all(np.diff(nids) == 1):
+        rows = used - nids[0]
+        ok = (rows >= 0) & (rows < nids.size)
+    else:
+        order = np.argsort(nids, kind="stable")
+        pos = np.searchsorted(nids, used, sorter=order)
+        rows = order[np.minimum(pos, nids.size - 1)]
+        ok = (pos < nids.size) & (nids[rows] == used)
+    if not np.all(ok):
+        missing = used[~ok]
+        raise ValueError(f"{missing.size} referenced node(s) are not defined, e.g. {int(missing[0])}")
+
+    new_nids = np.arange(start_nid, start_nid + used.size, dtype=np.int64)
+    new_conn = (inverse.reshape(np.shape(conn)) + start_nid).astype(np.int64)
+    return new_nids, np.asarray(xyz)[rows], new_conn
+
+
+def remap_pids(pids, pid_map=None) -> np.ndarray:
+    """Map PIDs through ``pid_map`` ({old: new}); unmapped PIDs are kept."""
+    pids = np.asarray(pids, dtype=np.int64)
+    if not pid_map:
+        return pids
+    uniq, inverse = np.unique(pids, return_inverse=True)
+    return np.array([pid_map.get(int(p), int(p)) for p in uniq], dtype=np.int64)[inverse.ravel()]
+
+
+def import_gmsh_key(src, dst, start_nid: int = 1, start_eid: int = 1, pid_map=None,
+                    workers: int = 1, newline: bytes = TEXT_NEWLINE):
+    """
+    Convert a gmsh ``.key`` solid mesh into a .k file with our IDs.
+
+    Parameters:
+        src (str): gmsh .key file.
+        dst (str): Output .k file (``*NODE`` + ``*ELEMENT_SOLID``).
+        start_nid, start_eid (int): First node / element ID of the output.
+        pid_map (dict, optional): {gmsh physical tag: PID}.
+        workers (int): Processes for formatting (see ``keyword.writer``).
+        newline (bytes): Line ending (default: the platform's, CRLF on Windows).
+
+    Returns:
+        dict: n_nodes, n_elements, nid_range, eid_range, pids.
+    """
+    with KeywordFile(src) as kf:
+        nids, xyz = kf.read_nodes()
+        _, pids, conn = kf.read_solids()
+
+    new_nids, new_xyz, new_conn = compact_nodes(nids, xyz, conn, start_nid)
+    new_pids = remap_pids(pids, pid_map)
+    new_eids = np.arange(start_eid, start_eid + new_conn.shape[0], dtype=np.int64)
+
+    with open(dst, "wb") as f:
+        nl = newline
+        f.write(b"*KEYWORD" + nl + b"*NODE" + nl)
+        write_nodes(f, new_nids, new_xyz, workers=workers, newline=nl)
+        f.write(b"*ELEMENT_SOLID" + nl)
+        write_solid_elements(f, new_eids, new_pids, new_conn, workers=workers, newline=nl)
+        f.write(b"*END" + nl)
+
+    return {
+        "n_nodes": int(new_nids.size),
+        "n_elements": int(new_eids.size),
+        "nid_range": (start_nid, start_nid + int(new_nids.size) - 1),
+        "eid_range": (start_eid, start_eid + int(new_eids.size) - 1),
+        "pids": sorted(set(np.unique(new_pids).tolist())),
+    }
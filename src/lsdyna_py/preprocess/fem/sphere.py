@@ -0,0 +1,189 @@
+"""
+Vectorized hexahedral sphere meshers.
+
+Two layouts are provided:
+
+- ``cubed_sphere_mesh``: the single-block mapping of
+  ``scripts/preprocess/fem_sphere_generate.py``. A (2N+1)^3 lattice in
+  [-1, 1]^3 is mapped onto the ball with
+
+      x' = u * sqrt(1 - v^2/2 - w^2/2 + v^2 w^2/3)   (and cyclic)
+
+  The mapping is evaluated once over the whole lattice and the connectivity
+  comes from the lattice strides, with the same node/element order as the
+  script.
+
+- ``ogrid_sphere_mesh``: an O-grid (core cube + 6 shell blocks). The single
+  block mapping flattens the elements at the 8 "corners" of the sphere; the
+  O-grid keeps the core a plain cube and sweeps the 6 faces of that cube
+  radially out to the sphere, which gives much better element quality.
+
+Examples
+--------
+>>> nids, xyz, eids, conn = cubed_sphere_mesh(0.25, (0.0, 0.0, 0.251), density=10)
+>>> nids, xyz, eids, conn = ogrid_sphere_mesh(0.25, (0.0, 0.0, 0.251), n_core=10, n_shell=5)
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from .box import structured_hex_connectivity
+
+
+def cubed_sphere_map(u, v, w):
+    """
+    Map points of the cube [-1, 1]^3 onto the unit ball.
+
+    ``u``, ``v``, ``w`` broadcast against each other (pass 1-D axes with
+    ``[:, None, None]`` style indexing to map a whole lattice at once).
+
+    Returns:
+        tuple: (x, y, z) arrays of the broadcast shape.
+    """
+    u2, v2, w2 = u ** 2, v ** 2, w ** 2
+    x = u * np.sqrt(1.0 - v2 / 2.0 - w2 / 2.0 + (v2 * w2) / 3.0)
+    y = v * np.sqrt(1.0 - u2 / 2.0 - w2 / 2.0 + (u2 * w2) / 3.0)
+    z = w * np.sqrt(1.0 - u2 / 2.0 - v2 / 2.0 + (u2 * v2) / 3.0)
+    return x, y, z
+
+
+def _ids(start: int, count: int) -> np.ndarray:
+    return np.arange(start, start + count, dtype=np.int64)
+
+
+def cubed_sphere_mesh(radius: float, center=(0.0, 0.0, 0.0), density: int = 10,
+                      start_nid: int = 1, start_eid: int = 1):
+    """
+    Single-block cubed-sphere hex mesh.
+
+    Parameters:
+        radius (float): Sphere radius.
+        center (tuple): (cx, cy, cz).
+        density (int): Element divisions along the RADIUS; the lattice has
+                       2 * density elements per side.
+        start_nid (int): First node ID.
+        start_eid (int): First element ID.
+
+    Returns:
+        tuple: (nids, xyz, eids, conn), see ``fem.box.generate_box_mesh``.
+    """
+    n = density
+    side = 2 * n
+    axis = (np.arange(side + 1) - n) / n
+    x_s, y_s, z_s = cubed_sphere_map(axis[:, None, None], axis[None, :, None], axis[None, None, :])
+
+    cx, cy, cz = center
+    xyz = np.empty(x_s.shape + (3,), dtype=np.float64)
+    xyz[..., 0] = cx + x_s * radius
+    xyz[..., 1] = cy + y_s * radius
+    xyz[..., 2] = cz + z_s * radius
+    xyz = xyz.reshape(-1, 3)
+
+    conn = structured_hex_connectivity(side, side, side, start_nid=start_nid)
+    return _ids(start_nid, xyz.shape[0]), xyz, _ids(start_eid, conn.shape[0]), conn
+
+
+def _surface_index(m: int):
+    """
+    Compact numbering of the surface nodes of an (m+1)^3 lattice.
+
+    Returns:
+        tuple: (lattice_ijk, surf_id)
+            lattice_ijk (np.ndarray): (n_surf, 3) lattice indices of the
+                                      surface nodes in X -> Y -> Z order.
+            surf_id (np.ndarray): (m+1, m+1, m+1) compact surface index of
+                                  every lattice node (-1 for interior nodes).
+    """
+    r = np.arange(m + 1)
+    on_edge = (r == 0) | (r == m)
+    surface = on_edge[:, None, None] | on_edge[None, :, None] | on_edge[None, None, :]
+    surf_id = np.full(surface.shape, -1, dtype=np.int64)
+    surf_id[surface] = np.arange(np.count_nonzero(surface))
+    return np.argwhere(surface), surf_id
+
+
+def _face_quads(m: int, surf_id: np.ndarray) -> np.ndarray:
+    """
+    Quads (as compact surface indices) of the 6 faces of the (m+1)^3 lattice,
+    ordered counter-clockwise when seen from outside.
+    """
+    quads = []
+    a = np.arange(m)
+    for axis in range(3):
+        # In-plane axes ordered so that e_a1 x e_a2 = +e_axis.
+        a1, a2 = (axis + 1) % 3, (axis + 2) % 3
+        for level, outward in ((0, False), (m, True)):
+            idx = np.zeros((m, m, 4, 3), dtype=np.int64)
+            idx[..., axis] = level
+            for c, (d1, d2) in enumerate(((0, 0), (1, 0), (1, 1), (0, 1))):
+                idx[:, :, c, a1] = a[:, None] + d1
+                idx[:, :, c, a2] = a[None, :] + d2
+            q = surf_id[idx[..., 0], idx[..., 1], idx[..., 2]].reshape(-1, 4)
+            quads.append(q if outward else q[:, ::-1])
+    return np.concatenate(quads)
+
+
+def ogrid_sphere_mesh(radius: float, center=(0.0, 0.0, 0.0), n_core: int = 10, n_shell: int = 5,
+                      core_ratio: float = 0.5, start_nid: int = 1, start_eid: int = 1):
+    """
+    O-grid hex sphere: a core cube plus 6 shell blocks.
+
+    Layout (node and element IDs are consecutive in this order):
+      1. Core cube of half-size ``core_ratio * radius`` with ``n_core``
+         elements per side ((n_core + 1)^3 nodes, X -> Y -> Z order).
+      2. ``n_shell`` radial layers. Layer l (1..n_shell) holds one node per
+         core surface node, blended linearly from the core surface (l = 0) to
+         the cubed-sphere image of that node on the sphere (l = n_shell).
+         Nodes shared by neighbouring shell blocks and by the core are merged
+         by construction, through a compact surface index of the core lattice.
+
+    Parameters:
+        radius (float): Sphere radius.
+        center (tuple): (cx, cy, cz).
+        n_core (int): Elements along each side of the core cube.
+        n_shell (int): Radial element layers between the core and the sphere.
+        core_ratio (float): Core half-size as a fraction of the radius.
+        start_nid (int): First node ID.
+        start_eid (int): First element ID.
+
+    Returns:
+        tuple: (nids, xyz, eids, conn), see ``fem.box.generate_box_mesh``.
+    """
+    m = n_core
+    a = core_ratio * radius
+    axis = (2.0 * np.arange(m + 1) - m) / m
+
+    # 1. Core cube.
+    core = np.empty((m + 1,) * 3 + (3,), dtype=np.float64)
+    core[..., 0] = a * axis[:, None, None]
+    core[..., 1] = a * axis[None, :, None]
+    core[..., 2] = a * axis[None, None, :]
+    core = core.reshape(-1, 3)
+    n_core_nodes = core.shape[0]
+    core_conn = structured_hex_connectivity(m, m, m, start_nid=0)
+
+    # 2. Shell layers swept from the core surface to the sphere.
+    ijk, surf_id = _surface_index(m)
+    n_surf = ijk.shape[0]
+    p = axis[ijk]
+    inner = a * p
+    outer = radius * np.stack(cubed_sphere_map(p[:, 0], p[:, 1], p[:, 2]), axis=1)
+    t = (np.arange(1, n_shell + 1) / n_shell)[:, None, None]
+    shell = ((1.0 - t) * inner[None] + t * outer[None]).reshape(-1, 3)
+
+    # Global node index of surface node s on layer l: layer 0 is the core
+    # surface itself, layers >= 1 follow the core block.
+    surf_to_core = (ijk[:, 0] * (m + 1) + ijk[:, 1]) * (m + 1) + ijk[:, 2]
+    layer_nodes = np.empty((n_shell + 1, n_surf), dtype=np.int64)
+    layer_nodes[0] = surf_to_core
+    layer_nodes[1:] = n_core_nodes + np.arange(n_shell * n_surf).reshape(n_shell, n_surf)
+
+    quads = _face_quads(m, surf_id)
+    shell_conn = np.concatenate([
+        np.concatenate([layer_nodes[l][quads], layer_nodes[l + 1][quads]], axis=1)
+        for l in range(n_shell)
+    ])
+
+    xyz = np.concatenate([core, shell]) + np.asarray(center, dtype=np.float64)
+    conn = np.concatenate([core_conn, shell_conn]) + start_nid
+    return _ids(start_nid, xyz.shape[0]), xyz, _ids(start_eid, conn.shape[0]), conn
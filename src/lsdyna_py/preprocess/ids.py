@@ -0,0 +1,232 @@
+"""
+ID registry and collision checks for merged keyword decks.
+
+Every generator script picks ``start_nid`` / ``start_eid`` / ``part_id`` by
+hand. ``IdRegistry`` keeps the node, element and part ID ranges that are in
+use as sorted, disjoint intervals (one list per ID kind, searched with
+``bisect``), so reserving or allocating a block is O(log n) to locate and a
+merged deck of dozens of components needs no pairwise range comparison.
+
+``check_keyword_files`` does the same for existing decks: the IDs of all
+files are concatenated, sorted once (O(n log n)) and equal neighbours from
+different files (or from the same file) are reported.
+
+Examples
+--------
+>>> reg = IdRegistry()
+>>> reg.reserve("nid", 5000001, 172494, owner="box")
+>>> start = reg.allocate("nid", 739, owner="sphere", align=1000000)   # -> 1
+>>> reg = IdRegistry.from_keyword_files(["target.k", "projectile.k"])
+>>> for c in check_keyword_files(["target.k", "projectile.k"]):
+...     print(c["kind"], c["a"], c["b"], c["count"])
+"""
+from __future__ import annotations
+
+import bisect
+import itertools
+
+import numpy as np
+
+from ..keyword.reader import KeywordFile
+
+KINDS = ("nid", "eid", "pid")
+
+# Element keywords read for EIDs (see ``KeywordFile.read_element_ids``: one
+# card per element, or the two-card *ELEMENT_SOLID layout; option variants
+# with extra cards such as *ELEMENT_SHELL_THICKNESS are not included).
+ELEMENT_KEYWORDS = ("ELEMENT_SOLID", "ELEMENT_SPH", "ELEMENT_SHELL", "ELEMENT_BEAM",
+                    "ELEMENT_TSHELL", "ELEMENT_DISCRETE", "ELEMENT_MASS")
+
+_EID_CARD = (("i", 8),)
+
+
+class IdCollisionError(ValueError):
+    """A requested ID range overlaps a range that is already in use."""
+
+
+class IdRegistry:
+    """
+    Sorted interval sets of used node, element and part IDs.
+
+    Intervals are half-open ``[start, stop)`` and never overlap; each carries
+    the name of its owner for error messages.
+    """
+
+    def __init__(self):
+        self._starts = {k: [] for k in KINDS}
+        self._stops = {k: [] for k in KINDS}
+        self._owners = {k: [] for k in KINDS}
+
+    @staticmethod
+    def _check_kind(kind: str):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown ID kind {kind!r}; expected one of {KINDS}")
+
+    def ranges(self, kind: str):
+        """List of (start, stop, owner) intervals of ``kind`` in ascending order."""
+        self._check_kind(kind)
+        return list(zip(self._starts[kind], self._stops[kind], self._owners[kind]))
+
+    def overlaps(self, kind: str, start: int, count: int):
+        """Intervals of ``kind`` intersecting ``[start, start + count)``."""
+        self._check_kind(kind)
+        starts, stops = self._starts[kind], self._stops[kind]
+        # First interval that ends after ``start``; then walk while they begin before the end.
+        i = bisect.bisect_right(stops, start)
+        out = []
+        while i < len(starts) and starts[i] < start + count:
+            out.append((starts[i], stops[i], self._owners[kind][i]))
+            i += 1
+        return out
+
+    def owner_of(self, kind: str, id_: int):
+        """Owner of ``id_`` or None if it is free."""
+        hit = self.overlaps(kind, id_, 1)
+        return hit[0][2] if hit else None
+
+    def reserve(self, kind: str, start: int, count: int, owner: str = ""):
+        """
+        Mark ``[start, start + count)`` as used.
+
+        Raises:
+            IdCollisionError: If any ID of the range is already in use.
+
+        Returns:
+            tuple: (start, stop)
+        """
+        self._check_kind(kind)
+        if count <= 0:
+            return start, start
+        clash = self.overlaps(kind, start, count)
+        if clash:
+            s, e, who = clash[0]
+            raise IdCollisionError(f"{kind} {start}..{start + count - 1} ({owner or '?'}) overlaps "
+                                   f"{s}..{e - 1} ({who or '?'})")
+        i = bisect.bisect_left(self._starts[kind], start)
+        self._starts[kind].insert(i, start)
+        self._stops[kind].insert(i, start + count)
+        self._owners[kind].insert(i, owner)
+        return start, start + count
+
+    def allocate(self, kind: str, count: int, owner: str = "", align: int = 1, minimum: int = 1) -> int:
+        """
+        Reserve the lowest free block of ``count`` IDs.
+
+        Parameters:
+            align (int): Blocks start at ``k * align + 1`` (e.g. 1000000 gives
+                         the 1000001 / 2000001 / ... style of the scripts).
+            minimum (int): Lowest acceptable ID.
+
+        Returns:
+            int: First ID of the block.
+        """
+        self._check_kind(kind)
+
+        def aligned(v):
+            return v if align <= 1 else -(-(v - 1) // align) * align + 1
+
+        candidate = aligned(max(minimum, 1))
+        i = bisect.bisect_right(self._stops[kind], candidate)
+        starts, stops = self._starts[kind], self._stops[kind]
+        while i < len(starts) and starts[i] < candidate + count:
+            candidate = aligned(max(candidate, stops[i]))
+            i += 1
+        self.reserve(kind, candidate, count, owner)
+        return candidate
+
+    def reserve_ids(self, kind: str, ids, owner: str = ""):
+        """Reserve an arbitrary set of IDs (compressed into runs of consecutive IDs)."""
+        for start, stop in id_runs(ids):
+            self.reserve(kind, start, stop - start, owner)
+
+    @classmethod
+    def from_keyword_files(cls, paths):
+        """
+        Registry holding the IDs used by existing keyword files (owner = path).
+
+        Raises ``IdCollisionError`` if the files already collide (see
+        ``check_keyword_files`` for a full report).
+        """
+        reg = cls()
+        for path in paths:
+            for kind, ids in keyword_ids(path).items():
+                reg.reserve_ids(kind, ids, owner=str(path))
+        return reg
+
+
+def id_runs(ids):
+    """
+    Runs of consecutive IDs as half-open (start, stop) pairs.
+
+    Duplicates are merged; use ``check_keyword_files`` to detect them.
+    """
+    ids = np.unique(np.asarray(ids, dtype=np.int64))
+    if ids.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(ids) != 1) + 1
+    starts = ids[np.concatenate(([0], breaks))]
+    stops = ids[np.concatenate((breaks - 1, [ids.size - 1]))] + 1
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+def keyword_ids(path):
+    """
+    Node, element and part IDs defined in a keyword file.
+
+    Returns:
+        dict: {"nid": array, "eid": array, "pid": array} (int64).
+    """
+    with KeywordFile(path) as kf:
+        nids = kf.read_table("NODE", _EID_CARD)[0]
+        eids = [kf.read_element_ids(name) for name in ELEMENT_KEYWORDS]
+        pids = np.array([p["pid"] for p in kf.read_parts()], dtype=np.int64)
+    return {"nid": nids, "eid": np.concatenate(eids), "pid": pids}
+
+
+def find_collisions(id_sets: dict, kind: str = ""):
+    """
+    Duplicate IDs across (and within) labelled ID arrays, by one global sort.
+
+    Parameters:
+        id_sets (dict): {label: ID array}.
+
+    Returns:
+        list: One dict per colliding label pair:
+              {"kind", "a", "b", "count", "first"} (``a == b`` for duplicates
+              inside one array; ``first`` is the smallest colliding ID).
+    """
+    labels = list(id_sets)
+    arrays = [np.asarray(id_sets[l], dtype=np.int64).ravel() for l in labels]
+    if not arrays:
+        return []
+    ids = np.concatenate(arrays)
+    owner = np.repeat(np.arange(len(labels)), [a.size for a in arrays])
+    order = np.lexsort((owner, ids))
+    ids, owner = ids[order], owner[order]
+
+    # Every pair of equal neighbours is a collision between their owners;
+    # an ID used k times yields k - 1 neighbour pairs, enough to name every
+    # owner involved.
+    dup = np.flatnonzero(ids[1:] == ids[:-1])
+    a, b, dup_ids = owner[dup], owner[dup + 1], ids[dup]
+    out = []
+    pair_key = a * len(labels) + b
+    for key in np.unique(pair_key):
+        sel = pair_key == key
+        ia, ib = divmod(int(key), len(labels))
+        out.append({"kind": kind, "a": labels[ia], "b": labels[ib],
+                    "count": int(np.unique(dup_ids[sel]).size), "first": int(dup_ids[sel].min())})
+    return out
+
+
+def check_keyword_files(paths):
+    """
+    Report NID / EID / PID collisions between (and inside) keyword files.
+
+    Returns:
+        list: Collision dicts as returned by ``find_collisions``, for all kinds.
+    """
+    per_file = {str(p): keyword_ids(p) for p in paths}
+    return list(itertools.chain.from_iterable(
+        find_collisions({label: ids[kind] for label, ids in per_file.items()}, kind)
+        for kind in KINDS))
@@ -0,0 +1,163 @@
+"""
+Vectorized SPH particle lattices.
+
+The SPH scripts place one particle at the centre of every cell of a regular
+grid and test each candidate in a triple Python loop. Here the candidate
+lattice is built with broadcasting and masked with one vectorized test per
+X-slab, and the particles keep the scripts' X -> Y -> Z (Z fastest) order.
+
+Besides the simple cubic layout of the scripts, body-centred (BCC),
+face-centred (FCC) and hexagonal close packing (HCP) are supported. A
+lattice is a grid of ``n_cells`` unit cells with a fractional basis; the
+particle mass is ``density * cell_volume / atoms_per_cell``.
+
+    lattice   atoms/cell   basis (fractions of the cell)
+    cubic     1            (1/2, 1/2, 1/2)        -> the scripts' cell centres
+    bcc       2            (1/4, 1/4, 1/4), (3/4, 3/4, 3/4)
+    fcc       4            (1/4, 1/4, 1/4) + face-centre shifts
+    hcp       4            orthohexagonal cell a x a*sqrt(3) x c
+
+For HCP the cell has to have the ideal aspect ratio 1 : sqrt(3) : sqrt(8/3)
+to give a close packing; ``cell_for_spacing`` returns such a cell.
+
+Examples
+--------
+>>> xyz, mass = sphere_particles((0.0, 0.0, 0.251), 0.25, (11, 11, 11), density=7.8)
+>>> xyz, mass = sphere_particles((0.0, 0.0, 0.0), 1.0, (40, 40, 40), lattice="fcc", density=7.8)
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from ..streaming import DEFAULT_SLAB_ROWS, plane_slabs
+
+_S3 = 1.0 / 12.0
+LATTICES = {
+    "cubic": ((0.5, 0.5, 0.5),),
+    "bcc": ((0.25, 0.25, 0.25), (0.75, 0.75, 0.75)),
+    "fcc": ((0.25, 0.25, 0.25), (0.75, 0.75, 0.25), (0.75, 0.25, 0.75), (0.25, 0.75, 0.75)),
+    # A layer at (0, 0), (1/2, 1/2); B layer at (1/2, 1/6), (0, 2/3); shifted
+    # by (1/4, 1/12, 1/4) so that no particle sits on a cell boundary.
+    "hcp": ((0.25, _S3, 0.25), (0.75, 7 * _S3, 0.25), (0.75, 3 * _S3, 0.75), (0.25, 9 * _S3, 0.75)),
+}
+
+
+def _basis(lattice: str):
+    try:
+        return LATTICES[lattice]
+    except KeyError:
+        raise ValueError(f"Unknown lattice {lattice!r}; expected one of {sorted(LATTICES)}") from None
+
+
+def atoms_per_cell(lattice: str) -> int:
+    return len(_basis(lattice))
+
+
+def cell_for_spacing(spacing: float, lattice: str = "cubic"):
+    """
+    Unit cell size (dx, dy, dz) giving a nearest-neighbour distance of
+    ``spacing`` for ``lattice``.
+    """
+    _basis(lattice)
+    if lattice == "cubic":
+        return (spacing,) * 3
+    if lattice == "bcc":
+        return (2.0 * spacing / np.sqrt(3.0),) * 3
+    if lattice == "fcc":
+        return (spacing * np.sqrt(2.0),) * 3
+    return spacing, spacing * np.sqrt(3.0), spacing * np.sqrt(8.0 / 3.0)
+
+
+def lattice_axes(origin, cell, n_cells, lattice: str = "cubic"):
+    """
+    Plane positions of a lattice and the occupancy pattern of its basis.
+
+    Every particle lies on the tensor grid ``axes[0] x axes[1] x axes[2]``;
+    the grid node (p, q, r) holds a particle iff
+    ``pattern[p % kx, q % ky, r % kz]`` with ``(kx, ky, kz) = pattern.shape``.
+    For the cubic lattice the grid is exactly the scripts' cell centres
+    ``origin + (i + 0.5) * cell``.
+
+    Returns:
+        tuple: (axes, pattern)
+            axes (list): Three sorted 1-D position arrays.
+            pattern (np.ndarray): (kx, ky, kz) boolean occupancy of one cell.
+    """
+    basis = np.asarray(_basis(lattice), dtype=np.float64)
+    axes, index = [], []
+    for a in range(3):
+        fracs, inv = np.unique(basis[:, a], return_inverse=True)
+        i = np.arange(n_cells[a], dtype=np.float64)
+        axes.append(origin[a] + (i[:, None] + fracs[None, :]).ravel() * cell[a])
+        index.append(inv.ravel())
+    pattern = np.zeros(tuple(np.max(ix) + 1 for ix in index), dtype=bool)
+    pattern[index[0], index[1], index[2]] = True
+    return axes, pattern
+
+
+def lattice_fill(origin, cell, n_cells, lattice: str = "cubic", inside=None,
+                 slab_rows: int = DEFAULT_SLAB_ROWS) -> np.ndarray:
+    """
+    Lattice particles (optionally masked) in X -> Y -> Z order.
+
+    Parameters:
+        origin (tuple): Lower corner of the lattice box.
+        cell (tuple): Unit cell size (dx, dy, dz).
+        n_cells (tuple): Number of cells along X, Y, Z.
+        lattice (str): "cubic", "bcc", "fcc" or "hcp".
+        inside (callable, optional): ``inside(x, y, z)`` on broadcastable
+                                     (n, 1, 1) / (1, m, 1) / (1, 1, k) plane
+                                     arrays, returning a boolean keep mask.
+        slab_rows (int): Candidate grid nodes tested per X-slab.
+
+    Returns:
+        np.ndarray: (n, 3) float64 particle coordinates.
+    """
+    (x, y, z), pattern = lattice_axes(origin, cell, n_cells, lattice)
+    kx, ky, kz = pattern.shape
+    occ_yz = pattern[:, (np.arange(y.size) % ky)[:, None], (np.arange(z.size) % kz)[None, :]]
+    full = pattern.all()
+
+    out = []
+    for p0, p1 in plane_slabs(x.size, y.size * z.size, slab_rows):
+        xs = x[p0:p1, None, None]
+        if inside is None:
+            keep = np.ones((p1 - p0, y.size, z.size), dtype=bool)
+        else:
+            keep = np.broadcast_to(inside(xs, y[None, :, None], z[None, None, :]),
+                                   (p1 - p0, y.size, z.size)).copy()
+        if not full:
+            keep &= occ_yz[np.arange(p0, p1) % kx]
+        i, j, k = np.nonzero(keep)
+        slab = np.empty((i.size, 3), dtype=np.float64)
+        slab[:, 0] = x[p0 + i]
+        slab[:, 1] = y[j]
+        slab[:, 2] = z[k]
+        out.append(slab)
+    return np.concatenate(out) if out else np.empty((0, 3), dtype=np.float64)
+
+
+def sphere_particles(center, radius: float, n_cells, lattice: str = "cubic",
+                     density: float = 1.0, slab_rows: int = DEFAULT_SLAB_ROWS):
+    """
+    Particles of a solid sphere, filled from its bounding box.
+
+    ``n_cells`` is the number of cells along the bounding box edge (2 * radius)
+    in each direction, like ``num_x_grid`` etc. in ``sph_sphere_generate.py``;
+    with the cubic lattice the result is identical to that script.
+
+    Returns:
+        tuple: (xyz, particle_mass)
+    """
+    cx, cy, cz = center
+    box_len = 2.0 * radius
+    cell = tuple(box_len / n for n in n_cells)
+    r2 = radius ** 2
+
+    def inside(x, y, z):
+        return ((x - cx) ** 2 + (y - cy) ** 2) + (z - cz) ** 2 <= r2
+
+    xyz = lattice_fill((cx - radius, cy - radius, cz - radius), cell, n_cells, lattice,
+                       inside, slab_rows)
+    mass = density * (cell[0] * cell[1] * cell[2]) / atoms_per_cell(lattice)
+    return xyz, mass
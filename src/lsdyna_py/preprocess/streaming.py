@@ -0,0 +1,209 @@
+"""
+Streaming (slab-by-slab) mesh generation.
+
+The generator scripts build the whole mesh in memory before writing it. The
+iterators here produce the mesh in X-slabs instead (a few X-planes of nodes or
+elements at a time, ``slab_rows`` rows at most), each slab is formatted by the
+keyword writer and flushed to the file, and then dropped. Peak memory is set by
+``slab_rows`` and does not grow with the mesh size, so billion-particle SPH
+blocks can be written on a small workstation.
+
+The output is byte-identical to the in-memory generators (same X -> Y -> Z
+column-first order, same coordinates). Lines end in ``newline``; the scripts
+pass ``keyword.writer.TEXT_NEWLINE`` (CRLF on Windows).
+
+With ``workers > 1`` the boxes are written through
+``keyword.writer.write_direct`` instead: the file is preallocated and
+memory-mapped, and every worker computes and renders its own row range
+(coordinates/IDs follow in closed form from the row index), so nothing but
+the row bounds is sent between processes.
+
+Examples
+--------
+>>> write_sph_box("sph_box.k", (-2.54, 2.54), (-2.54, 2.54), (-0.635, 0.0),
+...               111, 111, 14, density=7.8, part_id=5000001,
+...               start_nid=5000001, start_eid=5000001)
+"""
+from __future__ import annotations
+
+from functools import partial
+
+import numpy as np
+
+from ..keyword.writer import (
+    NODE_CARD, SOLID_CARD, SPH_CARD,
+    write_direct, write_nodes, write_solid_elements, write_sph_elements,
+)
+from .fem.box import grid_axis, hex_corner_offsets, structured_hex_connectivity, structured_node_coords
+
+DEFAULT_SLAB_ROWS = 1 << 20
+
+
+def plane_slabs(n_planes: int, rows_per_plane: int, slab_rows: int = DEFAULT_SLAB_ROWS):
+    """
+    Split ``n_planes`` X-planes into (i_start, i_stop) slabs of at most
+    ``slab_rows`` rows (always at least one plane per slab).
+    """
+    per_slab = max(1, slab_rows // max(1, rows_per_plane))
+    for i0 in range(0, n_planes, per_slab):
+        yield i0, min(i0 + per_slab, n_planes)
+
+
+def id_slabs(start_id: int, count: int, slab_rows: int = DEFAULT_SLAB_ROWS):
+    """Consecutive ID blocks ``start_id .. start_id + count - 1`` in chunks."""
+    for i0 in range(0, count, slab_rows):
+        yield np.arange(start_id + i0, start_id + min(i0 + slab_rows, count), dtype=np.int64)
+
+
+def _lattice_node_slabs(x, y, z, start_nid, slab_rows):
+    rows_per_plane = y.size * z.size
+    for i0, i1 in plane_slabs(x.size, rows_per_plane, slab_rows):
+        xyz = structured_node_coords(x[i0:i1], y, z)
+        first = start_nid + i0 * rows_per_plane
+        yield np.arange(first, first + xyz.shape[0], dtype=np.int64), xyz
+
+
+def fem_box_node_slabs(x_range, y_range, z_range, nx: int, ny: int, nz: int,
+                       start_nid: int = 1, slab_rows: int = DEFAULT_SLAB_ROWS):
+    """
+    Yield (nids, xyz) slabs of the structured hex box nodes (see
+    ``fem.box.generate_box_mesh``); nx, ny, nz are ELEMENT counts.
+    """
+    yield from _lattice_node_slabs(grid_axis(*x_range, nx), grid_axis(*y_range, ny),
+                                   grid_axis(*z_range, nz), start_nid, slab_rows)
+
+
+def fem_box_element_slabs(nx: int, ny: int, nz: int, start_nid: int = 1, start_eid: int = 1,
+                          slab_rows: int = DEFAULT_SLAB_ROWS):
+    """Yield (eids, conn) slabs of the structured hex box elements."""
+    rows_per_plane = ny * nz
+    for i0, i1 in plane_slabs(nx, rows_per_plane, slab_rows):
+        conn = structured_hex_connectivity(nx, ny, nz, start_nid=start_nid, i_start=i0, i_stop=i1)
+        first = start_eid + i0 * rows_per_plane
+        yield np.arange(first, first + conn.shape[0], dtype=np.int64), conn
+
+
+def sph_box_axis(v_min: float, v_max: float, n: int) -> np.ndarray:
+    """Particle positions at the cell centres: ``v_min + (i + 0.5) * dv``."""
+    dv = (v_max - v_min) / n
+    return v_min + (np.arange(n) + 0.5) * dv
+
+
+def sph_box_node_slabs(x_range, y_range, z_range, nx: int, ny: int, nz: int,
+                       start_nid: int = 1, slab_rows: int = DEFAULT_SLAB_ROWS):
+    """
+    Yield (nids, xyz) slabs of an SPH box with nx * ny * nz particles placed
+    at the cell centres (same layout as ``sph_box_generate.py``).
+    """
+    yield from _lattice_node_slabs(sph_box_axis(*x_range, nx), sph_box_axis(*y_range, ny),
+                                   sph_box_axis(*z_range, nz), start_nid, slab_rows)
+
+
+def _row_ijk(start: int, stop: int, ny: int, nz: int):
+    """Lattice indices (i, j, k) of the flat X -> Y -> Z rows start..stop-1."""
+    r = np.arange(start, stop, dtype=np.int64)
+    t, k = np.divmod(r, nz)
+    i, j = np.divmod(t, ny)
+    return r, i, j, k
+
+
+def lattice_node_rows(x, y, z, start_nid: int, start: int, stop: int):
+    """``NODE_CARD`` columns of the rows start..stop-1 of the x/y/z lattice."""
+    r, i, j, k = _row_ijk(start, stop, y.size, z.size)
+    return [start_nid + r, x[i], y[j], z[k]]
+
+
+def hex_element_rows(nx: int, ny: int, nz: int, start_nid: int, start_eid: int, part_id: int,
+                     start: int, stop: int):
+    """``SOLID_CARD`` columns of the elements start..stop-1 of the hex box."""
+    r, i, j, k = _row_ijk(start, stop, ny, nz)
+    n1 = start_nid + (i * (ny + 1) + j) * (nz + 1) + k
+    return [start_eid + r, part_id] + [n1 + off for off in hex_corner_offsets(ny, nz)]
+
+
+def sph_element_rows(start_nid: int, start_eid: int, part_id: int, mass: float,
+                     start: int, stop: int):
+    """``SPH_CARD`` columns of the particles start..stop-1 (one per node)."""
+    r = np.arange(start, stop, dtype=np.int64)
+    return [start_eid + r, part_id, start_nid + r, mass]
+
+
+def write_fem_box(output_filename, x_range, y_range, z_range, nx: int, ny: int, nz: int,
+                  part_id: int = 1, start_nid: int = 1, start_eid: int = 1,
+                  slab_rows: int = DEFAULT_SLAB_ROWS, workers: int = 1, newline: bytes = b"\n"):
+    """
+    Stream a structured hex box to a .k file.
+
+    ``workers > 1`` renders ``slab_rows`` row blocks in parallel into the
+    preallocated file (see ``keyword.writer.write_direct``).
+
+    Returns:
+        tuple: (n_nodes, n_elements) written.
+    """
+    nl = newline
+    if workers > 1:
+        x, y, z = grid_axis(*x_range, nx), grid_axis(*y_range, ny), grid_axis(*z_range, nz)
+        n_nodes, n_elems = x.size * y.size * z.size, nx * ny * nz
+        write_direct(output_filename, [
+            b"*KEYWORD" + nl + b"*NODE" + nl,
+            (NODE_CARD, n_nodes, partial(lattice_node_rows, x, y, z, start_nid)),
+            b"*ELEMENT_SOLID" + nl,
+            (SOLID_CARD, n_elems, partial(hex_element_rows, nx, ny, nz, start_nid, start_eid, part_id)),
+            b"*END" + nl,
+        ], chunk_rows=slab_rows, workers=workers, newline=nl)
+        return n_nodes, n_elems
+
+    n_nodes = n_elems = 0
+    with open(output_filename, "wb") as f:
+        f.write(b"*KEYWORD" + nl + b"*NODE" + nl)
+        for nids, xyz in fem_box_node_slabs(x_range, y_range, z_range, nx, ny, nz,
+                                            start_nid, slab_rows):
+            n_nodes += write_nodes(f, nids, xyz, newline=nl)
+        f.write(b"*ELEMENT_SOLID" + nl)
+        for eids, conn in fem_box_element_slabs(nx, ny, nz, start_nid, start_eid, slab_rows):
+            n_elems += write_solid_elements(f, eids, part_id, conn, newline=nl)
+        f.write(b"*END" + nl)
+    return n_nodes, n_elems
+
+
+def write_sph_box(output_filename, x_range, y_range, z_range, nx: int, ny: int, nz: int,
+                  density: float, part_id: int = 1, start_nid: int = 1, start_eid: int = 1,
+                  slab_rows: int = DEFAULT_SLAB_ROWS, workers: int = 1, newline: bytes = b"\n"):
+    """
+    Stream an SPH box (``*NODE`` + ``*ELEMENT_SPH``) to a .k file.
+
+    The particle mass is ``density * dx * dy * dz`` (one grid cell).
+    ``workers > 1`` renders in parallel into the preallocated file.
+
+    Returns:
+        int: Number of particles written.
+    """
+    nl = newline
+    dx = (x_range[1] - x_range[0]) / nx
+    dy = (y_range[1] - y_range[0]) / ny
+    dz = (z_range[1] - z_range[0]) / nz
+    particle_mass = density * (dx * dy * dz)
+    total = nx * ny * nz
+
+    if workers > 1:
+        x, y, z = sph_box_axis(*x_range, nx), sph_box_axis(*y_range, ny), sph_box_axis(*z_range, nz)
+        write_direct(output_filename, [
+            b"*KEYWORD" + nl + b"*NODE" + nl,
+            (NODE_CARD, total, partial(lattice_node_rows, x, y, z, start_nid)),
+            b"*ELEMENT_SPH" + nl,
+            (SPH_CARD, total, partial(sph_element_rows, start_nid, start_eid, part_id, particle_mass)),
+            b"*END" + nl,
+        ], chunk_rows=slab_rows, workers=workers, newline=nl)
+        return total
+
+    with open(output_filename, "wb") as f:
+        f.write(b"*KEYWORD" + nl + b"*NODE" + nl)
+        for nids, xyz in sph_box_node_slabs(x_range, y_range, z_range, nx, ny, nz,
+                                            start_nid, slab_rows):
+            write_nodes(f, nids, xyz, newline=nl)
+        f.write(b"*ELEMENT_SPH" + nl)
+        for nids, eids in zip(id_slabs(start_nid, total, slab_rows),
+                              id_slabs(start_eid, total, slab_rows)):
+            write_sph_elements(f, eids, part_id, nids, particle_mass, newline=nl)
+        f.write(b"*END" + nl)
+    return total
@@ -10,6 +10,15 @@ python -m lsdyna_py.runner.cli --k case.k --ncpu 8 --memory 4000m
 # With dump/restart output
 python -m lsdyna_py.runner.cli --k case.k --ncpu 8 --memory 4000m --dump dump01
 
+# Survive crashes / walltime kills: relaunch from the newest d3dump/runrsf
+python -m lsdyna_py.runner.cli --k case.k --auto-restart 3 --resume
+
+# Reuse identical earlier runs from a result store (500 GB, least recently used evicted)
+python -m lsdyna_py.runner.cli --k case.k --cache-dir D:/dyna_results --cache-max-gb 500
+
+# Quiet, with progress / ETA lines, a JSON status file and a stall watchdog
+python -m lsdyna_py.runner.cli --k case.k --quiet --progress --status-file progress.json --stall-timeout 900
+
 Notes
 -----
 - This uses the "direct" solver invocation (lsdyna_dp.exe i=... ncpu=... memory=...).
@@ -18,8 +27,12 @@ Notes
 from __future__ import annotations
 
 import argparse
+import time
 from pathlib import Path
 from .dyna_direct import run_lsdyna
+from .progress import ProgressMonitor, format_progress, termination_time
+from .restart import run_with_restarts
+from .result_cache import ResultCache
 
 def main() -> int:
     ap = argparse.ArgumentParser()
@@ -29,6 +42,20 @@ def main() -> int:
     ap.add_argument("--dump", default=None, help="Optional R= dump/restart file name")
     ap.add_argument("--work-dir", default=None, help="Working directory to run in (default: k-file directory)")
     ap.add_argument("--solver", default=None, help="Override dynasolver_path (lsdyna_dp.exe)")
+    ap.add_argument("--log", default=None, help="Console log file (default: <k-file stem>.log in work dir)")
+    ap.add_argument("--quiet", action="store_true", help="Do not echo the solver output")
+    ap.add_argument("--progress", action="store_true", help="Print cycle / time / ETA lines")
+    ap.add_argument("--progress-interval", type=float, default=10.0, help="Seconds between progress lines")
+    ap.add_argument("--status-file", default=None, help="JSON file updated with the current progress")
+    ap.add_argument("--stall-timeout", type=float, default=None,
+                    help="Kill the run after this many seconds without a new cycle")
+
+    ap.add_argument("--auto-restart", type=int, default=0,
+                    help="Relaunch from the newest d3dump/runrsf up to N times after a failure")
+    ap.add_argument("--resume", action="store_true",
+                    help="Start from the newest d3dump/runrsf in the work dir, if any")
+    ap.add_argument("--cache-dir", default=None, help="Result store; identical runs are not solved again")
+    ap.add_argument("--cache-max-gb", type=float, default=None, help="Size limit of the result store (LRU)")
 
     args = ap.parse_args()
 
@@ -36,12 +63,49 @@ def main() -> int:
     work_dir = args.work_dir or str(k.parent)
 
     # Call your original function. If solver is None, your default path inside run_lsdyna.py will be used.
-    if args.solver:
-        run_lsdyna(str(k), args.ncpu, args.memory, dump_file=args.dump, work_dir=work_dir, dynasolver_path=args.solver)
+    kwargs = {"dynasolver_path": args.solver} if args.solver else {}
+    if args.cache_dir:
+        max_bytes = None if args.cache_max_gb is None else int(args.cache_max_gb * 2 ** 30)
+        kwargs["cache"] = ResultCache(args.cache_dir, max_bytes)
+        if args.status_file:
+            kwargs["cache_exclude"] = (args.status_file,)
+
+    # Progress from the console lines; messag / d3hsp are polled by the watchdog
+    # (from their current end: leftovers of an earlier run are not parsed).
+    last_print = [0.0]
+
+    def show(p):
+        if args.progress and (p.stalled or time.monotonic() - last_print[0] >= args.progress_interval):
+            last_print[0] = time.monotonic()
+            print(format_progress(p), flush=True)
+
+    try:
+        end_time = termination_time(k)
+    except OSError:
+        end_time = None
+    monitor = ProgressMonitor(work_dir, end_time, callback=show, status_file=args.status_file,
+                              stall_seconds=args.stall_timeout, from_start=False)
+    procs = []
+
+    def kill(p):
+        print(f"No new cycle for {args.stall_timeout:g} s, killing the solver.", flush=True)
+        for proc in procs:
+            proc.kill()
+
+    stop = monitor.watch(interval=5.0, on_stall=kill)
+
+    if args.auto_restart or args.resume:
+        rc, _ = run_with_restarts(str(k), args.ncpu, args.memory, work_dir=work_dir, dump_file=args.dump,
+                                  max_restarts=args.auto_restart, resume=args.resume, log_file=args.log,
+                                  echo=not args.quiet, on_line=monitor.feed, on_start=procs.append, **kwargs)
     else:
-        run_lsdyna(str(k), args.ncpu, args.memory, dump_file=args.dump, work_dir=work_dir)
+        rc = run_lsdyna(str(k), args.ncpu, args.memory, dump_file=args.dump, work_dir=work_dir,
+                        log_file=args.log, echo=not args.quiet, on_line=monitor.feed, on_start=procs.append,
+                        **kwargs)
+    stop.set()
+    monitor.poll()              # publish the final state
 
-    return 0
+    return 0 if rc == 0 else 1
 
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -3,16 +3,60 @@ Author: Rong Jin, University of Kentucky
 Date: 03-13-2025
 Description: The function executes an LS-DYNA simulation using the specified input file and simulation parameters.
 """
-import subprocess
 import os
 
+from .logstream import stream_process
+from .result_cache import changed_files, run_key, runner_files, snapshot
+
+
+DEFAULT_SOLVER = r"C:\\Program Files\\ANSYS Inc\\v231\\ansys\\bin\\winx64\\lsdyna_dp.exe"
+
+
+def build_command(input_file, ncpu, memory, dump_file=None, dynasolver_path=DEFAULT_SOLVER):
+    """
+    Builds the direct LS-DYNA command line.
+
+    Parameters:
+        input_file (str): Full path to the input .k file. None for a plain
+                          restart from ``dump_file`` (no i= argument).
+        ncpu (int): Number of CPU cores to use.
+        memory (str): Memory allocation size (e.g., "1024m").
+        dump_file (str, optional): Dump file name if needed.
+        dynasolver_path (str or list): Path to the LS-DYNA dynasolver, or a
+                                       list of leading arguments (e.g. an
+                                       interpreter plus a script).
+
+    Returns:
+        list: The command as an argument list.
+    """
+    if isinstance(dynasolver_path, (list, tuple)):
+        command = list(dynasolver_path)
+    else:
+        command = [dynasolver_path]
+    if input_file is not None:
+        command.append(f"i={input_file}")
+    command += [
+        f"ncpu={ncpu}",
+        f"memory={memory}"
+    ]
+
+    # If a dump file is provided, add it to the command.
+    if dump_file:
+        command.append(f"R={dump_file}")
+    return command
+
+
 def run_lsdyna(input_file, ncpu, memory, dump_file=None, work_dir=None,
-               dynasolver_path=r"C:\\Program Files\\ANSYS Inc\\v231\\ansys\\bin\\winx64\\lsdyna_dp.exe"):
+               dynasolver_path=DEFAULT_SOLVER, log_file=None, log_max_bytes=50 * 2 ** 20,
+               log_backups=3, tail_lines=200, echo=True, on_line=None, on_start=None, cache=None,
+               cache_exclude=()):
     """
     Executes the LS-DYNA simulation using the specified parameters.
 
     Parameters:
-        input_file (str): Full path to the input .k file.
+        input_file (str): Full path to the input .k file. May be None for a
+                          restart from ``dump_file`` without a restart deck
+                          (``work_dir`` is then required).
         ncpu (int): Number of CPU cores to use.
         memory (str): Memory allocation size (e.g., "1024m").
         dump_file (str, optional): Dump file name if needed.
@@ -20,37 +64,77 @@ def run_lsdyna(input_file, ncpu, memory, dump_file=None, work_dir=None,
                                   If not provided, it defaults to the directory of input_file.
         dynasolver_path (str): Path to the LS-DYNA dynasolver.
                                Defaults to the specified path.
-    
+        log_file (str, optional): Rotating log of the console output.
+                                  Defaults to "<k-file stem>.log" in work_dir.
+        log_max_bytes (int): Size at which the log rotates.
+        log_backups (int): Rotated logs kept (case.log.1, case.log.2, ...).
+        tail_lines (int): Last lines kept in memory and printed on failure.
+        echo (bool): Print the console output live.
+        on_line (callable, optional): Called with every output line.
+        on_start (callable, optional): Called with the solver process once started.
+        cache (ResultCache, optional): Result store (see ``result_cache``). A run
+                                       whose deck, includes, solver, ncpu, memory
+                                       and restart dump were solved before is not
+                                       repeated; the
+                                       stored outputs are placed in work_dir instead.
+        cache_exclude (sequence): Further runner files in work_dir (e.g. a
+                                  progress status file) not to store; the
+                                  console log is never stored.
+
     Returns:
-        None. The function prints the output or error messages.
+        int: The solver return code (None if it could not be started).
+        The output is streamed line by line, so memory use stays flat
+        however long the run is.
     """
     try:
+        if input_file is None and not (dump_file and work_dir):
+            raise ValueError("A restart without input_file needs dump_file and work_dir")
+        label = input_file if input_file is not None else f"restart from {dump_file}"
+
         # If work_dir is not specified, use the directory of the input file.
         if work_dir is None:
             work_dir = os.path.dirname(input_file)
         
         # Construct the LS-DYNA command with required parameters.
-        command = [
-            dynasolver_path,
-            f"i={input_file}",
-            f"ncpu={ncpu}",
-            f"memory={memory}"
-        ]
-        
-        # If a dump file is provided, add it to the command.
-        if dump_file:
-            command.append(f"R={dump_file}")
-        
-        # Execute the command in the specified working directory.
-        result = subprocess.run(command, capture_output=True, text=True, cwd=work_dir)
+        command = build_command(input_file, ncpu, memory, dump_file, dynasolver_path)
         
+        if log_file is None:
+            stem = os.path.splitext(os.path.basename(input_file or dump_file))[0]
+            log_file = os.path.join(work_dir, stem + ".log")
+
+        # Skip the solve if an identical run is in the result store (not for
+        # plain restarts without a deck; a restart deck's key includes the
+        # content of the dump it starts from).
+        if input_file is None:
+            cache = None
+        if cache is not None:
+            key = run_key(input_file, ncpu, memory, dynasolver_path, dump_file, work_dir)
+            files = cache.materialize(key, work_dir or ".")
+            if files is not None:
+                print(f"Using cached result {key} ({len(files)} files): {label}")
+                return 0
+            before = snapshot(work_dir or ".")
+
+        # Execute the command in the specified working directory, streaming
+        # stdout/stderr to the log and keeping only the last lines in memory.
+        returncode, tail = stream_process(command, cwd=work_dir or None, log_file=log_file,
+                                          log_max_bytes=log_max_bytes, log_backups=log_backups,
+                                          tail_lines=tail_lines, echo=echo, on_line=on_line,
+                                          on_start=on_start)
+
         # Check if the command executed successfully.
-        if result.returncode == 0:
-            print(f"Command executed successfully: {input_file}")
-            print(result.stdout)
+        if returncode == 0:
+            print(f"Command executed successfully: {label}")
+            if cache is not None:
+                outputs = changed_files(before, snapshot(work_dir or "."), runner_files(log_file, cache_exclude))
+                cache.put(key, work_dir or ".", outputs,
+                          info={"input_file": os.path.abspath(input_file)})
         else:
-            print(f"Command execution failed: {input_file}")
-            print(result.stderr)
-    
+            print(f"Command execution failed: {label} (return code {returncode}, log: {log_file})")
+            if not echo:
+                print("".join(tail))
+        return returncode
+
     except Exception as e:
         print(f"Error executing command: {e}")
+        return None
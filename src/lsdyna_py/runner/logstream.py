@@ -0,0 +1,111 @@
+"""
+Line-by-line capture of solver console output.
+
+Long explicit runs print hundreds of MB of cycle lines. ``stream_process``
+reads the merged stdout/stderr of the solver one line at a time while it
+runs, writes every line to a size-limited ``RotatingLog`` and keeps only the
+last ``tail_lines`` lines in a ring buffer (``collections.deque``) for error
+reports, so memory use does not grow with the length of the run.
+
+Examples
+--------
+>>> rc, tail = stream_process(["lsdyna_dp.exe", "i=case.k"], cwd="run", log_file="run/case.log")
+>>> if rc != 0:
+...     print("".join(tail))
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from collections import deque
+
+
+class RotatingLog:
+    """
+    Append-only text log that rotates at ``max_bytes``.
+
+    ``case.log`` is renamed to ``case.log.1`` (``.1`` to ``.2``, ...) when it
+    is full; at most ``backups`` old files are kept. The size is counted in
+    bytes on disk (UTF-8, platform line endings) and every line is flushed,
+    so the log can be followed live.
+    """
+
+    def __init__(self, path, max_bytes: int = 50 * 2 ** 20, backups: int = 3):
+        self.path = os.fspath(path)
+        self.max_bytes = int(max_bytes)
+        self.backups = int(backups)
+        self._f = open(self.path, "a", encoding="utf-8", errors="replace", buffering=1)
+        self._size = self._f.tell()
+
+    def _rotate(self):
+        self._f.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self._f = open(self.path, "w", encoding="utf-8", errors="replace", buffering=1)
+        self._size = 0
+
+    def write(self, line: str):
+        size = len(line.encode("utf-8", "replace")) + line.count("\n") * (len(os.linesep) - 1)
+        if self.max_bytes > 0 and self._size + size > self.max_bytes and self._size:
+            self._rotate()
+        self._f.write(line)     # line buffered: flushed at the newline
+        self._size += size
+
+    def flush(self):
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def stream_process(command, cwd=None, log_file=None, log_max_bytes: int = 50 * 2 ** 20,
+                   log_backups: int = 3, tail_lines: int = 200, echo: bool = True, on_line=None,
+                   on_start=None):
+    """
+    Run ``command`` and consume its output line by line.
+
+    Parameters:
+        command (list): Argument list.
+        cwd (str, optional): Working directory.
+        log_file (str, optional): Rotating log of the full output (None: no log).
+        log_max_bytes (int): Size at which the log rotates.
+        log_backups (int): Rotated logs kept.
+        tail_lines (int): Lines kept in memory for the return value.
+        echo (bool): Print every line as it arrives.
+        on_line (callable, optional): Called with every line (e.g. a progress parser).
+        on_start (callable, optional): Called with the ``Popen`` object once started
+                                       (e.g. to kill a stalled run from a watchdog).
+
+    Returns:
+        tuple: (returncode, tail) with ``tail`` the last ``tail_lines`` lines.
+    """
+    tail = deque(maxlen=tail_lines)
+    log = RotatingLog(log_file, log_max_bytes, log_backups) if log_file else None
+    try:
+        with subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              text=True, errors="replace", bufsize=1) as proc:
+            if on_start is not None:
+                on_start(proc)
+            for line in proc.stdout:
+                tail.append(line)
+                if log is not None:
+                    log.write(line)
+                if echo:
+                    sys.stdout.write(line)
+                if on_line is not None:
+                    on_line(line)
+            returncode = proc.wait()
+    finally:
+        if log is not None:
+            log.close()
+    return returncode, list(tail)
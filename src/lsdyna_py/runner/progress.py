@@ -0,0 +1,268 @@
+"""
+Live progress, ETA and stall detection for running LS-DYNA jobs.
+
+The explicit solver reports its state in cycle lines such as
+
+         1000 t 4.9995E-05 dt 5.00E-08 write d3plot file     03/13/25 10:41:07
+
+on stdout and in ``messag`` / ``d3hsp``. ``FileTail`` reads only the bytes
+appended to a file since the last poll, ``ProgressParser`` extracts cycle,
+simulation time and timestep from new lines, and ``ProgressMonitor`` turns
+them into a ``Progress`` record with the completed fraction (relative to
+``*CONTROL_TERMINATION`` ENDTIM) and an ETA from the recent ratio of
+simulated to wall-clock time. Every update can be published to a callback
+and / or a JSON status file; a run whose cycle count has not advanced for
+``stall_seconds`` is flagged as stalled (and can be killed by the caller).
+
+Examples
+--------
+>>> mon = ProgressMonitor("run", end_time=termination_time("run/case.k"),
+...                       status_file="run/progress.json", stall_seconds=600)
+>>> run_lsdyna("run/case.k", 8, "4000m", on_line=mon.feed)
+>>> mon.poll()            # or: read messag / d3hsp only, e.g. from another process
+>>> print(mon.progress.fraction, mon.progress.eta_seconds)
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+
+from ..keyword.reader import KeywordFile
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[EeDd][-+]?\d+)?"
+CYCLE_RE = re.compile(rf"^\s*(\d+)\s+t\s+({_NUMBER})\s+dt\s+({_NUMBER})")
+
+DEFAULT_FILES = ("messag", "d3hsp")
+
+
+def termination_time(k_file):
+    """ENDTIM of the first ``*CONTROL_TERMINATION`` card in ``k_file`` (None if absent)."""
+    with KeywordFile(k_file) as kf:
+        for line in kf.block_lines("CONTROL_TERMINATION"):
+            field = line.split(",")[0] if "," in line else line[:10]
+            try:
+                return float(field.strip().upper().replace("D", "E"))
+            except ValueError:
+                return None
+    return None
+
+
+class FileTail:
+    """Incremental reader returning the complete lines appended since the last call."""
+
+    # Bytes before the offset compared on every read to notice a rewritten file
+    # even when it has already grown past the old offset.
+    _MARK = 64
+
+    def __init__(self, path, from_start: bool = True):
+        self.path = os.fspath(path)
+        self.offset = 0 if from_start or not os.path.exists(self.path) else os.path.getsize(self.path)
+        self._partial = b""
+        self._mark = self._read_mark()
+        self.truncated = False      # set by read_lines when the file was rewritten
+
+    def _read_mark(self) -> bytes:
+        if not self.offset:
+            return b""
+        with open(self.path, "rb") as f:
+            f.seek(max(self.offset - self._MARK, 0))
+            return f.read(min(self.offset, self._MARK))
+
+    def read_lines(self):
+        try:
+            size = os.path.getsize(self.path)
+            rewritten = size < self.offset or (self.offset > 0 and self._read_mark() != self._mark)
+        except OSError:
+            return []
+        self.truncated = rewritten
+        if self.truncated:                      # truncated / restarted: read it again
+            self.offset, self._partial = 0, b""
+        if size == self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        self.offset += len(data)
+        self._mark = (self._mark + data)[-self._MARK:]
+        data = self._partial + data
+        cut = data.rfind(b"\n") + 1
+        self._partial = data[cut:]
+        return data[:cut].decode("ascii", "replace").splitlines()
+
+
+@dataclass
+class Progress:
+    """Latest solver state; times in seconds, ``eta_seconds`` in wall-clock seconds."""
+    cycle: int = 0
+    time: float = 0.0
+    dt: float = 0.0
+    end_time: float = None
+    fraction: float = None
+    eta_seconds: float = None
+    rate: float = None            # simulated time per wall-clock second
+    updated: float = None         # unix time of the last cycle advance
+    stalled: bool = False
+
+
+class ProgressParser:
+    """Keeps the latest cycle line seen in a stream of lines."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget the last cycle (a new run started writing)."""
+        self.cycle, self.time, self.dt = 0, 0.0, 0.0
+
+    def feed(self, line: str) -> bool:
+        """Parse one line; True if it advanced the cycle count."""
+        m = CYCLE_RE.match(line)
+        if not m:
+            return False
+        cycle = int(m.group(1))
+        if cycle <= self.cycle and self.cycle:
+            return False
+        self.cycle = cycle
+        self.time = float(m.group(2).upper().replace("D", "E"))
+        self.dt = float(m.group(3).upper().replace("D", "E"))
+        return True
+
+
+class ProgressMonitor:
+    """
+    Progress of one run from its console lines and / or output files.
+
+    Parameters:
+        work_dir (str, optional): Run directory; ``files`` are taken relative to it.
+        end_time (float, optional): ENDTIM for fraction and ETA (see ``termination_time``).
+        files (tuple): Files tailed by ``poll`` (missing files are skipped).
+        callback (callable, optional): Called with the ``Progress`` after every update.
+        status_file (str, optional): JSON file rewritten after every update.
+        stall_seconds (float, optional): Flag the run as stalled after this long
+                                         without a new cycle.
+        window (int): Cycle samples used for the rate / ETA estimate.
+        publish_interval (float): Minimum seconds between two publications
+                                  (stall changes are always published).
+        clock (callable): Wall-clock source (``time.time``).
+        from_start (bool): Also parse what the files already contain.
+    """
+
+    def __init__(self, work_dir=None, end_time=None, files=DEFAULT_FILES, callback=None,
+                 status_file=None, stall_seconds=None, window: int = 20, publish_interval: float = 1.0,
+                 clock=time.time, from_start: bool = True):
+        self.parser = ProgressParser()
+        self.tails = [FileTail(os.path.join(work_dir or "", f), from_start) for f in files]
+        self.callback = callback
+        self.status_file = status_file
+        self.stall_seconds = stall_seconds
+        self.publish_interval = publish_interval
+        self.clock = clock
+        self._published, self._dirty = None, False
+        self.progress = Progress(end_time=end_time, updated=clock())
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def feed(self, line: str):
+        """Feed one console line (use as ``on_line`` of ``run_lsdyna``)."""
+        with self._lock:
+            if self.parser.feed(line):
+                self._update()
+
+    def poll(self) -> Progress:
+        """Read the new lines of the tailed files, re-check for a stall and publish."""
+        with self._lock:
+            advanced = False
+            for tail in self.tails:
+                lines = tail.read_lines()
+                if tail.truncated:
+                    self._restart()
+                for line in lines:
+                    advanced |= self.parser.feed(line)
+            if advanced:
+                self._update()
+            else:
+                self._check_stall()
+            if self._dirty:
+                self._publish()
+            return self.progress
+
+    def _update(self):
+        p, now = self.progress, self.clock()
+        p.cycle, p.time, p.dt, p.updated, p.stalled = (self.parser.cycle, self.parser.time,
+                                                       self.parser.dt, now, False)
+        self._samples.append((now, p.time))
+        (w0, t0), (w1, t1) = self._samples[0], self._samples[-1]
+        p.rate = (t1 - t0) / (w1 - w0) if w1 > w0 and t1 > t0 else p.rate
+        if p.end_time:
+            p.fraction = min(p.time / p.end_time, 1.0)
+            if p.rate:
+                p.eta_seconds = max(p.end_time - p.time, 0.0) / p.rate
+        self._dirty = True
+        if self._published is None or now - self._published >= self.publish_interval:
+            self._publish()
+
+    def _restart(self):
+        """A tailed file was rewritten by a new run: start counting cycles again."""
+        self.parser.reset()
+        self._samples.clear()
+        self.progress.updated, self.progress.stalled = self.clock(), False
+
+    def _check_stall(self):
+        p = self.progress
+        stalled = bool(self.stall_seconds) and self.clock() - p.updated > self.stall_seconds
+        if stalled != p.stalled:
+            p.stalled = stalled
+            self._publish()
+
+    @property
+    def stalled(self) -> bool:
+        return self.progress.stalled
+
+    def _publish(self):
+        self._published, self._dirty = self.clock(), False
+        if self.callback is not None:
+            self.callback(self.progress)
+        if self.status_file:
+            tmp = f"{self.status_file}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(asdict(self.progress), f, indent=1)
+            os.replace(tmp, self.status_file)
+
+    def watch(self, interval: float = 5.0, on_stall=None):
+        """
+        Poll every ``interval`` seconds in a daemon thread.
+
+        Returns:
+            threading.Event: Set it to stop watching.
+        """
+        stop = threading.Event()
+
+        def loop():
+            while not stop.wait(interval):
+                if self.poll().stalled and on_stall is not None:
+                    on_stall(self.progress)
+                    return
+
+        threading.Thread(target=loop, daemon=True).start()
+        return stop
+
+
+def format_progress(p: Progress) -> str:
+    """One-line summary, e.g. "cycle 1000  t 5.000e-05 / 1.000e-04 (50.0%)  dt 5.0e-08  ETA 0:01:40"."""
+    text = f"cycle {p.cycle}  t {p.time:.3e}"
+    if p.end_time:
+        text += f" / {p.end_time:.3e}"
+    if p.fraction is not None:
+        text += f" ({100.0 * p.fraction:.1f}%)"
+    text += f"  dt {p.dt:.1e}"
+    if p.eta_seconds is not None:
+        s = int(round(p.eta_seconds))
+        text += f"  ETA {s // 3600}:{s // 60 % 60:02d}:{s % 60:02d}"
+    if p.stalled:
+        text += "  STALLED"
+    return text
@@ -0,0 +1,186 @@
+"""
+Restart / dump orchestration around ``run_lsdyna``.
+
+LS-DYNA writes restart dumps while it runs (``d3dump01``, ``d3dump02``, ...
+from ``*DATABASE_BINARY_D3DUMP`` and at normal termination; the running
+restart file ``runrsf`` from ``*DATABASE_BINARY_RUNRSF``; MPP runs add a
+``.0000``-style rank suffix). Instead of recomputing from t = 0 after a
+crash or a walltime kill:
+
+- ``find_restart_file`` returns the newest dump in a run directory;
+- ``run_with_restarts`` relaunches from the newest dump written by the
+  failed attempt (``r=d3dumpNN``), up to ``max_restarts`` times, and with
+  ``resume=True`` starts from the newest existing dump right away (rerun the
+  same command after the job was killed);
+- ``run_pipeline`` chains stages: the first stage runs the full deck, every
+  following stage restarts from the newest dump of the previous one with its
+  own small restart deck (``*CHANGE_...``, new ``*CONTROL_TERMINATION``, ...).
+
+A crash inside a stage is recovered with a plain restart (no deck): the dump
+already contains the changes the stage deck applied.
+
+Examples
+--------
+>>> rc, attempts = run_with_restarts("run/case.k", 8, "4000m", max_restarts=3)
+>>> results = run_pipeline([Stage("run/case.k"), Stage("run/stage2_change.k", name="reload")],
+...                        8, "4000m", work_dir="run")
+"""
+from __future__ import annotations
+
+import os
+import re
+import time
+from dataclasses import dataclass
+
+from .dyna_direct import run_lsdyna
+
+RESTART_RE = re.compile(r"^(d3dump\d+|runrsf)(\.\d{4})?$", re.IGNORECASE)
+
+# Filesystem timestamps can be coarse (2 s on FAT); dumps this much older
+# than the attempt start still count as written by it.
+_MTIME_SLACK = 2.0
+
+
+def restart_files(work_dir):
+    """
+    Restart files in ``work_dir``, newest first.
+
+    MPP rank files (``d3dump01.0000``, ``d3dump01.0001``, ...) are grouped
+    under their family name, which is what ``r=`` expects.
+
+    Returns:
+        list: (name, mtime) tuples.
+    """
+    families = {}
+    try:
+        entries = list(os.scandir(work_dir))
+    except FileNotFoundError:
+        return []
+    for e in entries:
+        m = RESTART_RE.match(e.name)
+        if m and e.is_file():
+            name = m.group(1)
+            families[name] = max(families.get(name, 0.0), e.stat().st_mtime)
+    return sorted(families.items(), key=lambda t: (t[1], t[0]), reverse=True)
+
+
+def find_restart_file(work_dir, since: float = None):
+    """
+    Newest restart file name in ``work_dir`` (None if there is none, or none
+    written after the unix time ``since``).
+    """
+    files = restart_files(work_dir)
+    if not files:
+        return None
+    name, mtime = files[0]
+    if since is not None and mtime < since - _MTIME_SLACK:
+        return None
+    return name
+
+
+def run_with_restarts(input_file, ncpu, memory, work_dir=None, dump_file=None, max_restarts: int = 3,
+                      resume: bool = False, restart_deck=None, **run_kwargs):
+    """
+    ``run_lsdyna`` with automatic relaunch from the newest restart dump.
+
+    Parameters:
+        input_file (str): Input deck of the first attempt (None: plain restart
+                          from ``dump_file``).
+        ncpu, memory: As for ``run_lsdyna``.
+        work_dir (str, optional): Run directory (default: input_file directory).
+        dump_file (str, optional): R= file of the first attempt.
+        max_restarts (int): Relaunches after failed attempts.
+        resume (bool): Start from the newest dump already in ``work_dir``
+                       (e.g. after a walltime kill), if there is one.
+        restart_deck (str, optional): Deck passed with every relaunch
+                                      (default: none, a plain ``r=`` restart).
+        **run_kwargs: Further ``run_lsdyna`` arguments (log_file, echo, ...).
+
+    Returns:
+        tuple: (returncode, attempts) with one {"input_file", "dump_file",
+               "returncode"} dict per attempt. A failed attempt that wrote no
+               new dump ends the loop (restarting could only repeat it).
+    """
+    if work_dir is None:
+        work_dir = os.path.dirname(os.path.abspath(input_file))
+    if input_file is not None:
+        # All attempts append to the log of the main deck.
+        stem = os.path.splitext(os.path.basename(input_file))[0]
+        if run_kwargs.get("log_file") is None:
+            run_kwargs["log_file"] = os.path.join(work_dir, stem + ".log")
+    deck, dump = input_file, dump_file
+    if resume:
+        newest = find_restart_file(work_dir)
+        if newest is not None:
+            deck, dump = restart_deck, newest
+
+    attempts = []
+    for attempt in range(max_restarts + 1):
+        started = time.time()
+        rc = run_lsdyna(deck, ncpu, memory, dump_file=dump, work_dir=work_dir, **run_kwargs)
+        attempts.append({"input_file": deck, "dump_file": dump, "returncode": rc})
+        if rc == 0:
+            break
+        newest = find_restart_file(work_dir, since=started)
+        if newest is None or attempt == max_restarts:
+            break
+        print(f"Restarting from {newest} (restart {attempt + 1} of {max_restarts})")
+        deck, dump = restart_deck, newest
+    return rc, attempts
+
+
+@dataclass
+class Stage:
+    """
+    One step of a restart pipeline.
+
+    Parameters:
+        k_file (str, optional): Full deck (first stage) or small restart deck
+                                (later stages); None for a plain restart.
+        name (str): Label for messages and results.
+        ncpu, memory (optional): Override the pipeline values for this stage.
+    """
+    k_file: str = None
+    name: str = ""
+    ncpu: int = None
+    memory: str = None
+
+
+def run_pipeline(stages, ncpu, memory, work_dir, max_restarts: int = 3, resume: bool = False,
+                 **run_kwargs):
+    """
+    Run ``stages`` in sequence in one directory, chaining them through dumps.
+
+    Parameters:
+        stages (list): ``Stage`` objects; the first must have a ``k_file``.
+        ncpu, memory: Defaults for all stages.
+        work_dir (str): Run directory shared by the stages.
+        max_restarts (int): Crash relaunches per stage.
+        resume (bool): Resume the first stage from an existing dump.
+        **run_kwargs: Further ``run_lsdyna`` arguments.
+
+    Returns:
+        list: One {"stage", "returncode", "attempts"} dict per stage that was
+              run; the pipeline stops at the first stage that fails.
+
+    Raises:
+        ValueError: If a later stage finds no dump to start from.
+    """
+    if not stages or stages[0].k_file is None:
+        raise ValueError("The first stage needs a full input deck")
+    results = []
+    for i, stage in enumerate(stages):
+        label = stage.name or f"stage {i + 1}"
+        dump = None
+        if i > 0:
+            dump = find_restart_file(work_dir)
+            if dump is None:
+                raise ValueError(f"{label}: no restart dump in {work_dir}")
+        print(f"Pipeline {label}: {stage.k_file or 'plain restart'}" + (f" from {dump}" if dump else ""))
+        rc, attempts = run_with_restarts(stage.k_file, stage.ncpu or ncpu, stage.memory or memory,
+                                         work_dir=work_dir, dump_file=dump, max_restarts=max_restarts,
+                                         resume=resume and i == 0, **run_kwargs)
+        results.append({"stage": label, "returncode": rc, "attempts": attempts})
+        if rc != 0:
+            break
+    return results
@@ -0,0 +1,235 @@
+"""
+Content-addressed store of completed solver runs.
+
+Sweeps often re-submit decks that have already been solved. ``run_key``
+hashes everything that determines a run: the content of the input .k file
+and of every file it ``*INCLUDE``s (recursively), the solver path, ``ncpu``,
+``memory`` and, for restarts, the content of the dump file (with its MPP
+pieces ``d3dump01.0000``, ...). After a successful run the files the
+solver created or modified in the working directory are stored under that key
+(except the runner's own console log and progress files); a later run with
+the same key skips the solve and copies the stored outputs into its working
+directory.
+
+Like ``preprocess.cache.MeshCache``, the store is a ``store.DirectoryStore``:
+entries are directories with a ``meta.json``, written under a temporary name
+and renamed into place, and the store is bounded by ``max_bytes`` with
+least-recently-used eviction.
+
+Examples
+--------
+>>> cache = ResultCache("D:/dyna_results", max_bytes=500 * 2**30)
+>>> run_lsdyna("case_07/case.k", 8, "4000m", cache=cache)     # solves and stores
+>>> run_lsdyna("copy_of_07/case.k", 8, "4000m", cache=cache)  # served from the store
+"""
+from __future__ import annotations
+
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from ..keyword.reader import KeywordFile
+from ..store import DirectoryStore
+
+# Files written by the runner rather than the solver (progress status files;
+# the console log is excluded by name by the callers).
+RUNNER_FILES = ("*.progress.json",)
+_HASH_CHUNK = 1 << 24
+
+
+def _include_names(kf: KeywordFile):
+    """File names of the ``*INCLUDE*`` blocks and search directories of ``*INCLUDE_PATH*``."""
+    names, paths = [], []
+    for block in kf.blocks:
+        if not block.name.startswith("INCLUDE"):
+            continue
+        lines = [raw.decode("utf-8", "replace").rstrip() for raw in
+                 kf.block_bytes(block).tobytes().splitlines()
+                 if raw.strip() and not raw.startswith(b"$")]
+        # Long names continue on the next line after a trailing " +".
+        joined, current = [], ""
+        for line in lines:
+            if line.endswith(" +"):
+                current += line[:-2]
+            else:
+                joined.append((current + line).strip())
+                current = ""
+        if block.name.startswith("INCLUDE_PATH"):
+            paths.extend(joined)
+        elif block.name == "INCLUDE":
+            names.extend(joined)
+        elif joined:
+            # *INCLUDE_TRANSFORM, *INCLUDE_STAMPED_PART, ...: first card only.
+            names.append(joined[0])
+    return names, paths
+
+
+def include_files(k_file):
+    """
+    The input deck and every file it includes, recursively, in include order.
+
+    Relative names are searched in the directory of the including file, the
+    ``*INCLUDE_PATH`` directories and the directory of the main deck.
+
+    Raises:
+        FileNotFoundError: If an included file does not exist.
+    """
+    k_file = os.path.abspath(k_file)
+    root = os.path.dirname(k_file)
+    out, seen, stack, search = [], set(), [k_file], []
+    while stack:
+        path = stack.pop(0)
+        if path in seen:
+            continue
+        seen.add(path)
+        out.append(path)
+        with KeywordFile(path) as kf:
+            names, paths = _include_names(kf)
+        search.extend(os.path.join(root, p) for p in paths)
+        found = []
+        for name in names:
+            candidates = [name] if os.path.isabs(name) else \
+                [os.path.join(d, name) for d in [os.path.dirname(path)] + search + [root]]
+            hit = next((c for c in candidates if os.path.isfile(c)), None)
+            if hit is None:
+                raise FileNotFoundError(f"*INCLUDE {name!r} of {path} not found")
+            found.append(os.path.abspath(hit))
+        stack[:0] = found
+    return out
+
+
+def _file_digest(path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def dump_files(dump_file, work_dir=None):
+    """
+    The restart dump ``dump_file`` (relative to ``work_dir``) and its MPP
+    pieces (``d3dump01.0000``, ...) that exist, sorted.
+    """
+    path = os.path.join(work_dir or ".", dump_file)
+    pieces = glob.glob(glob.escape(path) + ".[0-9][0-9][0-9][0-9]")
+    return sorted(([path] if os.path.isfile(path) else []) + pieces)
+
+
+def run_key(k_file, ncpu, memory, dynasolver_path, dump_file=None, work_dir=None) -> str:
+    """
+    Key of a run: hash of the deck, its includes (content and name relative
+    to the deck directory), the solver path, ``ncpu``, ``memory`` and, for a
+    restart, ``dump_file`` with the content of its dump files (looked up in
+    ``work_dir``, default: the deck directory).
+    """
+    files = include_files(k_file)
+    root = os.path.dirname(files[0])
+    dumps = dump_files(dump_file, work_dir or root) if dump_file else []
+    payload = {
+        "solver": dynasolver_path if isinstance(dynasolver_path, str) else list(dynasolver_path),
+        "ncpu": int(ncpu),
+        "memory": str(memory),
+        "dump_file": dump_file,
+        "dumps": [[os.path.basename(p), _file_digest(p)] for p in dumps],
+        "files": [[os.path.relpath(p, root).replace(os.sep, "/"), _file_digest(p)] for p in files],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def snapshot(work_dir) -> dict:
+    """{file name: (size, mtime_ns)} of the regular files directly in ``work_dir``."""
+    out = {}
+    with os.scandir(work_dir) as it:
+        for e in it:
+            if e.is_file():
+                st = e.stat()
+                out[e.name] = (st.st_size, st.st_mtime_ns)
+    return out
+
+
+def changed_files(before: dict, after: dict, exclude=RUNNER_FILES):
+    """
+    Names that are new or modified between two ``snapshot`` calls, without
+    the names matching one of the ``exclude`` glob patterns.
+    """
+    return sorted(n for n, s in after.items()
+                  if before.get(n) != s and not any(fnmatch.fnmatch(n, p) for p in exclude))
+
+
+def runner_files(log_file=None, extra=()):
+    """Exclude patterns for ``changed_files``: ``RUNNER_FILES``, the console log and its rotations."""
+    names = list(RUNNER_FILES) + [glob.escape(os.path.basename(p)) for p in extra if p]
+    if log_file:
+        base = os.path.basename(log_file)
+        names += [glob.escape(base), glob.escape(base) + ".[0-9]*"]
+    return tuple(names)
+
+
+
+class ResultCache(DirectoryStore):
+    """
+    Size-bounded LRU store of solver outputs, keyed by ``run_key`` (see
+    ``store.DirectoryStore``).
+
+    Parameters:
+        root (str): Store directory (created if missing).
+        max_bytes (int, optional): Size limit; None means unbounded.
+    """
+
+    def get(self, key: str):
+        """
+        Returns:
+            dict: The entry's metadata ({"files", "bytes", "created", "info"}),
+                  or None if the key is not stored.
+        """
+        meta = self._read_meta(key)
+        if meta is not None:
+            self._mark_used(key)
+        return meta
+
+    def put(self, key: str, work_dir, files, info: dict = None):
+        """Copy ``files`` (names in ``work_dir``) into the store under ``key``."""
+        with self._staging() as tmp:
+            size = 0
+            for name in files:
+                shutil.copy2(os.path.join(work_dir, name), os.path.join(tmp, name))
+                size += os.path.getsize(os.path.join(tmp, name))
+            self._commit(tmp, key, {"files": list(files), "bytes": size, "created": time.time(),
+                                    "info": info or {}})
+
+    def materialize(self, key: str, work_dir, link: bool = False):
+        """
+        Place the stored outputs of ``key`` into ``work_dir``.
+
+        Parameters:
+            link (bool): Hard-link the files instead of copying them (falls
+                         back to copying, e.g. across drives). Only for
+                         read-only use of the outputs: a solver or runner that
+                         later appends to or rewrites a linked file in place
+                         changes the stored entry too.
+
+        Returns:
+            list: The file names, or None if the key is not stored.
+        """
+        meta = self.get(key)
+        if meta is None:
+            return None
+        os.makedirs(work_dir, exist_ok=True)
+        entry = self._entry(key)
+        for name in meta["files"]:
+            src, dst = os.path.join(entry, name), os.path.join(work_dir, name)
+            if os.path.lexists(dst):
+                os.remove(dst)
+            if link:
+                try:
+                    os.link(src, dst)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(src, dst)
+        return meta["files"]
@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+"""
+Asynchronous scheduler for parameter sweeps of LS-DYNA cases.
+
+``run_lsdyna`` runs one case at a time. ``Scheduler`` takes a list of jobs
+(k-file, ncpu, memory) and a total core / memory budget and keeps the machine
+busy without oversubscribing it: whenever a job finishes, the pending jobs
+are scanned in priority order and every job that fits the free budget is
+launched (smaller jobs may backfill behind a large one that does not fit
+yet). Each solver runs through ``logstream.stream_process`` in a worker
+thread, so its console output goes to the same size-limited, rotating
+``<k-file stem>.log`` as with ``run_lsdyna``. Failed jobs are retried up to
+``max_retries`` times.
+
+The queue state is written to a JSON file after every change, so an
+interrupted sweep resumes where it stopped: finished jobs are skipped and
+jobs that were running are started again.
+
+With ``stall_seconds`` every running job is watched by a
+``progress.ProgressMonitor`` (console log plus ``messag`` / ``d3hsp``): its
+progress is written to ``<k-file stem>.progress.json`` and a job without a
+new cycle for ``stall_seconds`` is killed (and retried like a failure).
+
+With a ``result_cache.ResultCache`` jobs whose deck, includes, solver, ncpu
+and memory were solved before are materialized from the store instead.
+
+Memory is budgeted in LS-DYNA words: "4000m" = 4000 * 10**6 words, "2g" =
+2 * 10**9, plain numbers are words.
+
+Examples
+--------
+>>> jobs = [Job(f"case_{v}/case.k", ncpu=8, memory="4000m", priority=p) for v, p in cases]
+>>> jobs = run_jobs(jobs, total_cpus=32, total_memory="16000m", state_file="sweep_state.json")
+
+# Command line, with a JSON list of job dicts (keys as in ``Job``)
+python -m lsdyna_py.runner.scheduler jobs.json --cpus 32 --memory 16000m --state sweep_state.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from .dyna_direct import DEFAULT_SOLVER, build_command
+from .logstream import stream_process
+from .progress import ProgressMonitor, termination_time
+from .result_cache import ResultCache, changed_files, run_key, runner_files, snapshot
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+_MEMORY_UNITS = {"": 1, "k": 10 ** 3, "m": 10 ** 6, "g": 10 ** 9}
+
+
+def memory_words(memory) -> int:
+    """Parse an LS-DYNA memory size ("4000m", "2g", "500000000") into words."""
+    if isinstance(memory, (int, float)):
+        return int(memory)
+    m = re.fullmatch(r"\s*(\d+(?:\.\d*)?)\s*([kmg]?)\s*", str(memory).lower())
+    if not m:
+        raise ValueError(f"Invalid memory size {memory!r}")
+    return int(float(m.group(1)) * _MEMORY_UNITS[m.group(2)])
+
+
+@dataclass
+class Job:
+    """
+    One LS-DYNA case and its scheduling state.
+
+    Parameters:
+        k_file (str): Input .k file.
+        ncpu (int): Cores used by the case.
+        memory (str): LS-DYNA memory size (e.g. "4000m").
+        priority (int): Higher runs first; ties keep the list order.
+        name (str): Unique key in the state file (default: ``k_file``).
+        work_dir (str, optional): Run directory (default: k-file directory).
+        dump_file (str, optional): R= dump/restart file name.
+        max_retries (int): Extra attempts after a failure.
+    """
+    k_file: str
+    ncpu: int = 1
+    memory: str = "1000m"
+    priority: int = 0
+    name: str = ""
+    work_dir: str = None
+    dump_file: str = None
+    max_retries: int = 0
+    status: str = PENDING
+    attempts: int = 0
+    returncode: int = None
+    error: str = ""
+    cached: bool = False
+
+    def __post_init__(self):
+        if not self.name:
+            self.name = str(self.k_file)
+        if self.work_dir is None:
+            self.work_dir = os.path.dirname(os.path.abspath(self.k_file))
+
+    @property
+    def log_file(self) -> str:
+        return os.path.join(self.work_dir, Path(self.k_file).stem + ".log")
+
+    @property
+    def status_file(self) -> str:
+        return os.path.join(self.work_dir, Path(self.k_file).stem + ".progress.json")
+
+
+class Scheduler:
+    """
+    Run ``jobs`` within ``total_cpus`` cores and ``total_memory`` words.
+
+    Parameters:
+        jobs (list): ``Job`` objects (names must be unique).
+        total_cpus (int): Core budget.
+        total_memory (str, optional): Memory budget (None: unlimited).
+        state_file (str, optional): JSON queue state for resuming.
+        dynasolver_path (str or list): Solver, as for ``build_command``.
+        stall_seconds (float, optional): Kill jobs without a new cycle for this long.
+        poll_interval (float): Seconds between progress polls.
+        cache (ResultCache, optional): Result store; jobs solved before are
+                                       materialized instead of run.
+        log_max_bytes (int): Size at which a job's console log rotates.
+        log_backups (int): Rotated logs kept per job.
+    """
+
+    def __init__(self, jobs, total_cpus: int, total_memory=None, state_file=None,
+                 dynasolver_path=DEFAULT_SOLVER, stall_seconds=None, poll_interval: float = 5.0,
+                 cache=None, log_max_bytes: int = 50 * 2 ** 20, log_backups: int = 3):
+        self.jobs = list(jobs)
+        names = [j.name for j in self.jobs]
+        if len(set(names)) != len(names):
+            raise ValueError("Job names must be unique")
+        self.total_cpus = int(total_cpus)
+        self.total_memory = None if total_memory is None else memory_words(total_memory)
+        self.state_file = state_file
+        self.dynasolver_path = dynasolver_path
+        self.stall_seconds = stall_seconds
+        self.poll_interval = poll_interval
+        self.cache = cache
+        self.log_max_bytes = log_max_bytes
+        self.log_backups = log_backups
+        self.progress = {}
+        for job in self.jobs:
+            if job.ncpu > self.total_cpus or (self.total_memory is not None
+                                              and memory_words(job.memory) > self.total_memory):
+                raise ValueError(f"Job {job.name!r} ({job.ncpu} cpus, {job.memory}) exceeds the budget")
+        self._free_cpus = self.total_cpus
+        self._free_memory = self.total_memory
+        self._procs = {}
+
+    # ------------------------------------------------------------- state file
+
+    def load_state(self):
+        """Take over status / attempts of jobs recorded in ``state_file``."""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        with open(self.state_file, "r", encoding="utf-8") as f:
+            saved = {d["name"]: d for d in json.load(f)["jobs"]}
+        for job in self.jobs:
+            d = saved.get(job.name)
+            if d is None:
+                continue
+            job.status = PENDING if d["status"] == RUNNING else d["status"]
+            job.attempts, job.returncode, job.error = d["attempts"], d["returncode"], d["error"]
+
+    def save_state(self):
+        if not self.state_file:
+            return
+        tmp = f"{self.state_file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"total_cpus": self.total_cpus, "total_memory": self.total_memory,
+                       "jobs": [asdict(j) for j in self.jobs]}, f, indent=1)
+        os.replace(tmp, self.state_file)
+
+    # ------------------------------------------------------------- scheduling
+
+    def _fits(self, job: Job) -> bool:
+        if job.ncpu > self._free_cpus:
+            return False
+        return self._free_memory is None or memory_words(job.memory) <= self._free_memory
+
+    def _take(self, job: Job, sign: int):
+        self._free_cpus -= sign * job.ncpu
+        if self._free_memory is not None:
+            self._free_memory -= sign * memory_words(job.memory)
+
+    def _ready(self):
+        pending = [(i, j) for i, j in enumerate(self.jobs) if j.status == PENDING]
+        return [j for _, j in sorted(pending, key=lambda t: (-t[1].priority, t[0]))]
+
+    async def _run_job(self, job: Job) -> int:
+        key = None
+        if self.cache is not None:
+            # Hashing decks and copying outputs can take minutes for large
+            # runs: keep them off the event loop so other jobs are still polled.
+            key = await asyncio.to_thread(run_key, job.k_file, job.ncpu, job.memory, self.dynasolver_path,
+                                          job.dump_file, job.work_dir)
+            if await asyncio.to_thread(self.cache.materialize, key, job.work_dir) is not None:
+                job.cached = True
+                return 0
+            before = await asyncio.to_thread(snapshot, job.work_dir)
+        returncode = await self._solve(job)
+        if returncode == 0 and key is not None:
+            after = await asyncio.to_thread(snapshot, job.work_dir)
+            outputs = changed_files(before, after, runner_files(job.log_file, [job.status_file]))
+            await asyncio.to_thread(self.cache.put, key, job.work_dir, outputs,
+                                    info={"input_file": os.path.abspath(job.k_file)})
+        return returncode
+
+    async def _solve(self, job: Job) -> int:
+        command = build_command(os.path.abspath(job.k_file), job.ncpu, job.memory, job.dump_file,
+                                self.dynasolver_path)
+        cancelled = False
+
+        def on_start(proc):
+            # Called from the worker thread once the solver runs.
+            self._procs[job.name] = proc
+            if cancelled:
+                proc.kill()
+
+        waiter = asyncio.ensure_future(asyncio.to_thread(
+            stream_process, command, cwd=job.work_dir, log_file=job.log_file,
+            log_max_bytes=self.log_max_bytes, log_backups=self.log_backups, tail_lines=1, echo=False,
+            on_start=on_start))
+        try:
+            if self.stall_seconds is None:
+                returncode, _ = await waiter
+            else:
+                returncode, _ = await self._watch(job, waiter)
+            return returncode
+        except asyncio.CancelledError:
+            cancelled = True
+            self.kill(job.name)
+            raise
+        finally:
+            self._procs.pop(job.name, None)
+
+    async def _watch(self, job: Job, waiter):
+        """Wait for the ``stream_process`` result ``waiter``, polling progress and killing a stalled job."""
+        try:
+            end_time = termination_time(job.k_file)
+        except OSError:
+            end_time = None
+        files = (os.path.basename(job.log_file), "messag", "d3hsp")
+        # The log is appended to across attempts: only parse the new output.
+        monitor = ProgressMonitor(job.work_dir, end_time, files=files, status_file=job.status_file,
+                                  stall_seconds=self.stall_seconds, from_start=False)
+        self.progress[job.name] = monitor.progress
+        while not waiter.done():
+            await asyncio.wait([waiter], timeout=self.poll_interval)
+            if monitor.poll().stalled and not waiter.done():
+                job.error = f"stalled (no new cycle for {self.stall_seconds:g} s)"
+                self.kill(job.name)
+        return waiter.result()
+
+    def kill(self, name: str):
+        """Terminate a running job (it counts as a failed attempt)."""
+        proc = self._procs.get(name)
+        if proc is not None and proc.returncode is None:
+            proc.kill()
+
+    def _finish(self, job: Job, task: asyncio.Task):
+        self._take(job, -1)
+        try:
+            job.returncode = task.result()
+        except Exception as e:
+            # One bad job (unreadable deck, missing solver, ...) is a failed
+            # attempt of that job, not the end of the sweep.
+            job.returncode, job.error = None, f"{type(e).__name__}: {e}"
+        if job.returncode == 0:
+            job.status = DONE
+        elif job.attempts <= job.max_retries:
+            job.status = PENDING
+        else:
+            job.status = FAILED
+
+    async def run(self):
+        """
+        Run all pending jobs.
+
+        Returns:
+            list: The jobs with their final status ("done" or "failed").
+        """
+        self.load_state()
+        running = {}
+        try:
+            while True:
+                for job in self._ready():
+                    if self._fits(job):
+                        self._take(job, +1)
+                        job.status, job.attempts, job.error = RUNNING, job.attempts + 1, ""
+                        running[asyncio.ensure_future(self._run_job(job))] = job
+                self.save_state()
+                if not running:
+                    return self.jobs
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    self._finish(running.pop(task), task)
+        finally:
+            # Cancelled (e.g. Ctrl+C): stop the solvers; they rerun on resume.
+            for name in list(self._procs):
+                self.kill(name)
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            self.save_state()
+
+
+def run_jobs(jobs, total_cpus: int, total_memory=None, state_file=None, dynasolver_path=DEFAULT_SOLVER,
+             stall_seconds=None, poll_interval: float = 5.0, cache=None, log_max_bytes: int = 50 * 2 ** 20,
+             log_backups: int = 3):
+    """Blocking wrapper: run ``Scheduler(...).run()`` in a new event loop."""
+    return asyncio.run(Scheduler(jobs, total_cpus, total_memory, state_file, dynasolver_path,
+                                 stall_seconds, poll_interval, cache, log_max_bytes, log_backups).run())
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("jobs", help="JSON file with a list of jobs (k_file, ncpu, memory, priority, ...)")
+    ap.add_argument("--cpus", type=int, required=True, help="Total core budget")
+    ap.add_argument("--memory", default=None, help="Total memory budget, e.g. 16000m")
+    ap.add_argument("--state", default=None, help="Queue state file for resuming")
+    ap.add_argument("--solver", default=DEFAULT_SOLVER, help="Override dynasolver_path (lsdyna_dp.exe)")
+    ap.add_argument("--stall-timeout", type=float, default=None,
+                    help="Kill jobs after this many seconds without a new cycle")
+    ap.add_argument("--cache-dir", default=None, help="Result store; identical runs are not solved again")
+    ap.add_argument("--cache-max-gb", type=float, default=None, help="Size limit of the result store (LRU)")
+    args = ap.parse_args()
+
+    keys = {f.name for f in fields(Job)}
+    with open(args.jobs, "r", encoding="utf-8") as f:
+        jobs = [Job(**{k: v for k, v in d.items() if k in keys}) for d in json.load(f)]
+    cache = None
+    if args.cache_dir:
+        cache = ResultCache(args.cache_dir, None if args.cache_max_gb is None else int(args.cache_max_gb * 2 ** 30))
+    jobs = run_jobs(jobs, args.cpus, args.memory, args.state, args.solver, args.stall_timeout, cache=cache)
+    for job in jobs:
+        print(f"{job.status:8s} attempts={job.attempts} rc={job.returncode}{' cached' if job.cached else ''} {job.name}")
+    return 0 if all(j.status == DONE for j in jobs) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
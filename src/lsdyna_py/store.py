@@ -0,0 +1,154 @@
+"""
+Directory-per-entry store shared by the mesh and result caches.
+
+Each entry is a directory named by its key holding the cached files and a
+``meta.json`` with at least the entry size ("bytes"). ``DirectoryStore`` does
+the bookkeeping common to ``preprocess.cache.MeshCache`` and
+``runner.result_cache.ResultCache``; the subclasses only decide what is
+written into an entry (``put``) and how it is read back (``get``):
+
+- entries are written into a private ``.tmp-*`` directory and renamed into
+  place, so a concurrent reader never sees a half-written entry, and of two
+  writers of the same key the first one wins;
+- the modification time of ``meta.json`` is the last use, and the store is
+  bounded by ``max_bytes`` with least-recently-used eviction;
+- ``invalidate`` renames an entry away before deleting it.
+
+Examples
+--------
+>>> class TextStore(DirectoryStore):
+...     def put(self, key, text):
+...         with self._staging() as tmp:
+...             with open(os.path.join(tmp, "text.txt"), "w") as f:
+...                 f.write(text)
+...             self._commit(tmp, key, {"bytes": len(text)})
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import shutil
+import uuid
+
+META = "meta.json"
+
+
+class DirectoryStore:
+    """
+    Size-bounded LRU store of entry directories.
+
+    Parameters:
+        root (str): Store directory (created if missing).
+        max_bytes (int, optional): Size limit; None means unbounded.
+    """
+
+    def __init__(self, root, max_bytes=None):
+        self.root = os.fspath(root)
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def _read_meta(self, key: str):
+        """The metadata of ``key``, or None if the key is not stored."""
+        meta_path = os.path.join(self._entry(key), META)
+        if not os.path.isfile(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _mark_used(self, key: str):
+        os.utime(os.path.join(self._entry(key), META))
+
+    @contextlib.contextmanager
+    def _staging(self):
+        """Private directory to write a new entry into; removed afterwards."""
+        tmp = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            yield tmp
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def _commit(self, tmp: str, key: str, meta: dict):
+        """Write ``meta`` into the staged entry ``tmp``, publish it as ``key`` and evict."""
+        with open(os.path.join(tmp, META), "w", encoding="utf-8") as f:
+            json.dump(meta, f, default=str)
+        self._publish(tmp, key)
+        self.evict(keep=key)
+
+    def _publish(self, tmp: str, key: str):
+        """
+        Rename the finished directory ``tmp`` into place as ``key``. If another
+        writer stored the same key meanwhile, its entry is kept (same key, same
+        content) and ``tmp`` is discarded by the caller.
+        """
+        entry = self._entry(key)
+        for attempt in range(2):
+            try:
+                os.replace(tmp, entry)
+                return
+            except OSError:
+                if os.path.isfile(os.path.join(entry, META)):
+                    return
+                if attempt:
+                    raise
+                # A leftover without metadata: remove it and try once more.
+                self.invalidate(key)
+
+    def entries(self):
+        """
+        Returns:
+            list: (key, bytes, last_used) tuples, least recently used first.
+        """
+        out = []
+        for name in os.listdir(self.root):
+            meta_path = os.path.join(self.root, name, META)
+            if name.startswith(".") or not os.path.isfile(meta_path):
+                continue
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    size = json.load(f)["bytes"]
+                out.append((name, size, os.path.getmtime(meta_path)))
+            except (OSError, ValueError, KeyError):
+                continue
+        return sorted(out, key=lambda e: e[2])
+
+    def size_bytes(self) -> int:
+        return sum(e[1] for e in self.entries())
+
+    def evict(self, keep: str = None):
+        """Remove least recently used entries until the store fits ``max_bytes``."""
+        if self.max_bytes is None:
+            return
+        entries = self.entries()
+        total = sum(e[1] for e in entries)
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            if self.invalidate(key):
+                total -= size
+
+    def invalidate(self, key: str) -> bool:
+        """Remove one entry. Returns True if something was removed."""
+        entry = self._entry(key)
+        if not os.path.isdir(entry):
+            return False
+        # Rename first so readers stop finding the entry even if a memory map
+        # still pins some files (Windows cannot delete mapped files).
+        trash = os.path.join(self.root, f".trash-{uuid.uuid4().hex}")
+        try:
+            os.replace(entry, trash)
+        except OSError:
+            return False
+        shutil.rmtree(trash, ignore_errors=True)
+        return True
+
+    def clear(self):
+        """Remove every entry."""
+        for key, _, _ in self.entries():
+            self.invalidate(key)
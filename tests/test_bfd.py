@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from lsdyna_py.postprocess.metrics.bfd import back_face_mask, bfd_from_nodout, bfd_metrics, bfd_sweep
+from test_nodout import _write_nodout
+
+
+def _plate():
+    x, y, z = np.meshgrid(np.arange(-5.0, 6.0), np.arange(-5.0, 6.0), [-0.635, 0.0], indexing="ij")
+    return np.column_stack([x.ravel(), y.ravel(), z.ravel()])
+
+
+def _cone(xy, depth, radius):
+    r = np.hypot(xy[:, 0], xy[:, 1])
+    return depth * np.clip(1.0 - r / radius, 0.0, None)
+
+
+def test_bfd_metrics_cone():
+    xyz = _plate()
+    back = back_face_mask(xyz)
+    assert back.sum() == 121 and np.all(xyz[back, 2] == -0.635)
+    xy = xyz[back, :2]
+    d = np.stack([_cone(xy, 0.0, 1.0), _cone(xy, 1.0, 3.0), _cone(xy, 2.0, 4.0)])
+    r = bfd_metrics(xy, d, threshold=0.2)
+    np.testing.assert_allclose(r["bfd"], [0.0, 1.0, 2.0])
+    np.testing.assert_allclose(r["radius"], [0.0, np.sqrt(5.0), np.sqrt(10.0)])
+    np.testing.assert_allclose(r["volume"], np.pi * r["radius"] ** 2 * r["bfd"] / 3.0)
+    assert bfd_metrics(xy, d, ratio=0.5)["radius"][2] == 2.0
+    with pytest.raises(ValueError):
+        bfd_metrics(np.empty((0, 2)), np.empty((3, 0)))
+
+
+def test_bfd_sweep_nodout(tmp_path):
+    xyz = _plate()
+    ids = np.arange(1, len(xyz) + 1)
+    back = back_face_mask(xyz)
+    times = np.array([0.0, 1e-5, 2e-5])
+    for case, depth in (("a", 0.5), ("b", 1.5)):
+        values = np.zeros((3, len(xyz), 12))
+        for k in range(3):
+            uz = np.where(back, -_cone(xyz[:, :2], depth * k / 2, 3.0), 0.0)
+            values[k, :, 2] = uz
+            values[k, :, 9:] = xyz + np.column_stack([0 * uz, 0 * uz, uz])
+        (tmp_path / case).mkdir()
+        _write_nodout(tmp_path / case / "nodout", ids, times, values)
+
+    r = bfd_from_nodout(tmp_path / "b" / "nodout", threshold=0.1)
+    assert r["n_back"] == 121 and r["peak_time"] == pytest.approx(2e-5)
+    np.testing.assert_allclose(r["bfd"], [0.0, 0.75, 1.5], atol=1e-4)
+
+    table = bfd_sweep([tmp_path / "a", tmp_path / "b", tmp_path / "missing"])
+    np.testing.assert_allclose(table["peak_bfd"][:2], [0.5, 1.5], atol=1e-4)
+    assert table["error"][:2].isna().all() and "missing" in table["error"][2]
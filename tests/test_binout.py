@@ -0,0 +1,73 @@
+import struct
+
+import numpy as np
+import pytest
+
+from lsdyna_py.postprocess.parsers.binout import Binout, series_files
+
+_TYPE_IDS = {np.dtype("i4"): 3, np.dtype("i8"): 4, np.dtype("f4"): 9, np.dtype("f8"): 10}
+
+
+def _record(command, payload):
+    return struct.pack("<qB", 9 + len(payload), command) + payload
+
+
+def _write_lsda(path, variables):
+    """Minimal LSDA writer: ``variables`` is {"/dir/name": array}, written in order."""
+    out = bytearray(bytes([8, 8, 8, 1, 1, 0, 0, 0]))
+    table_ptr = len(out) + 9
+    out += _record(7, struct.pack("<q", 0))
+    entries, cwd = [], None
+    for full, values in variables.items():
+        values = np.ascontiguousarray(values)
+        d, name = full.rsplit("/", 1)
+        if d != cwd:
+            out += _record(2, d.encode())
+            cwd = d
+        entries.append((d, name, _TYPE_IDS[values.dtype], len(out), values.size))
+        out += _record(3, bytes([_TYPE_IDS[values.dtype], len(name)]) + name.encode() + values.tobytes())
+    struct.pack_into("<q", out, table_ptr, len(out))
+    out += _record(5, b"")
+    cwd = None
+    for d, name, type_id, offset, count in entries:
+        if d != cwd:
+            # Relative CD between sibling state directories, as the solver writes.
+            rel = "../" + d.rsplit("/", 1)[1] if cwd and cwd.rsplit("/", 1)[0] == d.rsplit("/", 1)[0] else d
+            out += _record(2, rel.encode())
+            cwd = d
+        out += _record(4, name.encode() + bytes([type_id]) + struct.pack("<qq", offset, count))
+    out += _record(6, struct.pack("<q", 0))
+    path.write_bytes(bytes(out))
+
+
+def _states(first, n, n_nodes):
+    out = {}
+    for k in range(first, first + n):
+        out[f"/nodout/d{k:06d}/time"] = np.array([k * 1e-3], dtype=np.float32)
+        out[f"/nodout/d{k:06d}/x_displacement"] = np.arange(n_nodes, dtype=np.float32) * k
+        out[f"/glstat/d{k:06d}/time"] = np.array([k * 1e-3], dtype=np.float64)
+        out[f"/glstat/d{k:06d}/total_energy"] = np.array([100.0 - k])
+    return out
+
+
+def test_binout_series(tmp_path):
+    first = {"/nodout/metadata/ids": np.array([11, 12, 13], dtype=np.int64)}
+    first.update(_states(1, 3, 3))
+    _write_lsda(tmp_path / "binout0000", first)
+    _write_lsda(tmp_path / "binout0001", _states(4, 2, 3))
+    (tmp_path / "binout0001.bak").write_bytes(b"")
+    assert [p.rsplit("/", 1)[1] for p in series_files(tmp_path / "binout")] == ["binout0000", "binout0001"]
+
+    with Binout(tmp_path / "binout") as b:
+        assert b.branches() == ["glstat", "nodout"]
+        assert b.ls("nodout")[:2] == ["d000001", "d000002"] and len(b.states("nodout")) == 5
+        ids = b.get("/nodout/metadata/ids")
+        assert ids.tolist() == [11, 12, 13] and not ids.flags.owndata     # view into the map
+        t, ux = b.read("nodout", "x_displacement")
+        assert ux.shape == (5, 3) and ux.dtype == np.float32
+        np.testing.assert_allclose(t, np.arange(1, 6) * 1e-3, rtol=1e-6)
+        np.testing.assert_array_equal(ux[:, 2], 2.0 * np.arange(1, 6))
+        t, te = b.read("glstat/total_energy")
+        np.testing.assert_array_equal(te[:, 0], 100.0 - np.arange(1, 6))
+        with pytest.raises(KeyError):
+            b.get("/nodout/metadata/missing")
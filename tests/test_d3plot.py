@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from lsdyna_py.postprocess.parsers.d3plot import D3plot, family_files
+
+
+def _control(**words):
+    positions = {"NDIM": 15, "NUMNP": 16, "NGLBV": 18, "IU": 20, "IV": 21, "NEL8": 23, "NV3D": 27,
+                 "NEL4": 31, "NV2D": 33, "MAXINT": 36, "NMSPH": 37, "NPEFG": 54}
+    c = np.zeros(64, dtype="<i4")
+    for k, v in words.items():
+        c[positions[k]] = v
+    return c
+
+
+def _state(t, coords, solid, sph):
+    n = coords.shape[0]
+    return np.concatenate([[t, 1.0, 2.0], coords.ravel(), np.full(3 * n, t), solid.ravel(),
+                           sph.ravel()]).astype("<f4")
+
+
+def test_d3plot_family(tmp_path):
+    coords = np.arange(30, dtype=np.float32).reshape(10, 3)
+    solid = np.array([[1, 2, 3, 4, 5, 6, 7, 8, 1]], dtype="<i4")
+    flags = np.array([10, 1, 0, 0, 0, 1, 0, 0, 0, 0], dtype="<i4")    # radius, density
+    sph_table = np.array([[9, 2], [10, 2]], dtype="<i4")
+    control = _control(NDIM=4, NUMNP=10, NGLBV=2, IU=1, IV=1, NEL8=1, NV3D=7, MAXINT=3, NMSPH=2)
+    geometry = [control, flags, coords.astype("<f4").view("<i4").ravel(), solid.ravel(), sph_table.ravel()]
+
+    def state(k):
+        sph = np.array([[1, 0.5, 1000.0 + k], [1, 0.5, 2000.0 + k]])
+        return _state(k * 1e-3, coords + k, np.full(7, float(k)), sph)
+
+    (tmp_path / "d3plot").write_bytes(b"".join(a.tobytes() for a in geometry + [state(0), state(1)]))
+    end = np.array([-999999.0], dtype="<f4")
+    (tmp_path / "d3plot01").write_bytes(b"".join(a.tobytes() for a in [state(2), state(3), end]))
+    (tmp_path / "d3plot.bak").write_bytes(b"")
+    assert [p.rsplit("/", 1)[1] for p in family_files(tmp_path / "d3plot")] == ["d3plot", "d3plot01"]
+
+    with D3plot(tmp_path / "d3plot") as d:
+        assert d.n_states == 4
+        np.testing.assert_allclose(d.times, [0.0, 1e-3, 2e-3, 3e-3], rtol=1e-6)
+        np.testing.assert_array_equal(d.coordinates, coords)
+        assert d.solids.tolist() == [list(range(8))] and d.sph_nodes.tolist() == [8, 9]
+        assert d.sph_columns == {"radius": 1, "density": 2} and d.n_sph_vars == 3
+
+        u = d.displacements(states=[1, 3], nodes=[0, 9])
+        np.testing.assert_allclose(u, np.broadcast_to(np.array([1.0, 3.0])[:, None, None], (2, 2, 3)))
+        rho = d.read("sph")[..., d.sph_columns["density"]]
+        np.testing.assert_allclose(rho[:, 1], 2000.0 + np.arange(4))
+        np.testing.assert_allclose(d.read("solid")[:, 0, 6], np.arange(4))
+        np.testing.assert_allclose(d.field(2, "global").ravel(), [1.0, 2.0])
+        assert not d.state_view(3).flags.owndata
+
+
+def test_d3plot_tet10_offsets_and_unsupported_sections(tmp_path):
+    coords = np.arange(30, dtype="<f4").reshape(10, 3)
+    solid = np.array([1, 2, 3, 4, 4, 4, 4, 4, 1], dtype="<i4")
+    tet10_extra = np.array([9, 10], dtype="<i4")         # nodes 9 and 10 of the tet
+    shell = np.array([5, 6, 7, 8, 2], dtype="<i4")
+    control = _control(NDIM=4, NUMNP=10, IU=1, NEL8=-1, NV3D=7, NEL4=1, NV2D=2, MAXINT=3)
+    state = np.concatenate([[1e-3], coords.ravel() + 1, np.full(7, 3.0), [5.0, 6.0]]).astype("<f4")
+    parts = [control, coords.view("<i4").ravel(), solid, tet10_extra, shell, state]
+    (tmp_path / "d3plot").write_bytes(b"".join(a.tobytes() for a in parts))
+    with D3plot(tmp_path / "d3plot") as d:
+        assert d.shells.tolist() == [[4, 5, 6, 7]] and d.shells_mat.tolist() == [2]
+        assert d.n_states == 1 and d.field(0, "shell").tolist() == [[5.0, 6.0]]
+
+    control[54] = 1                                       # airbag particles
+    (tmp_path / "airbag").write_bytes(b"".join(a.tobytes() for a in [control] + parts[1:]))
+    with pytest.raises(ValueError, match="NPEFG"):
+        D3plot(tmp_path / "airbag")
@@ -0,0 +1,44 @@
+import numpy as np
+
+from lsdyna_py.preprocess.fem.box import generate_box_mesh
+
+
+def _reference_box(nx, ny, nz, start_nid, x_range, y_range, z_range):
+    """Dict-based node_map implementation from fem_box_mesh.py."""
+    dx = (x_range[1] - x_range[0]) / nx
+    dy = (y_range[1] - y_range[0]) / ny
+    dz = (z_range[1] - z_range[0]) / nz
+    node_map, coords, conn = {}, [], []
+    nid = start_nid
+    for i in range(nx + 1):
+        for j in range(ny + 1):
+            for k in range(nz + 1):
+                coords.append((x_range[0] + i * dx, y_range[0] + j * dy, z_range[0] + k * dz))
+                node_map[(i, j, k)] = nid
+                nid += 1
+    for i in range(nx):
+        for j in range(ny):
+            for k in range(nz):
+                corners = [(i, j, k), (i + 1, j, k), (i + 1, j + 1, k), (i, j + 1, k)]
+                corners += [(a, b, c + 1) for a, b, c in corners]
+                conn.append([node_map[p] for p in corners])
+    return np.array(coords), np.array(conn)
+
+
+def test_box_matches_node_map_reference():
+    args = ((-2.54, 2.54), (-1.0, 1.0), (-0.635, 0.0))
+    nids, xyz, eids, conn = generate_box_mesh(*args, 4, 3, 5, start_nid=1000001, start_eid=7)
+    ref_xyz, ref_conn = _reference_box(4, 3, 5, 1000001, *args)
+
+    assert np.array_equal(xyz, ref_xyz)
+    assert np.array_equal(conn, ref_conn)
+    assert nids[0] == 1000001 and nids[-1] == 1000001 + 5 * 4 * 6 - 1
+    assert eids[0] == 7 and eids.size == 4 * 3 * 5
+
+
+def test_box_hexes_have_positive_volume():
+    _, xyz, _, conn = generate_box_mesh((0, 1), (0, 2), (0, 3), 2, 2, 2, start_nid=1)
+    p = xyz[conn - 1]
+    # Triple product of the edges leaving n1 (n2 - n1, n4 - n1, n5 - n1).
+    vol = np.einsum("ij,ij->i", np.cross(p[:, 1] - p[:, 0], p[:, 3] - p[:, 0]), p[:, 4] - p[:, 0])
+    assert np.all(vol > 0)
@@ -0,0 +1,33 @@
+import numpy as np
+
+from lsdyna_py.preprocess.fem.butterfly import butterfly_plate_mesh, geometric_fractions
+
+_TETS = ((0, 1, 3, 4), (1, 2, 3, 6), (1, 5, 6, 4), (3, 7, 4, 6), (1, 3, 4, 6))
+
+
+def _hex_volumes(xyz, conn):
+    p = xyz[conn]
+    return sum(np.einsum("ij,ij->i", np.cross(p[:, b] - p[:, a], p[:, c] - p[:, a]), p[:, d] - p[:, a]) / 6.0
+               for a, b, c, d in _TETS)
+
+
+def test_butterfly_plate_topology_and_volume():
+    nids, xyz, eids, pids, conn = butterfly_plate_mesh(5.08, 4.0, 0.635, 1.5, 1.0, 10, 8, 4, 3, 1.2,
+                                                       start_nid=101, start_eid=201)
+    assert len(eids) == (10 * 8 + 4 * 2 * (10 + 8)) * 3
+    assert np.array_equal(np.bincount(pids)[1:], [10 * 8 * 3, 4 * 36 * 3])
+    assert eids[0] == 201 and np.array_equal(np.unique(conn), nids)
+
+    # Shared patch nodes exist once; all hexes are positively oriented and fill the plate.
+    assert len(np.unique(np.round(xyz, 9), axis=0)) == len(xyz)
+    vol = _hex_volumes(xyz, conn - 101)
+    assert vol.min() > 0.0
+    assert np.isclose(vol.sum(), 5.08 * 4.0 * 0.635)
+    assert np.isclose(vol[pids == 1].sum(), 3.0 * 2.0 * 0.635)
+
+
+def test_ring_grading():
+    f = geometric_fractions(5, 1.3)
+    assert f[0] == 0.0 and f[-1] == 1.0
+    assert np.allclose(np.diff(f)[1:] / np.diff(f)[:-1], 1.3)
+    assert np.allclose(geometric_fractions(4, 1.0), [0, 0.25, 0.5, 0.75, 1.0])
@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+
+from lsdyna_py.preprocess.fem.sphere import cubed_sphere_mesh, ogrid_sphere_mesh
+
+
+def _hex_volumes(xyz, conn, start_nid):
+    """Volume of each hex from a 6-tet split along the n1-n7 diagonal."""
+    p = xyz[conn - start_nid]
+    vol = np.zeros(conn.shape[0])
+    for a, b, c in ((1, 2, 6), (2, 3, 6), (3, 7, 6), (7, 4, 6), (4, 5, 6), (5, 1, 6)):
+        vol += np.einsum("ij,ij->i", np.cross(p[:, a] - p[:, 0], p[:, b] - p[:, 0]), p[:, c] - p[:, 0]) / 6
+    return vol
+
+
+def test_cubed_sphere_matches_script_mapping():
+    n, radius, center = 3, 0.25, (0.0, 0.0, 0.251)
+    nids, xyz, eids, conn = cubed_sphere_mesh(radius, center, density=n, start_nid=1, start_eid=1)
+
+    ref = []
+    for i in range(2 * n + 1):
+        for j in range(2 * n + 1):
+            for k in range(2 * n + 1):
+                u, v, w = (i - n) / n, (j - n) / n, (k - n) / n
+                ref.append((center[0] + u * math.sqrt(1.0 - (v**2)/2.0 - (w**2)/2.0 + (v**2 * w**2)/3.0) * radius,
+                            center[1] + v * math.sqrt(1.0 - (u**2)/2.0 - (w**2)/2.0 + (u**2 * w**2)/3.0) * radius,
+                            center[2] + w * math.sqrt(1.0 - (u**2)/2.0 - (v**2)/2.0 + (u**2 * v**2)/3.0) * radius))
+    assert np.array_equal(xyz, np.array(ref))
+    assert conn.shape == ((2 * n) ** 3, 8)
+    assert np.all(_hex_volumes(xyz, conn, 1) > 0)
+
+
+def test_ogrid_sphere_is_conforming_and_fills_the_ball():
+    radius = 0.25
+    nids, xyz, eids, conn = ogrid_sphere_mesh(radius, (1.0, 2.0, 3.0), n_core=6, n_shell=3,
+                                              start_nid=101, start_eid=201)
+    vol = _hex_volumes(xyz, conn, 101)
+
+    assert eids.size == 6 ** 3 + 6 * 6 ** 2 * 3
+    assert np.all(vol > 0)
+    # Every node is used and no two nodes coincide (shared nodes are merged).
+    assert np.array_equal(np.unique(conn), nids)
+    assert np.unique(np.round(xyz, 9), axis=0).shape[0] == nids.size
+    # Outer layer lies on the sphere; faceted volume is close to the ball's.
+    r = np.linalg.norm(xyz - (1.0, 2.0, 3.0), axis=1)
+    assert np.isclose(r.max(), radius)
+    assert abs(vol.sum() / (4.0 / 3.0 * math.pi * radius ** 3) - 1.0) < 0.05
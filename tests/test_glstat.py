@@ -0,0 +1,77 @@
+import numpy as np
+
+from lsdyna_py.postprocess.parsers.glstat import EnergyTail, matsum_pivot, read_glstat, read_matsum
+
+
+def _glstat_block(t, ke, ie):
+    return (f"\n dt of cycle      10 is controlled by solid        12 of part      1\n\n"
+            f" time...........................   {t:.5E}\n"
+            f" time step......................   5.00000E-08\n"
+            f" kinetic energy.................   {ke:.5E}\n"
+            f" internal energy................   {ie:.5E}\n"
+            f" hourglass energy ..............   1.00000E-02\n"
+            f" sliding interface energy.......   2.00000E-03\n"
+            f" total energy / initial energy..   1.00000E+00\n"
+            f" time per zone cycle.(nanosec)..          12\n")
+
+
+def _matsum_block(t, kes):
+    out = f"\n\n time =    {t:.5E}\n"
+    for mat, ke in enumerate(kes, start=1):
+        out += (f" mat.#={mat:5d}             inten=   0.0000E+00     kinen=   {ke:.4E}\n"
+                f" x-mom=   0.0000E+00     y-mom=   0.0000E+00     z-mom=  -{ke:.4E}\n"
+                f" hgeng=   0.0000E+00     +spng=   0.0000E+00     -spng=   0.0000E+00\n")
+    return out
+
+
+def test_read_glstat_and_matsum(tmp_path):
+    g = tmp_path / "glstat"
+    g.write_text(" ls-dyna header\n" + "".join(_glstat_block(i * 1e-6, 100.0 - i, float(i)) for i in range(3)))
+    df = read_glstat(g)
+    assert len(df) == 3
+    np.testing.assert_allclose(df["time"], [0.0, 1e-6, 2e-6])
+    np.testing.assert_allclose(df["kinetic_energy"], [100.0, 99.0, 98.0])
+    assert {"internal_energy", "hourglass_energy", "sliding_interface_energy",
+            "total_energy_initial_energy", "time_per_zone_cycle_nanosec"} <= set(df.columns)
+
+    m = tmp_path / "matsum"
+    m.write_text("".join(_matsum_block(i * 1e-6, [1.0 + i, 2.0]) for i in range(2)))
+    ms = read_matsum(m)
+    assert ms["mat"].tolist() == [1, 2, 1, 2]
+    assert {"inten", "kinen", "z_mom", "hgeng", "pos_spng", "neg_spng"} <= set(ms.columns)
+    ke = matsum_pivot(ms, "kinen")
+    np.testing.assert_allclose(ke.to_numpy(), [[1.0, 2.0], [2.0, 2.0]])
+
+
+def test_energy_tail_parses_only_completed_blocks(tmp_path):
+    g = tmp_path / "glstat"
+    tail = EnergyTail(g)
+    assert tail.poll().empty                            # not written yet
+
+    g.write_text(_glstat_block(0.0, 10.0, 0.0) + _glstat_block(1e-6, 9.0, 1.0)[:150])
+    first = tail.poll()
+    assert first["time"].tolist() == [0.0] and tail.offset > 0
+    assert tail.poll().empty                            # nothing new completed
+
+    with open(g, "w") as f:                             # rest of block 2, block 3 in progress
+        f.write(_glstat_block(0.0, 10.0, 0.0) + _glstat_block(1e-6, 9.0, 1.0) + _glstat_block(2e-6, 8.0, 2.0))
+    assert tail.poll()["kinetic_energy"].tolist() == [9.0]
+    assert tail.poll(final=True)["kinetic_energy"].tolist() == [8.0]
+    assert tail.frame()["time"].tolist() == [0.0, 1e-6, 2e-6]
+
+    m = tmp_path / "matsum"
+    m.write_text(_matsum_block(0.0, [1.0]) + _matsum_block(1e-6, [2.0]))
+    mt = EnergyTail(m)
+    assert mt.kind == "matsum" and mt.poll()["kinen"].tolist() == [1.0]
+
+
+def test_energy_tail_restarts_on_longer_rewritten_file(tmp_path):
+    g = tmp_path / "glstat"
+    g.write_text(_glstat_block(0.0, 10.0, 0.0) + _glstat_block(1e-6, 9.0, 1.0))
+    tail = EnergyTail(g)
+    assert tail.poll()["kinetic_energy"].tolist() == [10.0]
+
+    # A new run in the same directory has already written past the old offset.
+    g.write_text("".join(_glstat_block(i * 1e-6, 50.0 - i, 0.0) for i in range(4)))
+    tail.poll(final=True)
+    assert tail.frame()["kinetic_energy"].tolist() == [50.0, 49.0, 48.0, 47.0]
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from lsdyna_py.keyword.reader import KeywordFile
+from lsdyna_py.preprocess.fem.gmsh_import import compact_nodes, import_gmsh_key
+
+# gmsh-style free-format deck: gappy node IDs, an unused node, physical tags 7 / 9.
+_GMSH_KEY = b"""$# LS-DYNA Keyword file created by Gmsh
+*KEYWORD
+*NODE
+1, 0, 0, 0
+2, 1, 0, 0
+3, 1, 1, 0
+4, 0, 1, 0
+10, 0, 0, 1
+11, 1, 0, 1
+12, 1, 1, 1
+13, 0, 1, 1
+14, 2, 0, 0
+15, 2, 1, 0
+16, 2, 0, 1
+17, 2, 1, 1
+99, 5, 5, 5
+*ELEMENT_SOLID
+5, 7, 1, 2, 3, 4, 10, 11, 12, 13
+6, 9, 2, 14, 15, 3, 11, 16, 17, 12
+*END
+"""
+
+
+def test_import_gmsh_key(tmp_path):
+    src, dst = tmp_path / "mesh.key", tmp_path / "mesh.k"
+    src.write_bytes(_GMSH_KEY)
+    info = import_gmsh_key(src, dst, start_nid=1000001, start_eid=2000001, pid_map={7: 1000001})
+    assert info["n_nodes"] == 12 and info["eid_range"] == (2000001, 2000002)
+    assert info["pids"] == [9, 1000001]
+
+    with KeywordFile(dst) as kf:
+        nids, xyz = kf.read_nodes()
+        eids, pids, conn = kf.read_solids()
+    assert np.array_equal(nids, np.arange(1000001, 1000013))
+    assert np.array_equal(eids, [2000001, 2000002]) and np.array_equal(pids, [1000001, 9])
+    # Geometry of every element is unchanged by the renumbering.
+    assert np.allclose(xyz[conn - 1000001][1], [[1, 0, 0], [2, 0, 0], [2, 1, 0], [1, 1, 0],
+                                                 [1, 0, 1], [2, 0, 1], [2, 1, 1], [1, 1, 1]])
+
+    crlf = tmp_path / "crlf.k"
+    import_gmsh_key(src, crlf, start_nid=1000001, start_eid=2000001, pid_map={7: 1000001}, newline=b"\r\n")
+    lf = tmp_path / "lf.k"
+    import_gmsh_key(src, lf, start_nid=1000001, start_eid=2000001, pid_map={7: 1000001}, newline=b"\n")
+    assert crlf.read_bytes() == lf.read_bytes().replace(b"\n", b"\r\n")
+
+
+def test_compact_nodes_missing_node():
+    with pytest.raises(ValueError):
+        compact_nodes([1, 2, 5], np.zeros((3, 3)), [[1, 2, 3]])
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from lsdyna_py.keyword.writer import write_nodes, write_solid_elements, write_sph_elements
+from lsdyna_py.preprocess.ids import (
+    IdCollisionError, IdRegistry, check_keyword_files, find_collisions, id_runs, keyword_ids,
+)
+
+
+def test_reserve_and_allocate():
+    reg = IdRegistry()
+    reg.reserve("nid", 5000001, 1000, owner="box")
+    reg.reserve("nid", 1, 10, owner="sphere")
+    with pytest.raises(IdCollisionError, match="box"):
+        reg.reserve("nid", 5000500, 10, owner="late")
+    assert reg.owner_of("nid", 5001000) == "box" and reg.owner_of("nid", 5001001) is None
+
+    assert reg.allocate("nid", 5) == 11
+    assert reg.allocate("nid", 100, align=1000000) == 1000001
+    assert reg.allocate("nid", 10, align=1000000, minimum=5000001) == 6000001
+    assert [r[:2] for r in reg.ranges("nid")] == [(1, 11), (11, 16), (1000001, 1000101),
+                                                  (5000001, 5001001), (6000001, 6000011)]
+    assert reg.ranges("eid") == []
+    with pytest.raises(ValueError, match="Unknown ID kind"):
+        reg.reserve("nids", 1, 0)
+
+
+def test_id_runs_and_collisions():
+    assert id_runs([7, 3, 4, 5, 9, 8, 20]) == [(3, 6), (7, 10), (20, 21)]
+    hits = find_collisions({"a": [1, 2, 3, 3], "b": [3, 10], "c": [10, 11]}, "nid")
+    assert sorted((h["a"], h["b"], h["count"], h["first"]) for h in hits) == [
+        ("a", "a", 1, 3), ("a", "b", 1, 3), ("b", "c", 1, 10)]
+
+
+def _deck(path, nids, eids, sph_ids=()):
+    with open(path, "wb") as f:
+        f.write(b"*KEYWORD\n*PART\nplate\n         1         1         1\n*NODE\n")
+        write_nodes(f, nids, np.zeros((len(nids), 3)))
+        f.write(b"*ELEMENT_SOLID\n")
+        write_solid_elements(f, eids, 1, np.ones((len(eids), 8), dtype=np.int64))
+        if len(sph_ids):
+            f.write(b"*ELEMENT_SPH\n")
+            write_sph_elements(f, sph_ids, 2, sph_ids, 1.0e-3)
+        f.write(b"*END\n")
+
+
+def test_check_keyword_files(tmp_path):
+    a, b = tmp_path / "a.k", tmp_path / "b.k"
+    _deck(a, np.arange(1, 101), np.arange(1, 11))
+    _deck(b, np.arange(101, 201), np.arange(1001, 1011), sph_ids=np.arange(5, 8))
+    hits = {(h["kind"], h["count"], h["first"]) for h in check_keyword_files([a, b])}
+    assert hits == {("eid", 3, 5), ("pid", 1, 1)}
+
+    with pytest.raises(IdCollisionError):
+        IdRegistry.from_keyword_files([a, b])
+    reg = IdRegistry.from_keyword_files([a])
+    assert reg.ranges("nid") == [(1, 101, str(a))]
+
+
+def test_keyword_ids_of_free_format_two_card_solids(tmp_path):
+    path = tmp_path / "two_card.k"
+    path.write_text("*KEYWORD\n*NODE\n1,0.0,0.0,0.0\n*ELEMENT_SOLID\n"
+                    "21,1\n1,1,1,1,1,1,1,1\n22,1\n1,1,1,1,1,1,1,1\n23,1\n1,1,1,1,1,1,1,1\n*END\n")
+    assert keyword_ids(path)["eid"].tolist() == [21, 22, 23]
@@ -0,0 +1,95 @@
+import numpy as np
+
+from lsdyna_py.keyword.reader import KeywordFile
+from lsdyna_py.keyword.writer import NODE_CARD, write_nodes, write_solid_elements, write_sph_elements
+from lsdyna_py.preprocess.fem.box import generate_box_mesh
+
+
+def test_roundtrip_of_written_deck(tmp_path):
+    nids, xyz, eids, conn = generate_box_mesh((-2.54, 2.54), (-2.54, 2.54), (-0.635, 0.0),
+                                              5, 4, 3, start_nid=1000001, start_eid=2000001)
+    path = tmp_path / "deck.k"
+    with open(path, "wb") as f:
+        f.write(b"*KEYWORD\n*NODE\n")
+        write_nodes(f, nids, xyz)
+        f.write(b"*ELEMENT_SOLID\n")
+        write_solid_elements(f, eids, 1, conn)
+        f.write(b"*ELEMENT_SPH\n")
+        write_sph_elements(f, [1, 2], 9, [1000001, 1000002], [1.5e-4, -2.0e-3])
+        f.write(b"*END\n")
+
+    with KeywordFile(path) as kf:
+        assert kf.keywords() == ["KEYWORD", "NODE", "ELEMENT_SOLID", "ELEMENT_SPH", "END"]
+        r_nids, r_xyz = kf.read_nodes()
+        r_eids, r_pids, r_conn = kf.read_solids()
+        s_eids, s_pids, s_nids, s_mass = kf.read_sph()
+
+    assert np.array_equal(r_nids, nids)
+    assert np.allclose(r_xyz, xyz, atol=5e-7)
+    assert np.array_equal(r_eids, eids) and np.all(r_pids == 1)
+    assert np.array_equal(r_conn, conn)
+    assert list(s_nids) == [1000001, 1000002] and np.allclose(s_mass, [1.5e-4, -2.0e-3])
+
+
+def test_mixed_formats_comments_and_parts(tmp_path):
+    path = tmp_path / "mixed.k"
+    path.write_bytes(
+        b"*KEYWORD\r\n"
+        b"*PART\r\n"
+        b"$# title\r\n"
+        b"Plate\r\n"
+        b"         1         2         3\r\n"
+        b"*NODE\r\n"
+        b"$#   nid               x               y               z\r\n"
+        b"       1   1.0-3         -2.5D+01                     \r\n"
+        b"2       -.5             3.              1.25E+2\r\n"
+        b"\r\n"
+        b"*ELEMENT_SOLID\r\n"
+        b"10, 2, 1, 2, 3, 4, 5, 6, 7, 8\r\n"
+        b"*NODE\r\n"
+        b"3, 1.5, 2.5, -3.5\r\n"
+        b"*END\r\n"
+    )
+    with KeywordFile(path) as kf:
+        nids, xyz = kf.read_nodes()
+        eids, pids, conn = kf.read_solids()
+        parts = kf.read_parts()
+
+    assert list(nids) == [1, 2, 3]
+    assert np.array_equal(xyz, [[1e-3, -25.0, 0.0], [-0.5, 3.0, 125.0], [1.5, 2.5, -3.5]])
+    assert list(eids) == [10] and list(pids) == [2] and list(conn[0]) == list(range(1, 9))
+    assert parts == [{"title": "Plate", "pid": 1, "secid": 2, "mid": 3, "eosid": 0, "hgid": 0}]
+
+
+def test_two_card_element_solid(tmp_path):
+    path = tmp_path / "two_card.k"
+    path.write_text(
+        "*KEYWORD\n*ELEMENT_SOLID\n"
+        "$#   eid     pid\n"
+        "      11       3\n"
+        "       1       2       3       4       5       6       7       8       0       0\n"
+        "      12       3\n"
+        "       5       6       7       8       9      10      11      12       0       0\n"
+        "*ELEMENT_SOLID\n"
+        "13,4\n"
+        "9,10,11,12,13,14,15,16\n"
+        "$ comment\n"
+        "14,4\n"
+        "17,18,19,20,21,22,23,24,0,0\n"
+        "15, 5\n"
+        "25, 26, 27, 28, 29, 30, 31, 32\n"
+        "*END\n")
+    with KeywordFile(path) as kf:
+        eids, pids, conn = kf.read_solids()
+        assert eids.tolist() == [11, 12, 13, 14, 15] and pids.tolist() == [3, 3, 4, 4, 5]
+        np.testing.assert_array_equal(conn[:, 0], [1, 5, 9, 17, 25])
+        np.testing.assert_array_equal(conn[:, 7], [8, 12, 16, 24, 32])
+        assert kf.read_element_ids("ELEMENT_SOLID").tolist() == [11, 12, 13, 14, 15]
+
+
+def test_free_format_trailing_fields_default_to_zero(tmp_path):
+    path = tmp_path / "free.k"
+    path.write_text("*KEYWORD\n*NODE\n3,1.0,2.0,3.0\n4,1.0,2.0,3.0,7,0\n*END\n")
+    with KeywordFile(path) as kf:
+        nid, _, _, z, tc, rc = kf.read_table("NODE", NODE_CARD + (("i", 8), ("i", 8)))
+    assert nid.tolist() == [3, 4] and z.tolist() == [3.0, 3.0] and tc.tolist() == [0, 7] and rc.tolist() == [0, 0]
@@ -0,0 +1,116 @@
+import io
+
+import numpy as np
+import pytest
+
+from lsdyna_py.keyword.writer import (
+    NODE_CARD, SOLID_CARD, SPH_CARD, node_columns, record_length,
+    write_direct, write_nodes, write_solid_elements, write_sph_elements,
+)
+
+
+def test_record_lengths():
+    assert record_length(NODE_CARD) == 57
+    assert record_length(SOLID_CARD) == 81
+    assert record_length(SPH_CARD) == 41
+
+
+def test_nodes_match_fstring_layout():
+    rng = np.random.default_rng(1)
+    coords = np.concatenate([
+        rng.normal(0.0, 5.0, 3000),
+        rng.uniform(-1e-6, 1e-6, 300),  # rounds to (-)0.000000
+        [0.0, -0.0, 0.0078125, -2.5e-7, 9.9999996, -9999999.9999996, 1e8],
+    ])
+    xyz = np.stack([coords, coords[::-1], np.round(coords, 2)], axis=1)
+    nids = rng.integers(-9999999, 99999999, coords.size)
+
+    f = io.BytesIO()
+    # Small chunks exercise the chunked path as well.
+    write_nodes(f, nids, xyz, chunk_rows=1000)
+    ref = "".join(f"{n:8d}{x:16.6f}{y:16.6f}{z:16.6f}\n"
+                  for n, (x, y, z) in zip(nids.tolist(), xyz.tolist()))
+    assert f.getvalue() == ref.encode()
+
+
+def test_elements_match_fstring_layout():
+    rng = np.random.default_rng(2)
+    eids = np.arange(1000001, 1000501)
+    conn = rng.integers(1, 99999999, (eids.size, 8))
+    f = io.BytesIO()
+    write_solid_elements(f, eids, 7, conn)
+    ref = "".join(f"{e:8d}{7:8d}" + "".join(f"{n:8d}" for n in row) + "\n"
+                  for e, row in zip(eids.tolist(), conn.tolist()))
+    assert f.getvalue() == ref.encode()
+
+    mass = np.where(eids % 2 == 0, 1.234567e-5, 7.8e-3)
+    for m in (mass, 3.25e-4):
+        f = io.BytesIO()
+        write_sph_elements(f, eids, 5000001, eids, m)
+        ref = "".join(f"{e:8d}{5000001:8d}{e:8d}{mm:16.6e}\n"
+                      for e, mm in zip(eids.tolist(), np.broadcast_to(m, eids.shape).tolist()))
+        assert f.getvalue() == ref.encode()
+
+
+def test_overflowing_field_raises():
+    with pytest.raises(ValueError):
+        write_nodes(io.BytesIO(), [123456789], [[0.0, 0.0, 0.0]])
+    with pytest.raises(ValueError):
+        write_nodes(io.BytesIO(), [1], [[1e9, 0.0, 0.0]])
+
+
+@pytest.mark.parametrize("mode", ["wb", "ab", None])
+def test_parallel_output_is_byte_identical(tmp_path, mode):
+    rng = np.random.default_rng(3)
+    nids = np.arange(1, 5001)
+    xyz = rng.normal(0.0, 10.0, (nids.size, 3))
+    serial = io.BytesIO()
+    serial.write(b"*NODE\n")
+    write_nodes(serial, nids, xyz)
+
+    if mode is None:
+        f = io.BytesIO()
+        f.write(b"*NODE\n")
+        write_nodes(f, nids, xyz, chunk_rows=700, workers=2)
+        out = f.getvalue()
+    else:
+        path = tmp_path / "nodes.k"
+        with open(path, mode) as f:
+            f.write(b"*NODE\n")
+            write_nodes(f, nids, xyz, chunk_rows=700, workers=2)
+            f.write(b"*END\n")
+        out = path.read_bytes()
+        assert out.endswith(b"\n*END\n")
+        out = out[:-5]
+    assert out == serial.getvalue()
+
+
+def test_write_direct_matches_stream(tmp_path):
+    nids = np.arange(1, 1001)
+    xyz = np.random.default_rng(4).normal(0.0, 3.0, (nids.size, 3))
+    ref = io.BytesIO()
+    ref.write(b"*NODE\n")
+    write_nodes(ref, nids, xyz)
+    ref.write(b"*END\n")
+
+    path = tmp_path / "direct.k"
+    parts = [b"*NODE\n", (NODE_CARD, nids.size, node_columns(nids, xyz)), b"*END\n"]
+    assert write_direct(path, parts, chunk_rows=300) == len(ref.getvalue())
+    assert path.read_bytes() == ref.getvalue()
+
+
+def test_crlf_rows_match_text_mode_output(tmp_path):
+    nids = np.arange(1, 2001)
+    xyz = np.random.default_rng(5).normal(0.0, 3.0, (nids.size, 3))
+    text = tmp_path / "text.k"
+    with open(text, "w", newline="\r\n") as f:
+        f.write("*NODE\n")
+        f.writelines(f"{n:8d}{x:16.6f}{y:16.6f}{z:16.6f}\n" for n, (x, y, z) in zip(nids.tolist(), xyz.tolist()))
+    for workers in (1, 2):
+        f = io.BytesIO()
+        f.write(b"*NODE\r\n")
+        write_nodes(f, nids, xyz, chunk_rows=700, workers=workers, newline=b"\r\n")
+        assert f.getvalue() == text.read_bytes()
+    parts = [b"*NODE\r\n", (NODE_CARD, nids.size, node_columns(nids, xyz))]
+    write_direct(tmp_path / "direct.k", parts, chunk_rows=700, workers=2, newline=b"\r\n")
+    assert (tmp_path / "direct.k").read_bytes() == text.read_bytes()
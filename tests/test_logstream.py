@@ -0,0 +1,38 @@
+import os
+import sys
+
+from lsdyna_py.runner.dyna_direct import run_lsdyna
+from lsdyna_py.runner.logstream import RotatingLog, stream_process
+
+_FAKE_SOLVER = "import sys\nfor i in range(2000):\n    print(f' cycle {i:8d}')\nsys.exit(2)\n"
+
+
+def test_stream_process_rotates_and_keeps_tail(tmp_path):
+    log = tmp_path / "case.log"
+    seen = []
+    rc, tail = stream_process([sys.executable, "-c", _FAKE_SOLVER], log_file=str(log), log_max_bytes=8000,
+                              log_backups=2, tail_lines=5, echo=False, on_line=seen.append)
+    assert rc == 2 and len(seen) == 2000
+    assert tail == [f" cycle {i:8d}\n" for i in range(1995, 2000)]
+    assert log.stat().st_size <= 8000 and (tmp_path / "case.log.2").exists()
+    assert not (tmp_path / "case.log.3").exists()
+    assert log.read_text().endswith(" cycle     1999\n")
+
+
+def test_rotating_log_counts_bytes_and_flushes_lines(tmp_path):
+    path = tmp_path / "case.log"
+    with RotatingLog(path, max_bytes=100, backups=5) as log:
+        for i in range(20):
+            log.write(f" Energie {i:3d} äöüß σ\n")
+            assert path.read_bytes().endswith(f"{i:3d} äöüß σ{os.linesep}".encode())
+    logs = sorted(tmp_path.glob("case.log*"))
+    assert len(logs) == 5 and all(p.stat().st_size <= 100 for p in logs)
+
+
+def test_run_lsdyna_returns_returncode(tmp_path):
+    (tmp_path / "fake.py").write_text(_FAKE_SOLVER)
+    k = tmp_path / "case.k"
+    k.write_text("*KEYWORD\n*END\n")
+    rc = run_lsdyna(str(k), 1, "10m", dynasolver_path=[sys.executable, str(tmp_path / "fake.py")], echo=False)
+    assert rc == 2
+    assert (tmp_path / "case.log").read_text().count("cycle") == 2000
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+
+from lsdyna_py.keyword.writer import write_nodes
+from lsdyna_py.preprocess.cache import MeshCache, cached_keyword_nodes
+
+
+def test_put_get_and_lru_eviction(tmp_path):
+    cache = MeshCache(tmp_path / "cache", max_bytes=3000)
+    k1 = MeshCache.key_from_params("sph_box", num_x=10, density=7.8)
+    k2 = MeshCache.key_from_params("sph_box", num_x=11, density=7.8)
+    assert k1 == MeshCache.key_from_params("sph_box", density=7.8, num_x=10) and k1 != k2
+
+    calls = []
+    def factory():
+        calls.append(1)
+        return {"xyz": np.arange(300, dtype=np.float64).reshape(100, 3)}
+
+    a = cache.get_or_create(k1, factory)
+    b = cache.get_or_create(k1, factory)
+    assert len(calls) == 1 and isinstance(b["xyz"], np.memmap)
+    assert np.array_equal(a["xyz"], b["xyz"])
+
+    # Each entry is ~2.5 kB, so adding a second one evicts the first.
+    cache.put(k2, {"xyz": np.zeros((100, 3))})
+    assert cache.get(k1) is None and cache.get(k2) is not None
+    assert cache.invalidate(k2) and cache.entries() == []
+
+
+def test_cached_keyword_nodes_follows_file_content(tmp_path):
+    path = tmp_path / "deck.k"
+    def write(xyz):
+        with open(path, "wb") as f:
+            f.write(b"*KEYWORD\n*NODE\n")
+            write_nodes(f, [1, 2], xyz)
+            f.write(b"*END\n")
+
+    cache = MeshCache(tmp_path / "cache")
+    write([[0.0, 0.0, 0.0], [1.0, 2.0, 3.0]])
+    nids, xyz = cached_keyword_nodes(path, cache)
+    assert list(nids) == [1, 2] and np.allclose(xyz[1], [1.0, 2.0, 3.0])
+    assert len(cache.entries()) == 1
+
+    write([[0.0, 0.0, 0.0], [4.0, 5.0, 6.0]])
+    _, xyz = cached_keyword_nodes(path, cache)
+    assert np.allclose(xyz[1], [4.0, 5.0, 6.0]) and len(cache.entries()) == 2
+    assert not any(name.startswith(".") for name in os.listdir(cache.root))
+
+
+def test_put_of_key_stored_by_another_writer_keeps_entry(tmp_path):
+    cache = MeshCache(tmp_path / "c")
+    cache.put("k", {"xyz": np.ones((10, 3))})
+    # Another writer stores "k" again while this one is still writing: its
+    # entry must survive and this put must not fail.
+    cache.invalidate = lambda key: False
+    arrays = cache.put("k", {"xyz": np.ones((10, 3))})
+    assert arrays["xyz"].shape == (10, 3) and [k for k, _, _ in cache.entries()] == ["k"]
+    assert not [n for n in os.listdir(cache.root) if n.startswith(".")]
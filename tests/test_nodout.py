@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from lsdyna_py.postprocess.parsers.nodout import NodoutFile, read_nodout
+
+_COLUMNS = ["x-disp", "y-disp", "z-disp", "x-vel", "y-vel", "z-vel",
+            "x-accl", "y-accl", "z-accl", "x-coor", "y-coor", "z-coor"]
+
+
+def _write_nodout(path, node_ids, times, values, newline="\n"):
+    lines = [" ls-dyna smp d R13.0 date 03/13/2025", ""]
+    for k, t in enumerate(times):
+        lines += ["", f" n o d a l   p r i n t   o u t   f o r   t i m e  s t e p{10 * k + 1:8d}"
+                      f"   ( at time {t:.7E} )", "",
+                  " nodal point" + "".join(f"{c:>12s}" for c in _COLUMNS)]
+        for i, nid in enumerate(node_ids):
+            lines.append(f"{nid:10d}" + "".join(f"{v:12.4E}" for v in values[k, i]))
+        # Rotation table, which the parser skips.
+        lines += ["", " nodal point  x-rot       y-rot       z-rot"]
+        lines += [f"{nid:10d}" + "  0.0000E+00" * 3 for nid in node_ids]
+    path.write_bytes(newline.join(lines + [""]).encode())
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_nodout_layout_and_selection(tmp_path, newline):
+    rng = np.random.default_rng(0)
+    node_ids = np.array([7, 3, 105, 42])
+    times = np.arange(6) * 1.0e-5
+    values = np.round(rng.normal(size=(6, 4, 12)), 3)
+    path = tmp_path / "nodout"
+    _write_nodout(path, node_ids, times, values, newline)
+
+    with NodoutFile(path) as nf:
+        assert nf.fields[:3] == ("x_disp", "y_disp", "z_disp") and len(nf.fields) == 12
+        np.testing.assert_array_equal(nf.node_ids, node_ids)
+        np.testing.assert_array_equal(nf.steps, 10 * np.arange(6) + 1)
+        np.testing.assert_allclose(nf.times, times)
+
+        t, data = nf.read()
+        assert data.shape == (6, 4, 12)
+        np.testing.assert_allclose(data, values)
+
+        t, data = nf.read(nodes=[42, 7], t_min=2e-5, t_max=4e-5, fields=["z-disp", "x_coor"])
+        np.testing.assert_allclose(t, times[2:5])
+        np.testing.assert_allclose(data, values[2:5][:, [3, 0]][:, :, [2, 9]])
+
+        chunks = list(nf.iter_chunks(4, fields=["z_vel"]))
+        assert [c.shape for _, c in chunks] == [(4, 4, 1), (2, 4, 1)]
+        np.testing.assert_allclose(np.concatenate([c for _, c in chunks]), values[:, :, 5:6])
+
+        with pytest.raises(KeyError):
+            nf.read(nodes=[8])
+
+
+def test_read_nodout_helper(tmp_path):
+    values = np.ones((2, 1, 12))
+    _write_nodout(tmp_path / "nodout", [1], [0.0, 1.0], values)
+    times, nids, data, fields = read_nodout(tmp_path / "nodout", fields=["y_vel"])
+    assert nids.tolist() == [1] and fields == ("y_vel",) and data.shape == (2, 1, 1)
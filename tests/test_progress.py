@@ -0,0 +1,87 @@
+import json
+import sys
+
+from lsdyna_py.runner.progress import FileTail, ProgressMonitor, format_progress, termination_time
+from lsdyna_py.runner.scheduler import FAILED, Job, run_jobs
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_file_tail_reads_only_new_complete_lines(tmp_path):
+    path = tmp_path / "messag"
+    tail = FileTail(path)
+    assert tail.read_lines() == []
+    path.write_bytes(b"a\nb")
+    assert tail.read_lines() == ["a"]
+    with open(path, "ab") as f:
+        f.write(b"c\nd\n")
+    assert tail.read_lines() == ["bc", "d"] and tail.read_lines() == []
+    path.write_bytes(b"new\n")                 # truncated by a restart
+    assert tail.read_lines() == ["new"]
+
+
+def test_progress_monitor_eta_and_stall(tmp_path):
+    k = tmp_path / "case.k"
+    k.write_text("*KEYWORD\n*CONTROL_TERMINATION\n$#  endtim\n  1.00E-04         0\n*END\n")
+    assert termination_time(k) == 1.0e-4
+
+    clock, seen = _Clock(), []
+    status = tmp_path / "progress.json"
+    mon = ProgressMonitor(tmp_path, termination_time(k), callback=seen.append, status_file=str(status),
+                          stall_seconds=60, publish_interval=0.0, clock=clock)
+    mon.feed(" *** termination time reached ***\n")
+    mon.feed("        0 t 0.0000E+00 dt 5.00E-08 flush i/o buffers   03/13/25 10:00:00\n")
+    clock.now += 10
+    mon.feed("     1000 t 2.5000E-05 dt 5.00E-08 write d3plot file   03/13/25 10:00:10\n")
+    p = mon.progress
+    assert (p.cycle, p.time, p.dt) == (1000, 2.5e-5, 5.0e-8)
+    assert abs(p.fraction - 0.25) < 1e-12 and abs(p.eta_seconds - 30.0) < 1e-6
+    assert json.loads(status.read_text())["cycle"] == 1000
+    assert "25.0%" in format_progress(p) and "ETA 0:00:30" in format_progress(p)
+
+    # messag is tailed by poll(); a repeated cycle does not count as progress.
+    (tmp_path / "messag").write_text("     1000 t 2.5000E-05 dt 5.00E-08 write d3plot file\n")
+    clock.now += 61
+    assert mon.poll().stalled and seen[-1].stalled
+    with open(tmp_path / "messag", "a") as f:
+        f.write("     2000 t 5.0000E-05 dt 5.00E-08 write d3plot file\n")
+    assert not mon.poll().stalled and mon.progress.cycle == 2000
+
+
+def test_progress_monitor_rerun_over_stale_messag(tmp_path):
+    clock = _Clock()
+    messag = tmp_path / "messag"
+    messag.write_text("    50000 t 1.0000E-04 dt 2.00E-09 write d3plot file\n")
+    mon = ProgressMonitor(tmp_path, 1e-4, stall_seconds=60, publish_interval=0.0, clock=clock)
+    assert mon.poll().cycle == 50000
+
+    # The rerun rewrites messag from cycle 100: the old final cycle is forgotten.
+    messag.write_text("      100 t 2.0000E-07 dt 2.00E-09 write d3plot file\n")
+    clock.now += 30
+    assert mon.poll().cycle == 100
+    for cycle in range(200, 10000, 100):
+        with open(messag, "a") as f:
+            f.write(f"{cycle:9d} t {cycle * 2e-9:.4E} dt 2.00E-09 write d3plot file\n")
+        clock.now += 30
+        p = mon.poll()
+    assert (p.cycle, p.stalled) == (9900, False)
+
+    # Started from the end of the files, leftovers are not parsed at all.
+    fresh = ProgressMonitor(tmp_path, 1e-4, publish_interval=0.0, clock=clock, from_start=False)
+    assert fresh.poll().cycle == 0
+
+
+def test_scheduler_kills_stalled_job(tmp_path):
+    solver = tmp_path / "hang.py"
+    solver.write_text("import time\nprint('     1 t 0.0E+00 dt 1.0E-08', flush=True)\ntime.sleep(30)\n")
+    (tmp_path / "case.k").write_text("*KEYWORD\n*END\n")
+    jobs = run_jobs([Job(str(tmp_path / "case.k"), name="hang")], total_cpus=1,
+                    dynasolver_path=[sys.executable, str(solver)], stall_seconds=0.5, poll_interval=0.1)
+    assert jobs[0].status == FAILED and jobs[0].error.startswith("stalled")
+    assert json.loads((tmp_path / "case.progress.json").read_text())["stalled"]
@@ -0,0 +1,121 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from lsdyna_py.keyword.reader import KeywordFile
+from lsdyna_py.keyword.writer import NODE_CARD, write_nodes, write_solid_elements, write_sph_elements
+from lsdyna_py.preprocess.fem.box import generate_box_mesh
+from lsdyna_py.preprocess.renumber import (_bfs, bandwidth, morton_order, node_graph, renumber_keyword_file,
+                                           renumber_mesh)
+
+
+def _shuffled_box(seed=0):
+    nids, xyz, eids, conn = generate_box_mesh((0, 2), (0, 1), (0, 0.2), 12, 6, 2, start_nid=1001)
+    p = np.random.default_rng(seed).permutation(nids.size)
+    return nids, xyz[p], np.argsort(p)[conn - 1001] + 1001
+
+
+def _cuthill_mckee_reference(indptr, indices, start):
+    degree = np.diff(indptr)
+    seen, order, queue = {start}, [], deque([start])
+    while queue:
+        v = queue.popleft()
+        order.append(v)
+        for w in sorted(indices[indptr[v]:indptr[v + 1]], key=lambda w: (degree[w], w)):
+            if w not in seen:
+                seen.add(w)
+                queue.append(w)
+    return np.array(order)
+
+
+def test_level_synchronous_cm_matches_sequential():
+    nids, xyz, conn = _shuffled_box()
+    indptr, indices = node_graph(conn - 1001, nids.size)
+    levels = _bfs(indptr, indices, np.diff(indptr), 5, np.zeros(nids.size, bool), ordered=True)
+    assert np.array_equal(np.concatenate(levels), _cuthill_mckee_reference(indptr, indices, 5))
+
+
+def test_renumber_mesh_rcm_and_morton():
+    nids, xyz, conn = _shuffled_box()
+    sets = np.array([1001, 1050, 1100])
+    for method in ("rcm", "morton"):
+        new_nids, new_xyz, new_conn, elem_order, (new_sets,) = renumber_mesh(nids, xyz, conn, method, [sets])
+        assert np.array_equal(new_nids, nids)
+        # Same elements, same geometry, same set members.
+        assert np.array_equal(new_xyz[new_conn - 1001], xyz[conn[elem_order] - 1001])
+        assert np.array_equal(new_xyz[new_sets - 1001], xyz[sets - 1001])
+    _, _, rcm_conn, _, _ = renumber_mesh(nids, xyz, conn, "rcm")
+    assert bandwidth(rcm_conn) < bandwidth(conn) // 4
+
+
+def test_morton_order_quadrants():
+    xyz = np.array([[1.0, 1, 1], [0, 0, 0], [1, 0, 0], [0, 0, 1]])
+    assert np.array_equal(morton_order(xyz), [1, 3, 2, 0])
+
+
+def test_renumber_keyword_file(tmp_path):
+    nids, xyz, conn = _shuffled_box()
+    xyz = np.round(xyz, 6)
+    eids = np.arange(1, conn.shape[0] + 1)
+    src, dst = tmp_path / "in.k", tmp_path / "out.k"
+    with open(src, "wb") as f:
+        f.write(b"*KEYWORD\n*PART\nbox\n         1         1         1\n*NODE\n")
+        write_nodes(f, nids, xyz)
+        write_nodes(f, [9001, 9002], [[5.0, 5, 5], [6.0, 6, 6]])
+        f.write(b"*ELEMENT_SOLID\n")
+        write_solid_elements(f, eids, 1, conn)
+        f.write(b"*ELEMENT_SPH\n")
+        write_sph_elements(f, [501, 502], 2, [9002, 9001], 0.5)
+        f.write(b"*SET_NODE_LIST\n         7\n      1001      1002      9001\n")
+        f.write(b"*SET_NODE_LIST_TITLE\nback\n         8\n      9002\n*END\n")
+
+    info = renumber_keyword_file(src, dst)
+    assert info["bandwidth_after"] < info["bandwidth_before"]
+    with KeywordFile(dst) as kf:
+        assert kf.keywords() == ["KEYWORD", "PART", "NODE", "ELEMENT_SOLID", "ELEMENT_SPH", "SET_NODE_LIST",
+                                 "SET_NODE_LIST_TITLE", "END"]
+        assert kf.read_parts()[0]["pid"] == 1
+        new_nids, new_xyz = kf.read_nodes()
+        _, _, new_conn = kf.read_solids()
+        _, _, sph_nids, _ = kf.read_sph()
+        members = [int(v) for line in kf.block_lines("SET_NODE_LIST") for v in line.split()][1:]
+        titled = list(kf.block_lines("SET_NODE_LIST_TITLE"))
+    coords = dict(zip(new_nids.tolist(), map(tuple, new_xyz)))
+    assert sorted(coords) == sorted(nids.tolist() + [9001, 9002])
+    assert sorted(coords[n] for n in sph_nids) == [(5.0, 5, 5), (6.0, 6, 6)]
+    assert [coords[n] for n in members if n] == [tuple(xyz[0]), tuple(xyz[1]), (5.0, 5, 5)]
+    assert titled[0] == "back" and [coords[int(n)] for n in titled[2].split() if int(n)] == [(6.0, 6, 6)]
+
+
+def test_renumber_keyword_file_refuses_unmapped_id_references(tmp_path):
+    src, dst = tmp_path / "in.k", tmp_path / "out.k"
+    with open(src, "wb") as f:
+        f.write(b"*KEYWORD\n*NODE\n")
+        write_nodes(f, [1, 2], [[4.0, 0, 0], [1.0, 0, 0]])
+        f.write(b"*BOUNDARY_SPC_NODE\n         1         0         1         1         1\n*END\n")
+    with pytest.raises(ValueError, match="BOUNDARY_SPC_NODE"):
+        renumber_keyword_file(src, dst)
+    assert not dst.exists()
+
+
+def test_renumber_keyword_file_keeps_constraints_and_crlf(tmp_path):
+    nids, xyz, conn = _shuffled_box()
+    xyz = np.round(xyz, 6)
+    tc = np.where(xyz[:, 2] == xyz[:, 2].min(), 7, 0)           # bottom face fixed
+    lines = [f"{n:8d}{x:16.6f}{y:16.6f}{z:16.6f}" + (f"{t:8d}{0:8d}" if t else "")
+             for n, (x, y, z), t in zip(nids.tolist(), xyz.tolist(), tc.tolist())]
+    src, dst = tmp_path / "in.k", tmp_path / "out.k"
+    text = "*KEYWORD\n*NODE\n" + "\n".join(lines) + "\n*ELEMENT_SOLID\n"
+    text += "".join(f"{e:8d}{1:8d}" + "".join(f"{n:8d}" for n in row) + "\n"
+                    for e, row in enumerate(conn.tolist(), start=1))
+    text += "*SET_NODE_LIST_TITLE\nbottom\n         7\n      1001\n*END\n"
+    src.write_bytes(text.replace("\n", "\r\n").encode())
+
+    renumber_keyword_file(src, dst)
+    out = dst.read_bytes()
+    assert out.count(b"\n") == out.count(b"\r\n")
+    with KeywordFile(dst) as kf:
+        new_nids, x, y, z, new_tc, _ = kf.read_table("NODE", NODE_CARD + (("i", 8), ("i", 8)))
+    fixed = {tuple(p) for p in xyz[tc == 7]}
+    assert {(a, b, c) for a, b, c, t in zip(x, y, z, new_tc) if t == 7} == fixed
@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+
+from lsdyna_py.runner.dyna_direct import build_command
+from lsdyna_py.runner.restart import Stage, find_restart_file, run_pipeline, run_with_restarts
+
+# Fake solver: logs its arguments; a full run "crashes" after writing
+# d3dump01, a restart writes the next dump and terminates normally.
+_FAKE_SOLVER = """
+import json, os, sys
+args = dict(a.split("=", 1) for a in sys.argv[1:])
+with open(os.path.join(os.path.dirname(__file__), "calls.jsonl"), "a") as f:
+    f.write(json.dumps(args) + "\\n")
+dumps = sorted(n for n in os.listdir(".") if n.startswith("d3dump"))
+open(f"d3dump{len(dumps) + 1:02d}", "w").close()
+sys.exit(0 if "R" in args else 7)
+"""
+
+
+def _calls(tmp_path):
+    return [json.loads(l) for l in (tmp_path / "calls.jsonl").read_text().splitlines()]
+
+
+def _setup(tmp_path):
+    (tmp_path / "fake.py").write_text(_FAKE_SOLVER)
+    run = tmp_path / "run"
+    run.mkdir()
+    (run / "case.k").write_text("*KEYWORD\n*END\n")
+    return [sys.executable, str(tmp_path / "fake.py")], run
+
+
+def test_build_command_plain_restart():
+    assert build_command(None, 4, "100m", "d3dump03", "dyna") == ["dyna", "ncpu=4", "memory=100m", "R=d3dump03"]
+
+
+def test_find_restart_file_groups_mpp_ranks(tmp_path):
+    for name, age in (("d3dump01.0000", 30), ("d3dump01.0001", 20), ("runrsf", 25), ("d3plot", 0)):
+        (tmp_path / name).touch()
+        os.utime(tmp_path / name, (1000 - age, 1000 - age))
+    assert find_restart_file(tmp_path) == "d3dump01"
+    assert find_restart_file(tmp_path, since=2000) is None
+
+
+def test_run_with_restarts_relaunches_from_newest_dump(tmp_path):
+    solver, run = _setup(tmp_path)
+    rc, attempts = run_with_restarts(str(run / "case.k"), 2, "100m", dynasolver_path=solver, echo=False)
+    assert rc == 0 and [a["returncode"] for a in attempts] == [7, 0]
+    calls = _calls(tmp_path)
+    assert "i" in calls[0] and "R" not in calls[0]
+    assert calls[1] == {"ncpu": "2", "memory": "100m", "R": "d3dump01"}
+    assert (run / "case.log").exists()
+
+
+def test_run_pipeline_chains_stages(tmp_path):
+    solver, run = _setup(tmp_path)
+    (run / "change.k").write_text("*KEYWORD\n*CHANGE_BOUNDARY_CONDITION\n*END\n")
+    results = run_pipeline([Stage(str(run / "case.k")), Stage(str(run / "change.k"), name="reload", ncpu=4)],
+                           2, "100m", str(run), max_restarts=1, dynasolver_path=solver, echo=False)
+    assert [r["returncode"] for r in results] == [0, 0]
+    calls = _calls(tmp_path)
+    assert [c.get("R") for c in calls] == [None, "d3dump01", "d3dump02"]
+    assert calls[2]["i"].endswith("change.k") and calls[2]["ncpu"] == "4"
@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+
+from lsdyna_py.runner.dyna_direct import run_lsdyna
+from lsdyna_py.runner.result_cache import ResultCache, include_files, run_key
+
+# Fake solver: counts its calls (outside the run directory) and writes d3plot.
+_FAKE_SOLVER = """
+import os, sys
+args = dict(a.split("=", 1) for a in sys.argv[1:])
+with open(os.path.join(os.path.dirname(__file__), "calls.txt"), "a") as f:
+    f.write(args["i"] + "\\n")
+open("d3plot", "w").write("states of " + open(args["i"]).read())
+"""
+
+
+def _deck(d, mat="7.85"):
+    (d / "inc").mkdir(parents=True, exist_ok=True)
+    (d / "case.k").write_text("*KEYWORD\n*INCLUDE_PATH_RELATIVE\ninc\n*INCLUDE\nmesh.k\n*END\n")
+    (d / "inc" / "mesh.k").write_text("*KEYWORD\n*INCLUDE\nmat.k\n*END\n")
+    (d / "inc" / "mat.k").write_text(f"*KEYWORD\n$ rho {mat}\n*END\n")
+    return d / "case.k"
+
+
+def test_include_files_and_run_key(tmp_path):
+    k = _deck(tmp_path / "a")
+    assert [p.replace("\\", "/").split("/a/")[1] for p in include_files(k)] == ["case.k", "inc/mesh.k", "inc/mat.k"]
+    key = run_key(k, 8, "4000m", "lsdyna_dp.exe")
+    assert run_key(_deck(tmp_path / "b"), 8, "4000m", "lsdyna_dp.exe") == key
+    assert run_key(k, 4, "4000m", "lsdyna_dp.exe") != key
+    assert run_key(_deck(tmp_path / "c", mat="2.70"), 8, "4000m", "lsdyna_dp.exe") != key
+
+
+def test_run_lsdyna_reuses_cached_result(tmp_path):
+    solver = [sys.executable, str(tmp_path / "fake.py")]
+    (tmp_path / "fake.py").write_text(_FAKE_SOLVER)
+    cache = ResultCache(tmp_path / "store")
+    k1, k2 = _deck(tmp_path / "run1"), _deck(tmp_path / "run2")
+
+    assert run_lsdyna(str(k1), 2, "100m", dynasolver_path=solver, echo=False, cache=cache) == 0
+    assert run_lsdyna(str(k2), 2, "100m", dynasolver_path=solver, echo=False, cache=cache) == 0
+    assert (tmp_path / "calls.txt").read_text().count("\n") == 1
+    assert (tmp_path / "run2" / "d3plot").read_text() == (tmp_path / "run1" / "d3plot").read_text()
+    assert cache.get(cache.entries()[0][0])["files"] == ["d3plot"]     # not the runner's log
+    stored = os.path.join(cache.root, cache.entries()[0][0], "d3plot")
+    with open(tmp_path / "run2" / "d3plot", "a") as f:                  # outputs are copies
+        f.write("appended by a later run")
+    assert "appended" not in open(stored).read()
+
+    # Another ncpu is a different run.
+    run_lsdyna(str(k2), 4, "100m", dynasolver_path=solver, echo=False, cache=cache)
+    assert (tmp_path / "calls.txt").read_text().count("\n") == 2
+
+
+def test_restart_runs_are_keyed_by_dump_content(tmp_path):
+    solver = [sys.executable, str(tmp_path / "fake.py")]
+    (tmp_path / "fake.py").write_text(_FAKE_SOLVER)
+    cache = ResultCache(tmp_path / "store")
+    k1, k2 = _deck(tmp_path / "case1"), _deck(tmp_path / "case2")
+    (tmp_path / "case1" / "d3dump01").write_bytes(b"state of case 1")
+    (tmp_path / "case2" / "d3dump01").write_bytes(b"state of case 2")
+    key = run_key(k1, 8, "4000m", "lsdyna_dp.exe", "d3dump01")
+    assert run_key(k2, 8, "4000m", "lsdyna_dp.exe", "d3dump01") != key
+    (tmp_path / "case1" / "d3dump01.0001").write_bytes(b"rank 1")
+    assert run_key(k1, 8, "4000m", "lsdyna_dp.exe", "d3dump01") != key
+
+    for k in (k1, k2):
+        run_lsdyna(str(k), 2, "100m", dump_file="d3dump01", dynasolver_path=solver, echo=False, cache=cache)
+    assert (tmp_path / "calls.txt").read_text().count("\n") == 2
+
+
+def test_result_cache_lru_eviction(tmp_path):
+    work = tmp_path / "w"
+    work.mkdir()
+    (work / "d3plot").write_bytes(b"x" * 1000)
+    cache = ResultCache(tmp_path / "store", max_bytes=2500)
+    for key in ("a", "b"):
+        cache.put(key, work, ["d3plot"])
+    # Make "b" the least recently used entry.
+    os.utime(os.path.join(cache.root, "b", "meta.json"), (time.time() - 100,) * 2)
+    cache.put("c", work, ["d3plot"])
+    assert sorted(k for k, _, _ in cache.entries()) == ["a", "c"]
+    assert cache.materialize("b", work) is None and cache.materialize("a", tmp_path / "out") == ["d3plot"]
+
+
+def test_result_cache_put_of_key_stored_by_another_writer(tmp_path):
+    work = tmp_path / "w"
+    work.mkdir()
+    (work / "d3plot").write_bytes(b"x" * 100)
+    cache = ResultCache(tmp_path / "store")
+    cache.put("k", work, ["d3plot"])
+    cache.invalidate = lambda key: False       # the other writer's entry stays in place
+    cache.put("k", work, ["d3plot"])
+    assert cache.materialize("k", tmp_path / "out") == ["d3plot"]
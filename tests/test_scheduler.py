@@ -0,0 +1,101 @@
+import asyncio
+import json
+import sys
+import textwrap
+from pathlib import Path
+
+from lsdyna_py.runner.scheduler import DONE, FAILED, Job, Scheduler, memory_words, run_jobs
+
+# Fake solver: sleeps, logs its interval, and fails when the deck says so.
+# "flaky" fails on the first attempt only.
+_FAKE_SOLVER = textwrap.dedent("""
+    import json, os, sys, time
+    args = dict(a.split("=", 1) for a in sys.argv[1:])
+    deck = open(args["i"]).read()
+    t0 = time.time()
+    time.sleep(0.15)
+    with open(os.path.join(os.path.dirname(args["i"]), "..", "events.jsonl"), "a") as f:
+        f.write(json.dumps({"k": args["i"], "ncpu": int(args["ncpu"]), "t0": t0, "t1": time.time()}) + "\\n")
+    print("cycle output for", args["i"])
+    if "fail" in deck or ("flaky" in deck and not os.path.exists(args["i"] + ".seen")):
+        open(args["i"] + ".seen", "w").close()
+        sys.exit(3)
+""")
+
+
+def _setup(tmp_path, decks):
+    solver = tmp_path / "fake_solver.py"
+    solver.write_text(_FAKE_SOLVER)
+    jobs = []
+    for name, (ncpu, text, priority) in decks.items():
+        d = tmp_path / name
+        d.mkdir()
+        (d / "case.k").write_text(text)
+        jobs.append(Job(str(d / "case.k"), ncpu=ncpu, memory="1000m", priority=priority, name=name,
+                        max_retries=1))
+    return [sys.executable, str(solver)], jobs
+
+
+def _events(tmp_path):
+    return [json.loads(l) for l in (tmp_path / "events.jsonl").read_text().splitlines()]
+
+
+def test_memory_words():
+    assert memory_words("4000m") == 4 * 10 ** 9 and memory_words("2g") == memory_words(2 * 10 ** 9)
+
+
+def test_scheduler_budget_priority_retry(tmp_path):
+    solver, jobs = _setup(tmp_path, {"a": (2, "ok", 0), "b": (2, "ok", 0), "c": (1, "flaky", 5),
+                                     "d": (3, "ok", 0), "e": (1, "fail", 0)})
+    jobs = run_jobs(jobs, total_cpus=4, total_memory="4000m", dynasolver_path=solver)
+    status = {j.name: (j.status, j.attempts) for j in jobs}
+    assert status == {"a": (DONE, 1), "b": (DONE, 1), "c": (DONE, 2), "d": (DONE, 1), "e": (FAILED, 2)}
+    assert "cycle output" in open(jobs[0].log_file).read()
+
+    events = _events(tmp_path)
+    for e in events:
+        busy = sum(o["ncpu"] for o in events if o["t0"] <= e["t0"] < o["t1"])
+        assert busy <= 4
+
+
+def test_scheduler_priority_order(tmp_path):
+    solver, jobs = _setup(tmp_path, {"a": (2, "ok", 0), "b": (2, "ok", 1), "c": (2, "ok", 2)})
+    run_jobs(jobs, total_cpus=3, dynasolver_path=solver)
+    assert [Path(e["k"]).parent.name for e in _events(tmp_path)] == ["c", "b", "a"]
+
+
+def test_scheduler_resumes_from_state(tmp_path):
+    solver, jobs = _setup(tmp_path, {"a": (1, "ok", 0), "b": (1, "ok", 0)})
+    state = tmp_path / "state.json"
+    done = Job(jobs[0].k_file, name="a", status=DONE, attempts=1, returncode=0)
+    Scheduler([done], 1, state_file=str(state)).save_state()
+
+    jobs = run_jobs(jobs, total_cpus=1, state_file=str(state), dynasolver_path=solver)
+    assert [j.status for j in jobs] == [DONE, DONE]
+    assert [Path(e["k"]).parent.name == "b" for e in _events(tmp_path)] == [True]
+    assert [d["status"] for d in json.loads(state.read_text())["jobs"]] == [DONE, DONE]
+
+
+def test_scheduler_survives_job_exception(tmp_path):
+    solver, jobs = _setup(tmp_path, {"good": (1, "ok", 0), "bad": (1, "ok", 0)})
+
+    class Broken(Scheduler):
+        async def _run_job(self, job):
+            if job.name == "bad":
+                raise ValueError("malformed deck")
+            return await super()._run_job(job)
+
+    jobs = asyncio.run(Broken(jobs, total_cpus=2, dynasolver_path=solver).run())
+    status = {j.name: (j.status, j.attempts) for j in jobs}
+    assert status == {"good": (DONE, 1), "bad": (FAILED, 2)}
+    assert "malformed deck" in jobs[1].error
+
+
+def test_scheduler_job_logs_rotate(tmp_path):
+    solver, jobs = _setup(tmp_path, {"e": (1, "fail", 0)})
+    jobs[0].max_retries = 2
+    jobs = run_jobs(jobs, total_cpus=1, dynasolver_path=solver, log_max_bytes=1, log_backups=1)
+    assert jobs[0].attempts == 3
+    log = Path(jobs[0].log_file)
+    assert log.read_text().count("cycle output") == 1 and "cycle output" in Path(f"{log}.1").read_text()
+    assert not Path(f"{log}.2").exists()
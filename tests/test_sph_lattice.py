@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from lsdyna_py.preprocess.sph.lattice import cell_for_spacing, lattice_fill, sphere_particles
+
+
+def _loop_sphere(center, r, n):
+    cx, cy, cz = center
+    d = 2.0 * r / n
+    out = []
+    for i in range(n):
+        for j in range(n):
+            for k in range(n):
+                x, y, z = cx - r + (i + 0.5) * d, cy - r + (j + 0.5) * d, cz - r + (k + 0.5) * d
+                if (x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2 <= r ** 2:
+                    out.append((x, y, z))
+    return np.array(out)
+
+
+def test_cubic_sphere_matches_script_loop():
+    xyz, mass = sphere_particles((0.0, 0.0, 0.251), 0.25, (15, 15, 15), density=7.8, slab_rows=100)
+    assert np.array_equal(xyz, _loop_sphere((0.0, 0.0, 0.251), 0.25, 15))
+    assert mass == 7.8 * (0.5 / 15) ** 3
+
+
+@pytest.mark.parametrize("lattice, neighbours", [("cubic", 6), ("bcc", 8), ("fcc", 12), ("hcp", 12)])
+def test_packings_have_expected_spacing_and_order(lattice, neighbours):
+    xyz = lattice_fill((0.0, 0.0, 0.0), cell_for_spacing(1.0, lattice), (4, 3, 3), lattice)
+    d = np.sqrt(((xyz[:, None] - xyz[None]) ** 2).sum(-1))
+    np.fill_diagonal(d, np.inf)
+    assert d.min() == pytest.approx(1.0)
+    assert np.isclose(d, 1.0).sum(axis=1).max() == neighbours
+    # X -> Y -> Z order.
+    assert np.array_equal(np.lexsort(xyz.T[::-1]), np.arange(len(xyz)))
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from lsdyna_py.preprocess.sph.lattice import lattice_fill
+from lsdyna_py.preprocess.sph.sdf import Box, Cone, Cylinder, Sphere, plate_with_hole, sdf_particles
+
+SHAPES = [
+    plate_with_hole((-1.0, -1.0, -0.3), (1.0, 1.0, 0.0), (0.2, -0.1), 0.4),
+    (Sphere((0.0, 0.0, 0.25), 0.25) | Cone((0.0, 0.0, 0.45), 0.25, 0.4)) - Cylinder((0.0, 0.0, 0.0), 0.1, 1.0),
+    Box((0.0, 0.0, 0.0), (1.0, 1.0, 1.0)) & Sphere((1.0, 1.0, 1.0), 1.2),
+]
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("lattice", ["cubic", "fcc"])
+def test_block_pruning_matches_full_evaluation(shape, lattice):
+    cell = 0.04
+    xyz, mass = sdf_particles(shape, cell, lattice=lattice, density=2.0, block_cells=4)
+
+    lo, hi = shape.bounds
+    n_cells = tuple(int(np.ceil((h - l) / cell - 1e-9)) for l, h in zip(lo, hi))
+    ref = lattice_fill(lo, (cell,) * 3, n_cells, lattice,
+                       inside=lambda x, y, z: shape(x, y, z) <= 0.0)
+    assert len(xyz) > 0 and np.array_equal(xyz, ref)
+    assert mass == pytest.approx(2.0 * cell ** 3 / (1 if lattice == "cubic" else 4))
+
+
+def test_plate_with_hole_volume():
+    plate = plate_with_hole((-1.0, -1.0, 0.0), (1.0, 1.0, 0.2), (0.0, 0.0), 0.5)
+    xyz, _ = sdf_particles(plate, 0.01)
+    assert not np.any(np.hypot(xyz[:, 0], xyz[:, 1]) < 0.5)
+    volume = len(xyz) * 0.01 ** 3
+    assert volume == pytest.approx(0.2 * (4.0 - np.pi * 0.25), rel=1e-2)
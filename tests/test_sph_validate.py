@@ -0,0 +1,40 @@
+import numpy as np
+
+from lsdyna_py.preprocess.sph.sdf import Sphere
+from lsdyna_py.preprocess.sph.validate import check_parts, close_pairs, exclusion_mask, min_spacing
+
+
+def _brute_pairs(a, b, cutoff):
+    d = np.sqrt(((a[:, None] - b[None]) ** 2).sum(-1))
+    return set(zip(*np.nonzero(d < cutoff)))
+
+
+def test_close_pairs_match_brute_force():
+    rng = np.random.default_rng(0)
+    a = rng.uniform(0.0, 1.0, (1500, 3))
+    b = rng.uniform(0.5, 1.5, (1200, 3))
+    i, j, d = close_pairs(a, b, 0.06, chunk=400)
+    assert set(zip(i, j)) == _brute_pairs(a, b, 0.06)
+    assert np.allclose(d, np.linalg.norm(a[i] - b[j], axis=1))
+
+    # Self search: every pair exactly once.
+    i, j, _ = close_pairs(a, None, 0.06, chunk=400)
+    ref = {(p, q) for p, q in _brute_pairs(a, a, 0.06) if p < q}
+    assert len(i) == len(ref) and set(zip(np.minimum(i, j), np.maximum(i, j))) == ref
+    d, p, q = min_spacing(a, cutoff=0.06)
+    assert d == np.linalg.norm(a[p] - a[q])
+
+
+def test_check_parts_and_exclusion_zone():
+    g = (np.arange(10) + 0.5) * 0.1
+    box = np.stack(np.meshgrid(g, g, g - 1.0, indexing="ij"), axis=-1).reshape(-1, 3)
+    far = np.array([[0.5, 0.5, 5.0]])
+    touching = np.array([[0.55, 0.55, 0.0]])  # 0.05 above the top layer
+    assert check_parts({"box": box, "far": far}, 0.1) == []
+    (r,) = check_parts({"box": box, "proj": touching}, 0.1)
+    assert (r["a"], r["b"], r["n_close_a"]) == ("box", "proj", 1)
+    assert np.isclose(r["min_distance"], 0.05)
+
+    zone = exclusion_mask(box, Sphere((0.5, 0.5, 0.0), 0.3), clearance=0.05)
+    dist = np.linalg.norm(box - [0.5, 0.5, 0.0], axis=1)
+    assert np.array_equal(zone, dist - 0.3 < 0.05)
@@ -0,0 +1,27 @@
+import os
+import time
+
+from lsdyna_py.store import DirectoryStore
+
+
+class _TextStore(DirectoryStore):
+    def put(self, key, text):
+        with self._staging() as tmp:
+            with open(os.path.join(tmp, "text.txt"), "w") as f:
+                f.write(text)
+            self._commit(tmp, key, {"bytes": len(text)})
+
+
+def test_directory_store_lru_and_invalidate(tmp_path):
+    store = _TextStore(tmp_path / "s", max_bytes=25)
+    store.put("a", "x" * 10)
+    store.put("b", "y" * 10)
+    os.utime(os.path.join(store.root, "a", "meta.json"), (time.time() - 100,) * 2)
+    store.put("c", "z" * 10)
+    assert sorted(k for k, _, _ in store.entries()) == ["b", "c"] and store.size_bytes() == 20
+
+    store.put("c", "other writer")                     # the first writer of a key wins
+    assert open(os.path.join(store.root, "c", "text.txt")).read() == "z" * 10
+    assert store.invalidate("b") and not store.invalidate("b")
+    store.clear()
+    assert store.entries() == [] and os.listdir(store.root) == []
@@ -0,0 +1,68 @@
+import io
+
+from lsdyna_py.keyword.writer import write_nodes, write_solid_elements
+from lsdyna_py.preprocess.fem.box import generate_box_mesh
+from lsdyna_py.preprocess.streaming import write_fem_box, write_sph_box
+
+
+def test_streamed_fem_box_matches_in_memory(tmp_path):
+    args = ((-2.54, 2.54), (-2.54, 2.54), (-0.635, 0.0), 6, 5, 4)
+    out = tmp_path / "box.k"
+    # slab_rows smaller than one X-plane -> one plane per slab.
+    n_nodes, n_elems = write_fem_box(out, *args, part_id=3, start_nid=11, start_eid=21, slab_rows=7)
+
+    nids, xyz, eids, conn = generate_box_mesh(*args, start_nid=11, start_eid=21)
+    ref = io.BytesIO()
+    ref.write(b"*KEYWORD\n*NODE\n")
+    write_nodes(ref, nids, xyz)
+    ref.write(b"*ELEMENT_SOLID\n")
+    write_solid_elements(ref, eids, 3, conn)
+    ref.write(b"*END\n")
+
+    assert (n_nodes, n_elems) == (nids.size, eids.size)
+    assert out.read_bytes() == ref.getvalue()
+
+
+def test_streamed_sph_box_matches_script_layout(tmp_path):
+    out = tmp_path / "sph.k"
+    nx, ny, nz = 5, 4, 3
+    total = write_sph_box(out, (-1.0, 1.0), (0.0, 2.0), (-0.5, 0.0), nx, ny, nz,
+                          density=7.8, part_id=9, start_nid=101, start_eid=201, slab_rows=10)
+    assert total == nx * ny * nz
+
+    dx, dy, dz = 2.0 / nx, 2.0 / ny, 0.5 / nz
+    mass = 7.8 * (dx * dy * dz)
+    lines = ["*KEYWORD", "*NODE"]
+    nid = 101
+    for i in range(nx):
+        for j in range(ny):
+            for k in range(nz):
+                x, y, z = -1.0 + (i + 0.5) * dx, 0.0 + (j + 0.5) * dy, -0.5 + (k + 0.5) * dz
+                lines.append(f"{nid:8d}{x:16.6f}{y:16.6f}{z:16.6f}")
+                nid += 1
+    lines.append("*ELEMENT_SPH")
+    lines += [f"{201 + n:8d}{9:8d}{101 + n:8d}{mass:16.6e}" for n in range(total)]
+    lines.append("*END")
+    assert out.read_text() == "\n".join(lines) + "\n"
+
+
+def test_direct_parallel_boxes_match_streamed(tmp_path):
+    args = ((-2.54, 2.54), (-2.54, 2.54), (-0.635, 0.0), 7, 5, 4)
+    kw = dict(part_id=3, start_nid=11, start_eid=21, slab_rows=50)
+    write_fem_box(tmp_path / "a.k", *args, **kw)
+    assert write_fem_box(tmp_path / "b.k", *args, workers=2, **kw) == (8 * 6 * 5, 7 * 5 * 4)
+    assert (tmp_path / "a.k").read_bytes() == (tmp_path / "b.k").read_bytes()
+
+    kw["density"] = 7.8
+    write_sph_box(tmp_path / "c.k", *args, **kw)
+    assert write_sph_box(tmp_path / "d.k", *args, workers=2, **kw) == 7 * 5 * 4
+    assert (tmp_path / "c.k").read_bytes() == (tmp_path / "d.k").read_bytes()
+
+
+def test_crlf_boxes(tmp_path):
+    args = ((-2.54, 2.54), (-2.54, 2.54), (-0.635, 0.0), 7, 5, 4)
+    kw = dict(part_id=3, start_nid=11, start_eid=21, slab_rows=50)
+    write_fem_box(tmp_path / "lf.k", *args, **kw)
+    for workers in (1, 2):
+        write_fem_box(tmp_path / "crlf.k", *args, workers=workers, newline=b"\r\n", **kw)
+        assert (tmp_path / "crlf.k").read_bytes() == (tmp_path / "lf.k").read_bytes().replace(b"\n", b"\r\n")